@@ -0,0 +1,187 @@
+"""
+Synthetic-page benchmark for src/execution/answer_dom_extractor.py.
+
+Builds Qommons-like chat pages (tests/execution/synthetic_chat_page:
+1..2,000 .message-received blocks, varying markdown counts, odd/even id
+mixes, large tables) and measures extract_answer_dom (full / tail-only),
+collect_dom_candidates and the clean serializer, plus peak memory
+(tracemalloc) of a full extraction.
+
+No browser is needed. Results are written as JSON; --check compares a run
+with a stored baseline (tests/execution/extractor_bench_baseline) and exits
+1 on regression (for offline CI).
+
+Usage:
+- python scripts/bench_answer_dom_extractor.py --output bench.json
+- python scripts/bench_answer_dom_extractor.py --write-baseline
+- python scripts/bench_answer_dom_extractor.py --check [--tolerance 0.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import bs4
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.execution import answer_dom_extractor as ade  # noqa: E402
+from tests.execution.extractor_bench_baseline import compare_with_baseline  # noqa: E402
+from tests.execution.synthetic_chat_page import generate_chat_page  # noqa: E402
+
+DEFAULT_BASELINE = ROOT_DIR / "docs" / "ci" / "answer_dom_extractor_bench_baseline.json"
+
+CASES: Dict[str, Dict[str, Any]] = {
+    "history_1": {"blocks": 1},
+    "history_100": {"blocks": 100},
+    "history_500": {"blocks": 500},
+    "history_2000": {"blocks": 2000},
+    "many_markdown_mixed": {"blocks": 50, "last_block_markdown": 60},
+    "odd_only_last": {"blocks": 50, "odd_only_last": True, "last_block_markdown": 5},
+    "large_table": {"blocks": 20, "table_rows": 3000},
+}
+
+
+# ------------------------------------------------------------
+# Measurement
+# ------------------------------------------------------------
+
+
+def _median_sec(func: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples), 5)
+
+
+def _peak_mem_mb(func: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+
+def bench_case(html: str, *, repeat: int, parser: Optional[str] = None) -> Dict[str, Any]:
+    snapshot = ade.ParsedSnapshot(html, parser)
+    result = snapshot.extract("")
+    scope = snapshot.scope
+    target = scope
+    if result.observation.selected_n is not None and scope is not None:
+        target = scope.find(id=f"markdown-{result.observation.selected_n}")
+
+    return {
+        "html_bytes": len(html.encode("utf-8")),
+        "extracted_status": result.extracted_status,
+        "selected_n": result.observation.selected_n,
+        "extract_sec": _median_sec(
+            lambda: ade.extract_answer_dom(html, "", parser=parser), repeat
+        ),
+        "extract_tail_sec": _median_sec(
+            lambda: ade.extract_answer_dom(html, "", parser=parser, tail_only=True), repeat
+        ),
+        "candidates_sec": _median_sec(
+            lambda: ade.collect_dom_candidates(html, parser=parser), repeat
+        ),
+        "serialize_sec": (
+            _median_sec(lambda: ade._serialize_clean_html(target), repeat)
+            if target is not None
+            else None
+        ),
+        "peak_mem_mb": _peak_mem_mb(lambda: ade.extract_answer_dom(html, "", parser=parser)),
+    }
+
+
+def run_benchmark(
+    *,
+    cases: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    parser: Optional[str] = None,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name in cases or CASES:
+        html = generate_chat_page(**CASES[name])
+        results[name] = bench_case(html, repeat=repeat, parser=parser)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "bs4": bs4.__version__,
+        "parser": ade.resolve_parser(parser),
+        "repeat": repeat,
+        "cases": results,
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark answer_dom_extractor on synthetic chat pages."
+    )
+    parser.add_argument("--case", action="append", default=None, choices=sorted(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--parser", default=None, help="BeautifulSoup backend.")
+    parser.add_argument("--output", default=None, help="Write results as JSON.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument(
+        "--write-baseline", action="store_true", help="Overwrite the baseline file."
+    )
+    parser.add_argument("--check", action="store_true", help="Fail on regression.")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    report = run_benchmark(cases=args.case, repeat=args.repeat, parser=args.parser)
+
+    for name, case in report["cases"].items():
+        print(
+            f"- {name}: {case['html_bytes'] / 1024:.0f} KiB "
+            f"extract={case['extract_sec']}s tail={case['extract_tail_sec']}s "
+            f"candidates={case['candidates_sec']}s serialize={case['serialize_sec']}s "
+            f"peak={case['peak_mem_mb']}MB"
+        )
+
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload, encoding="utf-8")
+        print(f"report: {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.write_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(payload + "\n", encoding="utf-8")
+        print(f"baseline written: {baseline_path}")
+
+    if args.check:
+        if not baseline_path.is_file():
+            print(f"[ERROR] baseline not found: {baseline_path}")
+            return 1
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(report, baseline, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"[REGRESSION] {line}")
+        if regressions:
+            return 1
+        print("no regression")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
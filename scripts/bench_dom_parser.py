@@ -0,0 +1,131 @@
+"""
+Offline benchmark of BeautifulSoup parser backends for DOM extraction.
+
+For each installed backend (answer_dom_extractor.available_parsers) this
+runs ParsedSnapshot -> extract + candidates over recorded HTML files and
+reports parse+extract time per MB, plus parity against a full
+html.parser parse. --tail-only measures the tail-only parse fast path.
+
+Usage:
+- python scripts/bench_dom_parser.py [paths ...] [--repeat 3] [--tail-only] [--output bench.json]
+  (paths may be files or directories; directories are scanned for *.html)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.execution import answer_dom_extractor as ade  # noqa: E402
+
+DEFAULT_INPUTS = ("docs/archive/debug/sandbox",)
+
+
+def _collect_html_files(paths: Sequence[str]) -> List[Path]:
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.html")))
+        elif path.is_file():
+            files.append(path)
+    return files
+
+
+def _run_once(html: str, parser: str, tail_only: bool = False) -> Any:
+    snapshot = ade.ParsedSnapshot(html, parser, tail_only=tail_only)
+    return snapshot.extract(""), snapshot.candidates()
+
+
+def bench_parsers(
+    files: Sequence[Path],
+    *,
+    parsers: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    tail_only: bool = False,
+) -> Dict[str, Any]:
+    documents = [f.read_text(encoding="utf-8", errors="replace") for f in files]
+    total_mb = sum(len(d.encode("utf-8")) for d in documents) / (1024 * 1024)
+    reference = [_run_once(d, ade.BS_PARSER) for d in documents]
+
+    results: Dict[str, Any] = {}
+    for parser in parsers or ade.available_parsers():
+        best = float("inf")
+        mismatches: List[str] = []
+        for round_idx in range(repeat):
+            started = time.perf_counter()
+            outputs = [_run_once(d, parser, tail_only) for d in documents]
+            best = min(best, time.perf_counter() - started)
+            if round_idx == 0:
+                mismatches = [
+                    str(f) for f, got, ref in zip(files, outputs, reference) if got != ref
+                ]
+
+        results[parser] = {
+            "best_sec": round(best, 4),
+            "sec_per_mb": round(best / total_mb, 4) if total_mb else None,
+            "mismatches": mismatches,
+        }
+
+    return {
+        "file_count": len(files),
+        "total_mb": round(total_mb, 3),
+        "repeat": repeat,
+        "tail_only": tail_only,
+        "reference_parser": ade.BS_PARSER,
+        "parsers": results,
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark parse+extract time per MB for each parser backend."
+    )
+    parser.add_argument("paths", nargs="*", default=list(DEFAULT_INPUTS))
+    parser.add_argument("--parser", action="append", default=None, help="Backend(s) to run.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--tail-only", action="store_true", help="Parse only the last answer container."
+    )
+    parser.add_argument("--output", default=None, help="Write the report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    files = _collect_html_files(args.paths)
+    if not files:
+        print(f"[ERROR] no html files found: {args.paths}")
+        return 1
+
+    parsers = [ade.resolve_parser(p) for p in args.parser] if args.parser else None
+    report = bench_parsers(
+        files, parsers=parsers, repeat=args.repeat, tail_only=args.tail_only
+    )
+
+    print(f"files: {report['file_count']} ({report['total_mb']} MB)")
+    for name, stats in report["parsers"].items():
+        print(
+            f"- {name}: {stats['sec_per_mb']} sec/MB "
+            f"(best {stats['best_sec']} sec, mismatches {len(stats['mismatches'])})"
+        )
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"report: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+# scripts/probe_dom_stability.py
+"""
+probe_dom_stability v0.1 — DOM 安定化による完了検知
+(probe_v0_2 の代替戦略。Answer Detection Layer から strategy="dom_stability" で選択)
+
+- 最後の .message-sent より後ろにある最後の .message-received を回答コンテナとする
+- MutationObserver で当該コンテナ内の変化を監視し、
+  div.markdown の内容が quiet_ms の間変化しなくなった時点を完了とする
+- レスポンス本文の取得・解析を行わないため、ブラウザ側の負荷が小さい
+- 完了時刻は「最後に変化した時刻」（抽出対象が確定した瞬間）として記録する
+
+NOTE:
+- 判定はページ内 JS（page.evaluate の Promise）で完結する
+- capture_seconds は上限としてのみ使用する
+- 出力は probe_v0_2 と同じく output_dir/summary.json
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from playwright.sync_api import Page  # type: ignore[import]
+
+from scripts.probe_v0_2 import JST, _default_output_dir
+
+if TYPE_CHECKING:  # 型注釈のみ（async API は実行時に import しない）
+    from playwright.async_api import Page as AsyncPage  # type: ignore[import]
+
+
+# div.markdown が無変化であることを求める時間（ms）
+DEFAULT_QUIET_MS = 1500
+
+
+# ページ内で完了を待つ JS（Promise を返す）。
+_DOM_STABILITY_JS = r"""
+({ quietMs, timeoutMs }) => new Promise((resolve) => {
+  const startedPerf = performance.now();
+  const startedEpoch = Date.now();
+  let target = null;
+  let lastChange = null;
+  let mutationCount = 0;
+  let targetObserver = null;
+
+  const currentAnswer = () => {
+    const received = document.querySelectorAll('.message-received');
+    if (!received.length) return null;
+    const recv = received[received.length - 1];
+    const sent = document.querySelectorAll('.message-sent');
+    if (sent.length) {
+      const lastSent = sent[sent.length - 1];
+      const following = lastSent.compareDocumentPosition(recv) & Node.DOCUMENT_POSITION_FOLLOWING;
+      if (!following) return null;
+    }
+    return recv;
+  };
+
+  const markdownHtml = (recv) =>
+    Array.from(recv.querySelectorAll('div.markdown')).map((el) => el.innerHTML).join('');
+
+  const attach = (recv) => {
+    if (targetObserver) targetObserver.disconnect();
+    target = recv;
+    lastChange = performance.now();
+    targetObserver = new MutationObserver((records) => {
+      mutationCount += records.length;
+      lastChange = performance.now();
+    });
+    targetObserver.observe(recv, { childList: true, subtree: true, characterData: true });
+  };
+
+  const finish = (status) => {
+    if (targetObserver) targetObserver.disconnect();
+    clearInterval(timer);
+    const nowPerf = performance.now();
+    const result = {
+      status,
+      elapsed_ms: nowPerf - startedPerf,
+      quiet_for_ms: lastChange === null ? null : nowPerf - lastChange,
+      last_change_epoch_ms: lastChange === null ? null : startedEpoch + (lastChange - startedPerf),
+      detected_epoch_ms: startedEpoch + (nowPerf - startedPerf),
+      mutation_count: mutationCount,
+      has_answer_container: target !== null,
+      markdown_ids: [],
+      text: null,
+      html_len: 0,
+    };
+    if (target !== null) {
+      const mds = Array.from(target.querySelectorAll('div.markdown'));
+      result.markdown_ids = mds.map((el) => el.id || null);
+      result.text = mds.map((el) => el.innerText).join('\n');
+      result.html_len = markdownHtml(target).length;
+    }
+    resolve(result);
+  };
+
+  const check = () => {
+    const now = performance.now();
+    const recv = currentAnswer();
+    if (recv !== null && recv !== target) attach(recv);
+    if (target !== null && markdownHtml(target).trim() && now - lastChange >= quietMs) {
+      finish('stable');
+      return;
+    }
+    if (now - startedPerf >= timeoutMs) finish('timeout');
+  };
+
+  const timer = setInterval(check, Math.max(50, Math.min(250, quietMs / 4)));
+  check();
+})
+"""
+
+
+def _epoch_ms_to_ts(value: Any) -> Optional[str]:
+    if not isinstance(value, (int, float)):
+        return None
+    return datetime.fromtimestamp(value / 1000, JST).isoformat()
+
+
+def _write_summary(
+    result: Dict[str, Any],
+    *,
+    chat_id: str,
+    output_dir: Path,
+    quiet_ms: int,
+    started_mono: float,
+) -> Dict[str, Any]:
+    finished_mono = time.monotonic()
+    status = result.get("status")
+    text = result.get("text") if status == "stable" else None
+    quiet_for_ms = result.get("quiet_for_ms")
+
+    dom_stable_mono: Optional[float] = None
+    if status == "stable" and isinstance(quiet_for_ms, (int, float)):
+        dom_stable_mono = finished_mono - quiet_for_ms / 1000
+
+    summary = {
+        "strategy": "dom_stability",
+        "chat_id": chat_id,
+        "status": status,
+        "dom_answer": text or None,
+        "has_dom": bool(result.get("has_answer_container")),
+        "dom_stable_ts": _epoch_ms_to_ts(result.get("last_change_epoch_ms"))
+        if status == "stable"
+        else None,
+        "detected_ts": _epoch_ms_to_ts(result.get("detected_epoch_ms")),
+        "quiet_ms": quiet_ms,
+        "mutation_count": result.get("mutation_count"),
+        "markdown_ids": result.get("markdown_ids"),
+        "html_len": result.get("html_len"),
+        "completion_reason": "dom_stable" if status == "stable" else "capture_window_elapsed",
+        "completed_early": status == "stable",
+        "elapsed_sec": round(finished_mono - started_mono, 3),
+        "monotonic": {
+            "started": started_mono,
+            "dom_stable": dom_stable_mono,
+            "finished": finished_mono,
+        },
+        "output_dir": str(output_dir),
+    }
+
+    (output_dir / "summary.json").write_text(
+        json.dumps(summary, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    return summary
+
+
+def run_dom_stability_probe(
+    page: Page,
+    chat_id: str,
+    *,
+    capture_seconds: int = 30,
+    output_dir: Optional[Path] = None,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+) -> Dict[str, Any]:
+    """
+    回答 DOM が quiet_ms の間変化しなくなるまで待ち、summary を返す。
+    capture_seconds は上限としてのみ使用する。
+    """
+    if output_dir is None:
+        output_dir = _default_output_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    started_mono = time.monotonic()
+    result = page.evaluate(
+        _DOM_STABILITY_JS,
+        {"quietMs": quiet_ms, "timeoutMs": capture_seconds * 1000},
+    )
+    return _write_summary(
+        result or {},
+        chat_id=chat_id,
+        output_dir=output_dir,
+        quiet_ms=quiet_ms,
+        started_mono=started_mono,
+    )
+
+
+async def run_dom_stability_probe_async(
+    page: AsyncPage,
+    chat_id: str,
+    *,
+    capture_seconds: int = 30,
+    output_dir: Optional[Path] = None,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+) -> Dict[str, Any]:
+    """run_dom_stability_probe の asyncio 版。"""
+    if output_dir is None:
+        output_dir = _default_output_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    started_mono = time.monotonic()
+    result = await page.evaluate(
+        _DOM_STABILITY_JS,
+        {"quietMs": quiet_ms, "timeoutMs": capture_seconds * 1000},
+    )
+    return _write_summary(
+        result or {},
+        chat_id=chat_id,
+        output_dir=output_dir,
+        quiet_ms=quiet_ms,
+        started_mono=started_mono,
+    )
@@ -0,0 +1,327 @@
+# scripts/probe_replay.py
+"""
+probe_replay.py - 記録済み probe 出力のオフライン再生
+
+Design_probe_graphql_answer_detection_v0.2
+
+- graphql_probe.jsonl の各イベントを、live probe と同じ
+  分類・振り分け（ProbeDispatcher）・集計（summarize_session）に通す
+- 再生結果の summary を記録済み summary.json と比較する
+- 記録時刻（ts）を時計として完了規則を評価し、
+  early completion がどの時点で成立していたかを算出する
+- logs/ 配下のツリー全体をプロセスプールで並列に再生する
+
+NOTE:
+- jsonl 上で raw が省略されたイベント（raw_truncated）は本文を再現できない。
+  該当件数は結果の raw_truncated に記録する。
+- 記録済み summary に存在しない項目（旧版 probe の出力）は比較対象外とする。
+
+Usage:
+- python scripts/probe_replay.py logs/ --workers 8 --output replay_report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from scripts.probe_v0_2 import (  # noqa: E402
+    DEFAULT_COMPLETION_GRACE_SECONDS,
+    ProbeDispatcher,
+    _ProbeSession,
+    summarize_session,
+)
+
+
+# 記録済み summary と比較する判定項目
+COMPARED_FIELDS = (
+    "status",
+    "correlation_state",
+    "graphql_answer",
+    "rest_answer",
+    "has_post",
+    "has_get",
+    "has_graphql",
+    "has_ws",
+    "ws_answer",
+)
+
+
+class _ReplayPage:
+    """ProbeDispatcher に渡す listener 登録のみの Page 代替。"""
+
+    def on(self, event: str, handler: Any) -> None:
+        return None
+
+    def remove_listener(self, event: str, handler: Any) -> None:
+        return None
+
+
+class _ReplayRequest:
+    def __init__(self, method: str) -> None:
+        self.method = method
+
+
+class _ReplayResponse:
+    """記録済みイベントを playwright Response と同じ形で提供する。"""
+
+    def __init__(self, record: Dict[str, Any]) -> None:
+        self.url = record.get("url") or ""
+        self.request = _ReplayRequest(record.get("method") or "GET")
+        self.status = record.get("status") or 0
+        self._raw = record.get("raw")
+        self._parse_error = bool(record.get("parse_error"))
+
+    def json(self) -> Any:
+        if self._parse_error or self._raw is None:
+            raise ValueError("recorded response has no JSON body")
+        return self._raw
+
+
+class _ReplayClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _parse_ts(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _load_jsonl(path: Path) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+    return records
+
+
+def replay_probe_dir(
+    probe_dir: Path,
+    *,
+    completion_grace_seconds: float = DEFAULT_COMPLETION_GRACE_SECONDS,
+) -> Dict[str, Any]:
+    """
+    1 件の probe 出力ディレクトリ（summary.json + graphql_probe.jsonl）を再生する。
+    """
+    recorded = json.loads((probe_dir / "summary.json").read_text(encoding="utf-8"))
+    records = _load_jsonl(probe_dir / "graphql_probe.jsonl")
+    chat_id = str(recorded.get("chat_id") or "")
+
+    clock = _ReplayClock()
+    session = _ProbeSession(chat_id, capture_other=False, clock=clock)
+    # dispatcher は Page を弱参照で持つため、再生中は page を保持しておく
+    page = _ReplayPage()
+    dispatcher = ProbeDispatcher(page)  # type: ignore[arg-type]
+    dispatcher.subscribe(session)
+
+    first_ts: Optional[float] = None
+    last_ts: Optional[float] = None
+    fired_at: Optional[float] = None
+    fired_reason: Optional[str] = None
+    truncated = 0
+
+    def _check_completion(now: float) -> None:
+        nonlocal fired_at, fired_reason
+        if fired_at is not None:
+            return
+        reason = session.completion_reason(now, completion_grace_seconds)
+        if reason is None:
+            return
+        fired_reason = reason
+        if reason == "graphql_grace_elapsed" and session.first_graphql_mono is not None:
+            fired_at = session.first_graphql_mono + completion_grace_seconds
+        else:
+            fired_at = clock.now
+
+    for record in records:
+        ts = _parse_ts(record.get("ts"))
+        if ts is not None:
+            # 次イベント到着前に猶予期間が満了していれば、その時点で完了している
+            _check_completion(ts)
+            clock.now = ts
+            first_ts = ts if first_ts is None else first_ts
+            last_ts = ts
+
+        if record.get("raw_truncated"):
+            truncated += 1
+
+        kind = record.get("kind")
+        if kind in ("ws_data", "ws_complete"):
+            dispatcher._on_ws_frame(0, record.get("url") or "", json.dumps(record.get("raw")))
+        else:
+            dispatcher._on_response(_ReplayResponse(record))  # type: ignore[arg-type]
+
+        _check_completion(clock.now)
+
+    _check_completion(float("inf"))
+
+    replayed = summarize_session(session)
+    diffs = {
+        field: {"recorded": recorded.get(field), "replayed": replayed.get(field)}
+        for field in COMPARED_FIELDS
+        if field in recorded and recorded.get(field) != replayed.get(field)
+    }
+
+    completion: Dict[str, Any] = {
+        "reason": fired_reason,
+        "fired_after_first_event_sec": (
+            round(fired_at - first_ts, 3)
+            if fired_at is not None and first_ts is not None
+            else None
+        ),
+        "recorded_span_sec": (
+            round(last_ts - first_ts, 3)
+            if first_ts is not None and last_ts is not None
+            else None
+        ),
+        "recorded_elapsed_sec": recorded.get("elapsed_sec"),
+    }
+    # 記録上の最終イベントより前に完了していた時間（節約量の下限）
+    if fired_at is not None and last_ts is not None:
+        completion["saved_vs_last_event_sec"] = round(max(0.0, last_ts - fired_at), 3)
+
+    return {
+        "probe_dir": str(probe_dir),
+        "chat_id": chat_id,
+        "event_count": len(records),
+        "raw_truncated": truncated,
+        "matches": not diffs,
+        "diffs": diffs,
+        "replayed": replayed,
+        "completion": completion,
+    }
+
+
+def iter_probe_dirs(root: Path) -> Iterator[Path]:
+    """root 配下の probe 出力ディレクトリ（summary.json と jsonl が揃うもの）を列挙する。"""
+    for jsonl_path in sorted(root.rglob("graphql_probe.jsonl")):
+        if (jsonl_path.parent / "summary.json").is_file():
+            yield jsonl_path.parent
+
+
+def _replay_one(args: tuple) -> Dict[str, Any]:
+    probe_dir, grace = args
+    try:
+        return replay_probe_dir(Path(probe_dir), completion_grace_seconds=grace)
+    except Exception as exc:
+        return {"probe_dir": str(probe_dir), "error": f"{type(exc).__name__}: {exc}"}
+
+
+def replay_tree(
+    root: Path,
+    *,
+    workers: Optional[int] = None,
+    completion_grace_seconds: float = DEFAULT_COMPLETION_GRACE_SECONDS,
+) -> Dict[str, Any]:
+    """root 配下の全 probe 出力をプロセスプールで再生し、集計レポートを返す。"""
+    probe_dirs = [str(p) for p in iter_probe_dirs(root)]
+    started = time.perf_counter()
+
+    if workers == 1 or len(probe_dirs) <= 1:
+        results = [_replay_one((d, completion_grace_seconds)) for d in probe_dirs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    _replay_one,
+                    [(d, completion_grace_seconds) for d in probe_dirs],
+                    chunksize=max(1, len(probe_dirs) // ((workers or 4) * 8)),
+                )
+            )
+
+    elapsed = time.perf_counter() - started
+    replayed = [r for r in results if "error" not in r]
+    saved = [
+        r["completion"]["saved_vs_last_event_sec"]
+        for r in replayed
+        if r["completion"].get("saved_vs_last_event_sec") is not None
+    ]
+
+    return {
+        "root": str(root),
+        "probe_count": len(probe_dirs),
+        "replayed": len(replayed),
+        "errors": len(results) - len(replayed),
+        "mismatches": sum(1 for r in replayed if not r["matches"]),
+        "elapsed_sec": round(elapsed, 3),
+        "probes_per_sec": round(len(probe_dirs) / elapsed, 1) if elapsed > 0 else None,
+        "completion_grace_seconds": completion_grace_seconds,
+        "early_completion_fired": sum(
+            1 for r in replayed if r["completion"].get("reason") is not None
+        ),
+        "saved_vs_last_event_sec_total": round(sum(saved), 3),
+        "results": results,
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay recorded probe outputs (graphql_probe.jsonl) offline."
+    )
+    parser.add_argument("root", nargs="?", default="logs", help="Root directory to scan.")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size.")
+    parser.add_argument(
+        "--grace",
+        type=float,
+        default=DEFAULT_COMPLETION_GRACE_SECONDS,
+        help="completion_grace_seconds used for the early completion rule.",
+    )
+    parser.add_argument("--output", default=None, help="Write the full report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"[ERROR] directory not found: {root}")
+        return 1
+
+    report = replay_tree(
+        root, workers=args.workers, completion_grace_seconds=args.grace
+    )
+
+    print(f"probe_count: {report['probe_count']}")
+    print(f"replayed: {report['replayed']} (errors: {report['errors']})")
+    print(f"mismatches: {report['mismatches']}")
+    print(f"elapsed_sec: {report['elapsed_sec']} ({report['probes_per_sec']} probes/sec)")
+    print(f"early_completion_fired: {report['early_completion_fired']}")
+    print(f"saved_vs_last_event_sec_total: {report['saved_vs_last_event_sec_total']}")
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"report: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,33 +1,119 @@
 # scripts/probe_v0_2.py
 """
-probe v0.2.1 — GraphQL createData 監視 + assistant 抽出
+probe v0.2.9 — GraphQL createData 監視 + assistant 抽出
 (Design_probe_graphql_answer_detection_v0.1 / Design_chat_answer_detection_v0.1 準拠)
 
 改訂履歴（v0.2 → v0.2.1）:
 - operationName == "createData" の厳密判定を追加
 - JSON パース不能レスポンスもイベントとして記録（一次情報保持）
 - createData 到着時刻（first_graphql_ts）を summary に追加
+
+改訂履歴（v0.2.1 → v0.2.2）:
+- 固定待機（capture_seconds 全消費）を完了検知型の待機に変更
+  - 完了根拠: 当該 chat_id の createData 初回到着
+  - 猶予期間（completion_grace_seconds）内に後続 GET /messages を待つ
+  - capture_seconds は上限としてのみ使用（Design_probe_graphql_answer_detection_v0.2 §5）
+- 完了理由・経過時間を summary に追加
+
+改訂履歴（v0.2.2 → v0.2.3）:
+- response listener を Page 単位の ProbeDispatcher に集約
+  - listener は Page ごとに 1 回だけ登録し、chat_id 購読へ振り分ける
+  - probe 終了時に購読を解除（ハンドラの蓄積を防止）
+
+改訂履歴（v0.2.3 → v0.2.4）:
+- URL / method による事前分類を追加し、本文取得を関連レスポンスに限定
+- 無関係レスポンスは other_count として件数のみ記録
+  （capture_other=True で従来の "other" イベント記録を有効化）
+
+改訂履歴（v0.2.4 → v0.2.5）:
+- playwright.async_api 用の run_graphql_probe_async を追加
+  （分類・振り分け・出力は同期版と共通）
+
+改訂履歴（v0.2.5 → v0.2.6）:
+- graphql_probe.jsonl をイベント到着ごとの追記（ProbeJournal）に変更
+- メモリ上のイベント保持をリングバッファ化し、raw に kind 別サイズ上限を追加
+- summary 項目（has_* / graphql_answer / rest_answer）を逐次集計に変更
+
+改訂履歴（v0.2.6 → v0.2.7）:
+- WebSocket subscription frame の監視を追加（page.on("websocket") / framereceived）
+  - payload 内 sk の chat_id で相関し、ws_data / ws_complete イベントとして記録
+  - 相関済み subscription の complete frame を完了根拠として早期完了に使用
+- has_ws / ws_answer などを summary に追加
+
+改訂履歴（v0.2.7 → v0.2.8）:
+- 主要イベントの monotonic 時刻を summary["monotonic"] に追加
+  （run_single_question の latency timeline と結合するため）
+
+改訂履歴（v0.2.8 → v0.2.9）:
+- createData 判定を operationName 非依存に変更
+  （実レスポンスは {"data":{"createData":{...,"sk":...}}} で operationName を含まない）
+- REST GET /messages 単独での完了を追加（Design_probe_graphql_answer_detection_v0.2 §4.1）
+  - submit 前の assistant 件数（baseline）を超える assistant 回答のみを当該質問の回答とみなす
+  - baseline は ProbeDispatcher が購読の有無によらず GET /messages から記録する
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
+import re
+import time
+import weakref
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
 
 from playwright.sync_api import Page, Response  # type: ignore[import]
 
+if TYPE_CHECKING:  # 型注釈のみ（async API は実行時に import しない）
+    from playwright.async_api import Page as AsyncPage  # type: ignore[import]
+    from playwright.async_api import Response as AsyncResponse  # type: ignore[import]
+
 
 # プロジェクト標準
 JST = timezone(timedelta(hours=9))
 
+# 完了待機ループのポーリング間隔（ms）。イベントは wait_for_timeout 中に配送される。
+DEFAULT_POLL_INTERVAL_MS = 250
+
+# createData 到着後、後続 GET /messages を待つ猶予（秒）
+DEFAULT_COMPLETION_GRACE_SECONDS = 2.0
+
+# subscription の終了を表す WebSocket frame type（graphql-ws / subscriptions-transport-ws）
+WS_COMPLETE_FRAME_TYPES = {"complete"}
+
+# メモリ上に保持するイベント数の上限（全件は graphql_probe.jsonl に追記される）
+DEFAULT_MAX_EVENTS_IN_MEMORY = 200
+
+# graphql_probe.jsonl の flush 間隔（イベント数）
+DEFAULT_JOURNAL_FLUSH_EVERY = 1
+
+# REST /chat/<chat_id>/messages の URL（chat_id 抽出用）
+_MESSAGES_URL_RE = re.compile(r"/chat/([^/?#]+)/messages")
+
+# kind ごとの raw 記録上限（JSON 文字列の UTF-8 バイト数）。未指定 kind は無制限。
+DEFAULT_MAX_RAW_BYTES: Dict[str, int] = {"other": 64 * 1024}
+
 
 @dataclass
 class ProbeEvent:
     ts: str
-    kind: str  # "graphql" | "rest_post" | "rest_get" | "other"
+    kind: str  # "graphql" | "rest_post" | "rest_get" | "ws_data" | "ws_complete" | "other"
     chat_id: Optional[str]
     url: str
     method: str
@@ -76,53 +162,543 @@ def _extract_graphql_answer(raw: Dict[str, Any]) -> Optional[str]:
     return value
 
 
-def _extract_rest_answer(raw: Dict[str, Any]) -> Optional[str]:
+def _iter_sk_records(obj: Any) -> Iterator[Dict[str, Any]]:
+    """payload 内の "sk" を持つ dict（createData 相当のレコード）を列挙する。"""
+    if isinstance(obj, dict):
+        if isinstance(obj.get("sk"), str):
+            yield obj
+        for value in obj.values():
+            yield from _iter_sk_records(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _iter_sk_records(item)
+
+
+def _extract_ws_answer(frame: Dict[str, Any]) -> Optional[str]:
     """
-    REST GET /messages → assistant.content を抽出（設計書・実測ログ準拠）。
+    WebSocket subscription frame から "assistant#..." の value を抽出する。
+    user 側レコードを回答と誤認しないよう、assistant 接頭辞のみ対象とする。
     """
+    answer: Optional[str] = None
+    for record in _iter_sk_records(frame.get("payload")):
+        value = record.get("value")
+        if isinstance(value, str) and value.startswith("assistant#"):
+            answer = value.split("assistant#", 1)[1] or answer
+    return answer
+
+
+def _rest_assistant_contents(raw: Any) -> List[str]:
+    """REST GET /messages の assistant メッセージ本文（非空）を出現順に返す。"""
     if not isinstance(raw, dict):
-        return None
+        return []
 
     data = raw.get("data") if isinstance(raw.get("data"), dict) else raw
 
     msgs = data.get("messages")
-    if isinstance(msgs, list):
-        for msg in reversed(msgs):
-            if isinstance(msg, dict) and msg.get("role") == "assistant":
-                content = msg.get("content")
-                if isinstance(content, str):
-                    return content
+    if not isinstance(msgs, list):
+        return []
 
-    return None
+    return [
+        msg["content"]
+        for msg in msgs
+        if isinstance(msg, dict)
+        and msg.get("role") == "assistant"
+        and isinstance(msg.get("content"), str)
+        and msg["content"]
+    ]
 
 
-def run_graphql_probe(
-    page: Page,
-    chat_id: str,
-    *,
-    capture_seconds: int = 30,
-    output_dir: Optional[Path] = None,
-) -> Dict[str, Any]:
+def _extract_rest_answer(raw: Dict[str, Any]) -> Optional[str]:
     """
-    probe v0.2.1 の中核:
-    - POST /messages
-    - GraphQL createData (回答確定)
-    - GET /messages
-    の3系統を監視し、一次情報を jsonl と summary.json に保存。
+    REST GET /messages → assistant.content を抽出（設計書・実測ログ準拠）。
     """
+    contents = _rest_assistant_contents(raw)
+    return contents[-1] if contents else None
 
-    if output_dir is None:
-        output_dir = _default_output_dir()
-    output_dir.mkdir(parents=True, exist_ok=True)
 
-    events: List[ProbeEvent] = []
-    first_graphql_ts: Optional[str] = None
+def _chat_id_from_messages_url(url: str) -> Optional[str]:
+    """/chat/<chat_id>/messages の chat_id を返す。"""
+    match = _MESSAGES_URL_RE.search(url)
+    return match.group(1) if match else None
+
+
+class ProbeJournal:
+    """
+    graphql_probe.jsonl へのストリーミング書き出し。
+
+    - イベント到着ごとに 1 行追記する（probe 途中でのクラッシュでも記録が残る）
+    - flush_every 件ごとに flush する
+    - raw の JSON 文字列長が kind ごとの上限（max_raw_bytes）を超える場合、
+      raw を null とし raw_truncated / raw_bytes を記録する
+    - 書き込み失敗は errors に計上し、観測は継続する
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        flush_every: int = DEFAULT_JOURNAL_FLUSH_EVERY,
+        max_raw_bytes: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.max_raw_bytes: Dict[str, int] = dict(
+            DEFAULT_MAX_RAW_BYTES if max_raw_bytes is None else max_raw_bytes
+        )
+        self.written = 0
+        self.truncated = 0
+        self.errors = 0
+        self._fp: Optional[TextIO] = path.open("w", encoding="utf-8")
+
+    def append(self, ev: ProbeEvent) -> None:
+        if self._fp is None:
+            return
+
+        record: Dict[str, Any] = {
+            "ts": ev.ts,
+            "kind": ev.kind,
+            "chat_id": ev.chat_id,
+            "url": ev.url,
+            "method": ev.method,
+            "status": ev.status,
+            "parse_error": ev.parse_error,
+        }
+
+        try:
+            # raw は 1 回だけ直列化し、上限判定と行の組み立てに共用する
+            raw_json = json.dumps(ev.raw, ensure_ascii=False)
+
+            limit = self.max_raw_bytes.get(ev.kind)
+            if limit is not None and ev.raw is not None:
+                raw_bytes = len(raw_json.encode("utf-8"))
+                if raw_bytes > limit:
+                    raw_json = "null"
+                    record["raw_truncated"] = True
+                    record["raw_bytes"] = raw_bytes
+                    self.truncated += 1
+
+            # json.dumps の既定区切り（", " / ": "）で raw を末尾に連結する
+            head = json.dumps(record, ensure_ascii=False)
+            line = f'{head[:-1]}, "raw": {raw_json}}}'
+
+            self._fp.write(line + "\n")
+            self.written += 1
+            if self.written % self.flush_every == 0:
+                self._fp.flush()
+        except Exception:
+            # Journal failure must not stop observation.
+            self.errors += 1
+
+    def close(self) -> None:
+        if self._fp is None:
+            return
+        try:
+            self._fp.close()
+        except Exception:
+            self.errors += 1
+        self._fp = None
+
+
+class _ProbeSession:
+    """
+    1 回の probe（1 chat_id）に対応する観測状態。
+
+    ProbeDispatcher から振り分けられたレスポンスを ProbeEvent として記録し、
+    完了判定に必要な時刻情報を保持する。
+
+    - イベントは journal（graphql_probe.jsonl）へ到着順に追記する
+    - メモリ上には直近 max_events 件のみ保持する（リングバッファ）
+    - summary 項目（has_* / *_answer / event_count）は記録時に逐次更新する
+    """
+
+    def __init__(
+        self,
+        chat_id: str,
+        *,
+        capture_other: bool = False,
+        journal: Optional[ProbeJournal] = None,
+        max_events: int = DEFAULT_MAX_EVENTS_IN_MEMORY,
+        clock: Optional[Callable[[], float]] = None,
+        baseline_assistant_count: int = 0,
+    ) -> None:
+        self.chat_id = chat_id
+        # submit 前に存在した assistant メッセージ数（これを超えた分が今回の回答）
+        self.baseline_assistant_count = baseline_assistant_count
+        self.capture_other = capture_other
+        self.journal = journal
+        # 完了判定用の時計（既定: time.monotonic。replay では記録時刻を使う）
+        self.clock: Callable[[], float] = clock or time.monotonic
+        self.events: Deque[ProbeEvent] = deque(maxlen=max_events)
+        # 無関係レスポンスは件数のみ保持（capture_other=True なら events にも記録）
+        self.other_count = 0
+        self.first_graphql_ts: Optional[str] = None
+        # 完了判定用（monotonic clock）
+        self.first_graphql_mono: Optional[float] = None
+        # baseline を超える assistant 回答を GET /messages で初めて観測した時刻
+        self.rest_answer_mono: Optional[float] = None
+
+        # ---- summary 項目（逐次更新）----
+        self.event_count = 0
+        self.has_post = False
+        self.has_get = False
+        self.has_graphql = False
+        self.graphql_answer: Optional[str] = None  # 最初の非空 createData 回答
+        self.rest_answer: Optional[str] = None  # 最後の非空 GET /messages 回答
+
+        # ---- WebSocket subscription（逐次更新）----
+        self.has_ws = False
+        self.ws_frame_count = 0
+        self.ws_answer: Optional[str] = None  # 最後の非空 assistant value
+        self.first_ws_ts: Optional[str] = None
+        self.ws_completed_ts: Optional[str] = None
+        self.ws_completed_mono: Optional[float] = None
+        # assistant 回答を運んだ subscription id（user 側 subscription の
+        # complete を回答完了と誤認しないため）
+        self.ws_answer_subscription_ids: Set[Any] = set()
+
+        # ---- latency timeline 用（monotonic clock）----
+        self.first_rest_post_mono: Optional[float] = None
+        self.last_rest_get_mono: Optional[float] = None
+
+    def _append(self, ev: ProbeEvent) -> None:
+        self.event_count += 1
+        if ev.kind == "rest_post":
+            self.has_post = True
+            if self.first_rest_post_mono is None:
+                self.first_rest_post_mono = self.clock()
+        elif ev.kind == "rest_get":
+            self.has_get = True
+            self.last_rest_get_mono = self.clock()
+        elif ev.kind == "graphql":
+            self.has_graphql = True
 
-    def _handle_response(response: Response) -> None:
+        self.events.append(ev)
+        if self.journal is not None:
+            self.journal.append(ev)
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+    def record_graphql(
+        self,
+        *,
+        url: str,
+        method: str,
+        status: int,
+        parsed_json: Optional[Dict[str, Any]],
+        parse_error: bool,
+    ) -> None:
+        ts = _now_ts()
+        if self.first_graphql_ts is None:
+            self.first_graphql_ts = ts
+            self.first_graphql_mono = self.clock()
+
+        if self.graphql_answer is None and parsed_json:
+            self.graphql_answer = _extract_graphql_answer(parsed_json) or None
+
+        self._append(
+            ProbeEvent(
+                ts=ts,
+                kind="graphql",
+                chat_id=self.chat_id,
+                url=url,
+                method=method,
+                status=status,
+                raw=parsed_json,
+                parse_error=parse_error,
+            )
+        )
+
+    def record_rest(
+        self,
+        *,
+        url: str,
+        method: str,
+        status: int,
+        parsed_json: Optional[Dict[str, Any]],
+        parse_error: bool,
+    ) -> None:
+        if method.upper() == "POST":
+            kind = "rest_post"
+        elif method.upper() == "GET":
+            kind = "rest_get"
+        else:
+            kind = "other"
+
+        if kind == "rest_get" and parsed_json:
+            contents = _rest_assistant_contents(parsed_json)
+            # submit 前からある assistant 回答（過去の質問分）は採用しない
+            if len(contents) > self.baseline_assistant_count:
+                self.rest_answer = contents[-1]
+                if self.rest_answer_mono is None:
+                    self.rest_answer_mono = self.clock()
+
+        self._append(
+            ProbeEvent(
+                ts=_now_ts(),
+                kind=kind,
+                chat_id=self.chat_id,
+                url=url,
+                method=method,
+                status=status,
+                raw=parsed_json,
+                parse_error=parse_error,
+            )
+        )
+
+    def record_ws(
+        self,
+        *,
+        kind: str,
+        url: str,
+        frame: Dict[str, Any],
+    ) -> None:
+        """当該 chat_id に相関した WebSocket frame（ws_data / ws_complete）を記録する。"""
+        ts = _now_ts()
+        self.has_ws = True
+        self.ws_frame_count += 1
+        if self.first_ws_ts is None:
+            self.first_ws_ts = ts
+
+        if kind == "ws_data":
+            ws_answer = _extract_ws_answer(frame)
+            if ws_answer:
+                self.ws_answer = ws_answer
+                self.ws_answer_subscription_ids.add(frame.get("id"))
+        elif (
+            kind == "ws_complete"
+            and self.ws_completed_mono is None
+            and frame.get("id") in self.ws_answer_subscription_ids
+        ):
+            # 回答を運んだ subscription の complete のみ完了とみなす
+            self.ws_completed_ts = ts
+            self.ws_completed_mono = self.clock()
+
+        self._append(
+            ProbeEvent(
+                ts=ts,
+                kind=kind,
+                chat_id=self.chat_id,
+                url=url,
+                method="WS",
+                status=0,
+                raw=frame,
+                parse_error=False,
+            )
+        )
+
+    def record_unattributed(
+        self,
+        *,
+        kind: str,
+        url: str,
+        method: str,
+        status: int,
+        parsed_json: Optional[Dict[str, Any]],
+        parse_error: bool,
+    ) -> None:
+        """chat_id に帰属できないイベント（解析不能 GraphQL / その他）を記録する。"""
+        self._append(
+            ProbeEvent(
+                ts=_now_ts(),
+                kind=kind,
+                chat_id=None,
+                url=url,
+                method=method,
+                status=status,
+                raw=parsed_json,
+                parse_error=parse_error,
+            )
+        )
+
+    def completion_reason(self, now: float, grace_seconds: float) -> Optional[str]:
+        if self.ws_completed_mono is not None and (self.ws_answer or self.graphql_answer):
+            return "ws_complete"
+        if self.rest_answer_mono is not None:
+            # REST GET /messages が正規の完了根拠（Design v0.2 §4.1）
+            if self.first_graphql_mono is not None:
+                return "graphql_and_rest_get"
+            return "rest_get"
+        if self.first_graphql_mono is None:
+            return None
+        if now - self.first_graphql_mono >= grace_seconds:
+            return "graphql_grace_elapsed"
+        return None
+
+
+class ProbeDispatcher:
+    """
+    Page 単位の response 監視ディスパッチャ。
+
+    - page.on("response") は Page ごとに 1 回だけ登録する
+    - レスポンス本文の JSON 解析は 1 レスポンスにつき最大 1 回
+    - chat_id ごとの購読（_ProbeSession）へイベントを振り分ける
+    - probe 終了時に unsubscribe し、購読がなければ何もしない
+    - page.on("websocket") で WebSocket の framereceived も監視し、
+      subscription frame を sk の chat_id で購読へ振り分ける
+    - GET /chat/<chat_id>/messages は購読がなくても解析し、chat_id ごとの
+      assistant 件数を記録する（次の probe の baseline。submit 前の件数になる）
+
+    同一 Page 上で probe を繰り返してもハンドラが蓄積しないため、
+    1 問あたりの監視コストは実行の長さに依存しない。
+
+    NOTE:
+    WebSocket は接続時にしか捕捉できない。ページ表示時点で接続されるため、
+    Page を用意する側（tests/conftest.py の chat_page、scripts/run_f8_set1_manual.py、
+    scripts/run_question_set.py、template_prepare_chat_v0_1）が遷移前に
+    get_probe_dispatcher(page).install() を呼ぶ。subscribe() 時の install は
+    呼び忘れに備えた保険で、それ以前に接続済みの WebSocket は捕捉できない。
+    """
+
+    def __init__(self, page: Page) -> None:
+        # _DISPATCHERS（WeakKeyDictionary）の値から Page を強参照すると
+        # エントリが回収されないため、Page は弱参照で保持する
+        self._page_ref = weakref.ref(page)
+        self._sessions: Dict[int, _ProbeSession] = {}
+        self._next_token = 0
+        self._installed = False
+        # (id(websocket), subscription id) -> chat_id
+        self._ws_subscriptions: Dict[Tuple[int, Any], str] = {}
+        # chat_id -> 直近の GET /messages で観測した assistant 件数
+        self._assistant_counts: Dict[str, int] = {}
+
+    @property
+    def _page(self) -> Page:
+        page = self._page_ref()
+        if page is None:
+            raise RuntimeError("page has been garbage-collected")
+        return page
+
+    @property
+    def active_subscriptions(self) -> int:
+        return len(self._sessions)
+
+    def install(self) -> None:
+        """response / websocket listener を登録する（冪等）。"""
+        if self._installed:
+            return
+        self._page.on("response", self._on_response)
+        self._page.on("websocket", self._on_websocket)
+        self._installed = True
+
+    def assistant_count(self, chat_id: str) -> int:
+        """直近の GET /messages で観測した assistant 件数（未観測なら 0）。"""
+        return self._assistant_counts.get(chat_id, 0)
+
+    def _note_messages(self, url: str, parsed_json: Optional[Dict[str, Any]]) -> None:
+        chat_id = _chat_id_from_messages_url(url)
+        if chat_id is not None and parsed_json:
+            self._assistant_counts[chat_id] = len(_rest_assistant_contents(parsed_json))
+
+    def subscribe(self, session: _ProbeSession) -> int:
+        self.install()
+
+        token = self._next_token
+        self._next_token += 1
+        self._sessions[token] = session
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        self._sessions.pop(token, None)
+
+    def close(self) -> None:
+        """Page から listener を外す（明示的な後始末用）。"""
+        self._sessions.clear()
+        if self._installed:
+            try:
+                self._page.remove_listener("response", self._on_response)
+                self._page.remove_listener("websocket", self._on_websocket)
+            except Exception:
+                pass
+            self._installed = False
+
+    def _on_websocket(self, ws: Any) -> None:
+        ws_key = id(ws)
+        url = ws.url
+        ws.on("framereceived", lambda payload: self._on_ws_frame(ws_key, url, payload))
+        ws.on("close", lambda *_: self._forget_websocket(ws_key))
+
+    def _forget_websocket(self, ws_key: int) -> None:
+        for key in [k for k in self._ws_subscriptions if k[0] == ws_key]:
+            del self._ws_subscriptions[key]
+
+    def _on_ws_frame(self, ws_key: int, url: str, payload: Any) -> None:
+        if not self._sessions:
+            return
+
+        if isinstance(payload, (bytes, bytearray)):
+            try:
+                payload = payload.decode("utf-8")
+            except Exception:
+                return
+
+        try:
+            frame = json.loads(payload)
+        except Exception:
+            return
+        if not isinstance(frame, dict):
+            return
+
+        sessions = list(self._sessions.values())
+        key = (ws_key, frame.get("id"))
+
+        # ---- subscription 終了（stream end）----
+        if frame.get("type") in WS_COMPLETE_FRAME_TYPES:
+            chat_id = self._ws_subscriptions.pop(key, None)
+            if chat_id is None:
+                return
+            for session in sessions:
+                if session.chat_id == chat_id:
+                    session.record_ws(kind="ws_complete", url=url, frame=frame)
+            return
+
+        # ---- データ frame（sk の chat_id で相関）----
+        chat_ids = {
+            _extract_chat_id_from_sk(record["sk"])
+            for record in _iter_sk_records(frame.get("payload"))
+        }
+        chat_ids.discard(None)
+        if not chat_ids:
+            return
+
+        if frame.get("id") is not None and len(chat_ids) == 1:
+            self._ws_subscriptions[key] = next(iter(chat_ids))  # type: ignore[arg-type]
+
+        for session in sessions:
+            if session.chat_id in chat_ids:
+                session.record_ws(kind="ws_data", url=url, frame=frame)
+
+    def _select_sessions(self, category: str, url: str) -> List[_ProbeSession]:
+        """
+        分類結果から本文を必要とする購読を選ぶ（本文はまだ取得しない）。
+        """
+        sessions = list(self._sessions.values())
+
+        if category == "rest_messages":
+            return [s for s in sessions if s.chat_id in url]
+
+        if category == "other":
+            for session in sessions:
+                session.other_count += 1
+            return [s for s in sessions if s.capture_other]
+
+        return sessions
+
+    def _on_response(self, response: Response) -> None:
         url = response.url
         method = response.request.method  # type: ignore[attr-defined]
-        status = response.status
 
+        # ---- 分類（URL / method のみ。本文はまだ取得しない）----
+        category = _classify_response(url, method)
+        track = _is_messages_get(category, method)
+        if not self._sessions and not track:
+            return
+        sessions = self._select_sessions(category, url)
+        if not sessions and not track:
+            return
+
+        # ---- 関連レスポンスのみ本文を取得・解析 ----
         parsed_json: Optional[Dict[str, Any]] = None
         parse_error = False
 
@@ -131,140 +707,354 @@ def run_graphql_probe(
         except Exception:
             parse_error = True
 
-        # ---- GraphQL createData 判定 ----
-        if "/graphql" in url and method.upper() == "POST":
-
-            if parsed_json and isinstance(parsed_json, dict):
-                op = parsed_json.get("operationName")
-                if op != "createData":
-                    return
-
-                try:
-                    create_data = parsed_json["data"]["createData"]
-                    sk = create_data.get("sk")
-                    event_chat_id = _extract_chat_id_from_sk(sk)
-                except Exception:
-                    return
-
-                if event_chat_id != chat_id:
-                    return
-
-                ts = _now_ts()
-                nonlocal first_graphql_ts
-                if first_graphql_ts is None:
-                    first_graphql_ts = ts
-
-                events.append(
-                    ProbeEvent(
-                        ts=ts,
-                        kind="graphql",
-                        chat_id=chat_id,
+        if track:
+            self._note_messages(url, parsed_json)
+
+        _route_response(
+            sessions,
+            category=category,
+            url=url,
+            method=method,
+            status=response.status,
+            parsed_json=parsed_json,
+            parse_error=parse_error,
+        )
+
+
+class AsyncProbeDispatcher(ProbeDispatcher):
+    """
+    ProbeDispatcher の playwright.async_api 版。
+
+    分類・振り分けは同期版と共通で、本文取得のみ await する。
+    """
+
+    async def _on_response(self, response: AsyncResponse) -> None:  # type: ignore[override]
+        url = response.url
+        method = response.request.method
+
+        category = _classify_response(url, method)
+        track = _is_messages_get(category, method)
+        if not self._sessions and not track:
+            return
+        sessions = self._select_sessions(category, url)
+        if not sessions and not track:
+            return
+
+        parsed_json: Optional[Dict[str, Any]] = None
+        parse_error = False
+
+        try:
+            parsed_json = await response.json()
+        except Exception:
+            parse_error = True
+
+        if track:
+            self._note_messages(url, parsed_json)
+
+        _route_response(
+            sessions,
+            category=category,
+            url=url,
+            method=method,
+            status=response.status,
+            parsed_json=parsed_json,
+            parse_error=parse_error,
+        )
+
+
+def _route_response(
+    sessions: List[_ProbeSession],
+    *,
+    category: str,
+    url: str,
+    method: str,
+    status: int,
+    parsed_json: Optional[Dict[str, Any]],
+    parse_error: bool,
+) -> None:
+    """解析済みレスポンスを購読へ振り分ける（同期・非同期共通）。"""
+
+    # ---- GraphQL createData 判定 ----
+    if category == "graphql":
+
+        if parsed_json and isinstance(parsed_json, dict):
+            # 実レスポンスは operationName を含まないため、data.createData.sk で判定する
+            data = parsed_json.get("data")
+            create_data = data.get("createData") if isinstance(data, dict) else None
+            if not isinstance(create_data, dict):
+                return
+
+            event_chat_id = _extract_chat_id_from_sk(create_data.get("sk"))
+            if event_chat_id is None:
+                return
+
+            for session in sessions:
+                if session.chat_id == event_chat_id:
+                    session.record_graphql(
                         url=url,
                         method=method,
                         status=status,
-                        raw=parsed_json,
+                        parsed_json=parsed_json,
                         parse_error=parse_error,
                     )
-                )
-                return
-
-            events.append(
-                ProbeEvent(
-                    ts=_now_ts(),
-                    kind="graphql",
-                    chat_id=None,
-                    url=url,
-                    method=method,
-                    status=status,
-                    raw=None,
-                    parse_error=True,
-                )
-            )
             return
 
-        # ---- REST /chat/<chat_id>/messages ----
-        if "/chat/" in url and "/messages" in url:
-            if chat_id not in url:
-                return
-
-            if method.upper() == "POST":
-                kind = "rest_post"
-            elif method.upper() == "GET":
-                kind = "rest_get"
-            else:
-                kind = "other"
-
-            events.append(
-                ProbeEvent(
-                    ts=_now_ts(),
-                    kind=kind,
-                    chat_id=chat_id,
-                    url=url,
-                    method=method,
-                    status=status,
-                    raw=parsed_json,
-                    parse_error=parse_error,
-                )
+        for session in sessions:
+            session.record_unattributed(
+                kind="graphql",
+                url=url,
+                method=method,
+                status=status,
+                parsed_json=None,
+                parse_error=True,
             )
-            return
+        return
 
-        # ---- その他 ----
-        events.append(
-            ProbeEvent(
-                ts=_now_ts(),
-                kind="other",
-                chat_id=None,
+    # ---- REST /chat/<chat_id>/messages ----
+    if category == "rest_messages":
+        for session in sessions:
+            session.record_rest(
                 url=url,
                 method=method,
                 status=status,
-                raw=parsed_json,
+                parsed_json=parsed_json,
                 parse_error=parse_error,
             )
+        return
+
+    # ---- その他（capture_other=True の購読のみ）----
+    for session in sessions:
+        session.record_unattributed(
+            kind="other",
+            url=url,
+            method=method,
+            status=status,
+            parsed_json=parsed_json,
+            parse_error=parse_error,
         )
 
-    page.on("response", _handle_response)
-    page.wait_for_timeout(capture_seconds * 1000)
 
-    # ---- JSONL 出力 ----
-    jsonl_path = output_dir / "graphql_probe.jsonl"
-    with jsonl_path.open("w", encoding="utf-8") as f:
-        for ev in events:
-            f.write(
-                json.dumps(
-                    {
-                        "ts": ev.ts,
-                        "kind": ev.kind,
-                        "chat_id": ev.chat_id,
-                        "url": ev.url,
-                        "method": ev.method,
-                        "status": ev.status,
-                        "parse_error": ev.parse_error,
-                        "raw": ev.raw,
-                    },
-                    ensure_ascii=False,
-                )
-                + "\n"
-            )
+_DISPATCHERS: "weakref.WeakKeyDictionary[Any, ProbeDispatcher]" = (
+    weakref.WeakKeyDictionary()
+)
 
-    # ---- summary.json 生成 ----
-    has_post = any(e.kind == "rest_post" for e in events)
-    has_get = any(e.kind == "rest_get" for e in events)
-    has_graphql = any(e.kind == "graphql" for e in events)
 
-    graphql_answer: Optional[str] = None
-    rest_answer: Optional[str] = None
+def get_probe_dispatcher(page: Page) -> ProbeDispatcher:
+    """Page に紐づく ProbeDispatcher を返す（なければ生成）。"""
+    dispatcher = _DISPATCHERS.get(page)
+    if dispatcher is None:
+        dispatcher = ProbeDispatcher(page)
+        _DISPATCHERS[page] = dispatcher
+    return dispatcher
 
-    for ev in events:
-        if ev.kind == "graphql" and ev.raw:
-            graphql_answer = _extract_graphql_answer(ev.raw)
-            if graphql_answer:
+
+def get_async_probe_dispatcher(page: AsyncPage) -> AsyncProbeDispatcher:
+    """async Page に紐づく AsyncProbeDispatcher を返す（なければ生成）。"""
+    dispatcher = _DISPATCHERS.get(page)
+    if not isinstance(dispatcher, AsyncProbeDispatcher):
+        dispatcher = AsyncProbeDispatcher(page)  # type: ignore[arg-type]
+        _DISPATCHERS[page] = dispatcher
+    return dispatcher
+
+
+def _classify_response(url: str, method: str) -> str:
+    """
+    URL / method のみでレスポンスを分類する（本文は参照しない）。
+
+    Returns:
+        "graphql"       : POST /graphql（createData 判定のため本文が必要）
+        "rest_messages" : /chat/<chat_id>/messages
+        "other"         : 上記以外（静的アセット・解析系など）
+    """
+    if "/graphql" in url and method.upper() == "POST":
+        return "graphql"
+    if "/chat/" in url and "/messages" in url:
+        return "rest_messages"
+    return "other"
+
+
+def _is_messages_get(category: str, method: str) -> bool:
+    """baseline（assistant 件数）の記録対象か（購読の有無によらず本文を取得する）。"""
+    return category == "rest_messages" and method.upper() == "GET"
+
+
+def run_graphql_probe(
+    page: Page,
+    chat_id: str,
+    *,
+    capture_seconds: int = 30,
+    output_dir: Optional[Path] = None,
+    early_completion: bool = True,
+    completion_grace_seconds: float = DEFAULT_COMPLETION_GRACE_SECONDS,
+    poll_interval_ms: int = DEFAULT_POLL_INTERVAL_MS,
+    capture_other: bool = False,
+    max_events_in_memory: int = DEFAULT_MAX_EVENTS_IN_MEMORY,
+    journal_flush_every: int = DEFAULT_JOURNAL_FLUSH_EVERY,
+    max_raw_bytes: Optional[Mapping[str, int]] = None,
+    baseline_assistant_count: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    probe v0.2.9 の中核:
+    - POST /messages
+    - GraphQL createData (回答確定)
+    - GET /messages
+    の3系統を監視し、一次情報を jsonl と summary.json に保存。
+
+    early_completion=True の場合、GET /messages で当該 chat_id の新しい
+    assistant 回答（baseline_assistant_count を超える分）を観測した時点、
+    または createData 到着後 completion_grace_seconds が経過した時点で
+    待機を終了する。baseline_assistant_count を省略した場合は、
+    ProbeDispatcher が直近の GET /messages で記録した件数（未観測なら 0）を使う。
+    当該 chat_id の assistant 回答を運んだ WebSocket subscription が complete した
+    場合は即時に終了する（user メッセージのみの subscription は対象外）。
+    capture_seconds は待機の上限としてのみ扱う。
+    early_completion=False で v0.2.1 と同じ固定待機になる。
+
+    レスポンス監視は Page 単位の ProbeDispatcher が担い、
+    本関数は購読の登録・解除のみを行う。
+
+    本文の取得・JSON 解析は POST /graphql と /chat/<chat_id>/messages に限る。
+    それ以外のレスポンスは other_count に件数のみ計上し、
+    capture_other=True の場合に限り従来どおり "other" イベントとして記録する。
+
+    イベントは到着ごとに graphql_probe.jsonl へ追記される
+    （journal_flush_every 件ごとに flush）。メモリ上の保持は
+    直近 max_events_in_memory 件に限られ、raw は kind ごとに
+    max_raw_bytes を超えると jsonl 上で省略される。
+    """
+
+    if output_dir is None:
+        output_dir = _default_output_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    dispatcher = get_probe_dispatcher(page)
+    if baseline_assistant_count is None:
+        baseline_assistant_count = dispatcher.assistant_count(chat_id)
+    session = _ProbeSession(
+        chat_id,
+        capture_other=capture_other,
+        journal=ProbeJournal(
+            output_dir / "graphql_probe.jsonl",
+            flush_every=journal_flush_every,
+            max_raw_bytes=max_raw_bytes,
+        ),
+        max_events=max_events_in_memory,
+        baseline_assistant_count=baseline_assistant_count,
+    )
+    token = dispatcher.subscribe(session)
+
+    # ---- 完了検知型の待機（capture_seconds は上限）----
+    started_mono = time.monotonic()
+    deadline = started_mono + capture_seconds
+    completion_reason = "capture_window_elapsed"
+
+    try:
+        while True:
+            now = time.monotonic()
+            if early_completion:
+                reason = session.completion_reason(now, completion_grace_seconds)
+                if reason is not None:
+                    completion_reason = reason
+                    break
+
+            remaining_ms = (deadline - now) * 1000
+            if remaining_ms <= 0:
                 break
+            page.wait_for_timeout(min(poll_interval_ms, remaining_ms))
+    finally:
+        dispatcher.unsubscribe(token)
+        session.close()
+
+    return _write_probe_outputs(
+        session,
+        output_dir=output_dir,
+        completion_reason=completion_reason,
+        started_mono=started_mono,
+    )
 
-    for ev in reversed(events):
-        if ev.kind == "rest_get" and ev.raw:
-            rest_answer = _extract_rest_answer(ev.raw)
-            if rest_answer:
+
+async def run_graphql_probe_async(
+    page: AsyncPage,
+    chat_id: str,
+    *,
+    capture_seconds: int = 30,
+    output_dir: Optional[Path] = None,
+    early_completion: bool = True,
+    completion_grace_seconds: float = DEFAULT_COMPLETION_GRACE_SECONDS,
+    poll_interval_ms: int = DEFAULT_POLL_INTERVAL_MS,
+    capture_other: bool = False,
+    max_events_in_memory: int = DEFAULT_MAX_EVENTS_IN_MEMORY,
+    journal_flush_every: int = DEFAULT_JOURNAL_FLUSH_EVERY,
+    max_raw_bytes: Optional[Mapping[str, int]] = None,
+    baseline_assistant_count: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    run_graphql_probe の asyncio 版（playwright.async_api.Page 用）。
+
+    完了判定・summary.json / graphql_probe.jsonl の内容は同期版と同一。
+    待機は asyncio.sleep で行うため、1 つのイベントループで
+    複数 Page の probe を並行に実行できる。
+    """
+
+    if output_dir is None:
+        output_dir = _default_output_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    dispatcher = get_async_probe_dispatcher(page)
+    if baseline_assistant_count is None:
+        baseline_assistant_count = dispatcher.assistant_count(chat_id)
+    session = _ProbeSession(
+        chat_id,
+        capture_other=capture_other,
+        journal=ProbeJournal(
+            output_dir / "graphql_probe.jsonl",
+            flush_every=journal_flush_every,
+            max_raw_bytes=max_raw_bytes,
+        ),
+        max_events=max_events_in_memory,
+        baseline_assistant_count=baseline_assistant_count,
+    )
+    token = dispatcher.subscribe(session)
+
+    started_mono = time.monotonic()
+    deadline = started_mono + capture_seconds
+    completion_reason = "capture_window_elapsed"
+
+    try:
+        while True:
+            now = time.monotonic()
+            if early_completion:
+                reason = session.completion_reason(now, completion_grace_seconds)
+                if reason is not None:
+                    completion_reason = reason
+                    break
+
+            remaining_ms = (deadline - now) * 1000
+            if remaining_ms <= 0:
                 break
+            await asyncio.sleep(min(poll_interval_ms, remaining_ms) / 1000)
+    finally:
+        dispatcher.unsubscribe(token)
+        session.close()
+
+    return _write_probe_outputs(
+        session,
+        output_dir=output_dir,
+        completion_reason=completion_reason,
+        started_mono=started_mono,
+    )
+
+
+def summarize_session(session: _ProbeSession) -> Dict[str, Any]:
+    """
+    逐次集計値から summary の判定項目を組み立てる。
+    live probe / replay（scripts/probe_replay.py）共通。
+    """
+    has_post = session.has_post
+    has_get = session.has_get
+    has_graphql = session.has_graphql
+    graphql_answer = session.graphql_answer
+    rest_answer = session.rest_answer
 
     # ---- 既存 status 判定（不変）----
     if not has_graphql:
@@ -276,29 +1066,78 @@ def run_graphql_probe(
     else:
         status = "incomplete"
 
+    has_ws = session.has_ws
+    ws_answer = session.ws_answer
+
     # ---- correlation_state 判定（Design_submit_probe_correlation_v0.2 準拠）----
-    if graphql_answer or rest_answer:
+    if graphql_answer or rest_answer or ws_answer:
         correlation_state = "Established"
-    elif has_post or has_get or has_graphql:
+    elif has_post or has_get or has_graphql or has_ws:
         correlation_state = "Not Established"
     else:
         correlation_state = "No Evidence"
 
-    summary = {
-        "chat_id": chat_id,
+    return {
+        "chat_id": session.chat_id,
         "status": status,
         "correlation_state": correlation_state,
-        "first_graphql_ts": first_graphql_ts,
+        "first_graphql_ts": session.first_graphql_ts,
         "graphql_answer": graphql_answer,
         "rest_answer": rest_answer,
         "has_post": has_post,
         "has_get": has_get,
         "has_graphql": has_graphql,
-        "event_count": len(events),
-        "output_dir": str(output_dir),
-        "jsonl_path": str(jsonl_path),
+        "has_ws": has_ws,
+        "ws_answer": ws_answer,
+        "ws_frame_count": session.ws_frame_count,
+        "first_ws_ts": session.first_ws_ts,
+        "ws_completed_ts": session.ws_completed_ts,
+        "event_count": session.event_count,
+        "other_count": session.other_count,
     }
 
+
+def _write_probe_outputs(
+    session: _ProbeSession,
+    *,
+    output_dir: Path,
+    completion_reason: str,
+    started_mono: float,
+) -> Dict[str, Any]:
+    """graphql_probe.jsonl / summary.json を出力し summary を返す（同期・非同期共通）。"""
+    finished_mono = time.monotonic()
+    elapsed_sec = round(finished_mono - started_mono, 3)
+    jsonl_path = output_dir / "graphql_probe.jsonl"
+
+    # graphql_probe.jsonl は journal により逐次出力済み
+    session.close()
+
+    summary = summarize_session(session)
+    summary.update(
+        {
+            "completion_reason": completion_reason,
+            "completed_early": completion_reason != "capture_window_elapsed",
+            "baseline_assistant_count": session.baseline_assistant_count,
+            "elapsed_sec": elapsed_sec,
+            # 同一プロセス内の time.monotonic() 値（実行側の latency timeline 結合用）
+            "monotonic": {
+                "started": started_mono,
+                "first_rest_post": session.first_rest_post_mono,
+                "first_graphql": session.first_graphql_mono,
+                "last_rest_get": session.last_rest_get_mono,
+                "ws_completed": session.ws_completed_mono,
+                "finished": finished_mono,
+            },
+            "output_dir": str(output_dir),
+            "jsonl_path": str(jsonl_path),
+            "journal": {
+                "written": session.journal.written if session.journal else 0,
+                "raw_truncated": session.journal.truncated if session.journal else 0,
+                "errors": session.journal.errors if session.journal else 0,
+            },
+        }
+    )
+
     (output_dir / "summary.json").write_text(
         json.dumps(summary, ensure_ascii=False, indent=2),
         encoding="utf-8",
@@ -309,7 +1148,7 @@ def run_graphql_probe(
 
 if __name__ == "__main__":
     print(
-        "probe_v0_2.1 はライブラリモジュールとして利用します。\n"
+        "probe_v0_2.9 はライブラリモジュールとして利用します。\n"
         "template_prepare_chat_v0_1 などから page / chat_id を取得し、\n"
         "run_graphql_probe(page, chat_id) を呼び出してください。"
     )
@@ -0,0 +1,353 @@
+"""
+Offline batch re-extraction over a whole run directory.
+
+- walks <run_root>/answer/** for question directories holding a stored
+  answer snapshot (after_answer_ready.html, or the _live / _scope
+  fragments written by the other dom_capture modes); the snapshot recorded
+  in raw_capture_meta.json ("snapshot") is the one re-extracted
+- re-runs extraction (answer_dom_extractor) in a process pool
+- writes refreshed dom_candidates.json / raw_answer.* / raw_capture_meta.json,
+  keeping the original provenance (submit_id / chat_id / checkpoint /
+  captured_at) and marking them source "reextract_run"
+- reports differences against the stored raw_capture_meta.json
+
+Refreshed files go to --output-root (default: <run_root>/reextract/<ts>)
+mirroring the answer/ layout; --in-place overwrites the question directories.
+
+Usage:
+- python scripts/reextract_run.py out/<run_id> --workers 8
+- python scripts/reextract_run.py out/<run_id> --in-place --parser lxml
+- python scripts/reextract_run.py out/<run_id> --cache-dir .cache/extraction
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.execution.answer_dom_extractor import (  # noqa: E402
+    EXTRACTOR_VERSION,
+    resolve_parser,
+)
+from src.execution.extraction_cache import ExtractionCache  # noqa: E402
+from src.execution.run_single_question import (  # noqa: E402
+    _persist_raw_capture,
+    _write_dom_candidates_file,
+)
+
+REEXTRACT_SOURCE = "reextract_run"
+
+# Stored snapshot names, in order of preference when the stored meta does
+# not record one (captures written before raw_capture_meta["snapshot"]).
+SNAPSHOT_NAMES = (
+    "after_answer_ready.html",
+    "after_answer_ready_live.html",
+    "after_answer_ready_scope.html",
+)
+
+# raw_capture_meta.json fields compared with the stored capture.
+COMPARED_META_FIELDS = ("extracted_status", "anchor_dom_selector", "selection_reason")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def iter_question_dirs(run_root: Path) -> Iterator[Path]:
+    answer_root = run_root / "answer"
+    seen = set()
+    for name in SNAPSHOT_NAMES:
+        for snapshot in answer_root.rglob(name):
+            if snapshot.parent not in seen:
+                seen.add(snapshot.parent)
+                yield snapshot.parent
+
+
+def _pick_snapshot(
+    question_dir: Path, stored_meta: Optional[Dict[str, Any]] = None
+) -> Optional[Path]:
+    recorded = (stored_meta or {}).get("snapshot")
+    if isinstance(recorded, str) and recorded in SNAPSHOT_NAMES:
+        path = question_dir / recorded
+        if path.is_file():
+            return path
+    for name in SNAPSHOT_NAMES:
+        path = question_dir / name
+        if path.is_file():
+            return path
+    return None
+
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def reextract_question_dir(
+    question_dir: Path,
+    out_dir: Path,
+    *,
+    parser: Optional[str] = None,
+    tail_only: bool = True,
+    cache: Optional[ExtractionCache] = None,
+) -> Dict[str, Any]:
+    """Re-run extraction for one question directory and diff it with the stored capture."""
+    stored_meta = _load_json(question_dir / "raw_capture_meta.json")
+    snapshot_path = _pick_snapshot(question_dir, stored_meta)
+    if snapshot_path is None:
+        return {"question_dir": str(question_dir), "status": "no_snapshot"}
+
+    stored_candidates = _load_json(question_dir / "dom_candidates.json") or {}
+    stored_raw_path = question_dir / "raw_answer.html"
+    stored_raw = (
+        stored_raw_path.read_text(encoding="utf-8") if stored_raw_path.is_file() else None
+    )
+
+    html = snapshot_path.read_text(encoding="utf-8")
+    started = time.perf_counter()
+    cached = (cache or ExtractionCache()).extract(html, parser=parser, tail_only=tail_only)
+    result = cached.result
+    elapsed = time.perf_counter() - started
+
+    errors: List[str] = []
+    out_dir.mkdir(parents=True, exist_ok=True)
+    reextracted = {
+        "source": REEXTRACT_SOURCE,
+        "extractor_version": EXTRACTOR_VERSION,
+        "reextracted_at": datetime.now(timezone.utc).isoformat(),
+        "reextracted_from": snapshot_path.name,
+    }
+    meta_provenance = {
+        **reextracted,
+        "parser": resolve_parser(parser),
+        "parse_mode": cached.parse_mode,
+    }
+    if stored_meta is not None and stored_meta.get("captured_at"):
+        meta_provenance["captured_at"] = stored_meta["captured_at"]
+    _persist_raw_capture(
+        output_dir=out_dir,
+        raw_html=result.raw_html,
+        raw_text=result.raw_text,
+        anchor_dom_selector=result.anchor_dom_selector,
+        selection_reason=result.observation.reason,
+        extracted_status=result.extracted_status,
+        errors=errors,
+        snapshot_name=snapshot_path.name,
+        provenance=meta_provenance,
+    )
+    observation = {
+        "selected": result.observation.selected,
+        "selected_n": result.observation.selected_n,
+        "parity": result.observation.parity,
+        "reason": result.observation.reason,
+        "text_len": result.observation.text_len,
+        "extracted_status": result.extracted_status,
+    }
+    _write_dom_candidates_file(
+        path=out_dir / "dom_candidates.json",
+        html=html,
+        submit_id=stored_candidates.get("submit_id") or "N/A",
+        chat_id=stored_candidates.get("chat_id") or "N/A",
+        observation=observation,
+        errors=errors,
+        precomputed=(cached.candidates, cached.candidate_errors),
+        provenance={
+            **reextracted,
+            "checkpoint": stored_candidates.get("checkpoint") or "after_answer_ready",
+        },
+    )
+
+    new_meta = {
+        "extracted_status": result.extracted_status,
+        "anchor_dom_selector": result.anchor_dom_selector,
+        "selection_reason": result.observation.reason,
+    }
+    diffs: Dict[str, Any] = {}
+    if stored_meta is not None:
+        for field in COMPARED_META_FIELDS:
+            if stored_meta.get(field) != new_meta.get(field):
+                diffs[field] = {"stored": stored_meta.get(field), "new": new_meta.get(field)}
+    if stored_raw is not None and _sha256(stored_raw) != _sha256(result.raw_html):
+        diffs["raw_html"] = {"stored_len": len(stored_raw), "new_len": len(result.raw_html)}
+
+    if stored_meta is None and stored_raw is None:
+        status = "new"
+    else:
+        status = "changed" if diffs else "unchanged"
+
+    return {
+        "question_dir": str(question_dir),
+        "snapshot": snapshot_path.name,
+        "status": status,
+        "extracted_status": result.extracted_status,
+        "cache_hit": cached.cache_hit,
+        "extract_sec": round(elapsed, 4),
+        "diffs": diffs,
+        "errors": errors,
+    }
+
+
+_WORKER_CACHES: Dict[Optional[str], ExtractionCache] = {}
+
+
+def _worker_cache(cache_dir: Optional[str]) -> ExtractionCache:
+    # One cache per worker process (memory tier shared across its tasks).
+    cache = _WORKER_CACHES.get(cache_dir)
+    if cache is None:
+        cache = ExtractionCache(Path(cache_dir) if cache_dir else None)
+        _WORKER_CACHES[cache_dir] = cache
+    return cache
+
+
+def _reextract_one(args: tuple) -> Dict[str, Any]:
+    question_dir, out_dir, parser, tail_only, cache_dir = args
+    try:
+        return reextract_question_dir(
+            Path(question_dir),
+            Path(out_dir),
+            parser=parser,
+            tail_only=tail_only,
+            cache=_worker_cache(cache_dir),
+        )
+    except Exception as exc:
+        return {
+            "question_dir": str(question_dir),
+            "status": "error",
+            "error": f"{type(exc).__name__}: {exc}",
+        }
+
+
+def reextract_run(
+    run_root: Path,
+    *,
+    output_root: Optional[Path] = None,
+    in_place: bool = False,
+    workers: Optional[int] = None,
+    parser: Optional[str] = None,
+    tail_only: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Re-extract every question directory under run_root/answer in a process pool."""
+    answer_root = run_root / "answer"
+    if output_root is None and not in_place:
+        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output_root = run_root / "reextract" / ts
+
+    tasks = []
+    for question_dir in sorted(iter_question_dirs(run_root)):
+        out_dir = (
+            question_dir
+            if in_place
+            else Path(output_root) / "answer" / question_dir.relative_to(answer_root)
+        )
+        tasks.append(
+            (
+                str(question_dir),
+                str(out_dir),
+                parser,
+                tail_only,
+                str(cache_dir) if cache_dir else None,
+            )
+        )
+
+    started = time.perf_counter()
+    if workers == 1 or len(tasks) <= 1:
+        results = [_reextract_one(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    _reextract_one,
+                    tasks,
+                    chunksize=max(1, len(tasks) // ((workers or 4) * 8)),
+                )
+            )
+    elapsed = time.perf_counter() - started
+
+    counts: Dict[str, int] = {}
+    cache_hits = 0
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+        cache_hits += 1 if r.get("cache_hit") else 0
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "run_root": str(run_root),
+        "output_root": str(run_root if in_place else output_root),
+        "in_place": in_place,
+        "question_count": len(tasks),
+        "counts": counts,
+        "cache_hits": cache_hits,
+        "elapsed_sec": round(elapsed, 3),
+        "questions_per_sec": round(len(tasks) / elapsed, 1) if elapsed > 0 else None,
+        "results": results,
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Re-run DOM extraction over a stored run directory."
+    )
+    parser.add_argument("run_root", help="Run directory containing answer/.")
+    parser.add_argument("--output-root", default=None)
+    parser.add_argument("--in-place", action="store_true", help="Overwrite stored files.")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size.")
+    parser.add_argument("--parser", default=None, help="BeautifulSoup backend.")
+    parser.add_argument(
+        "--full-parse", action="store_true", help="Disable the tail-only parse fast path."
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="On-disk extraction cache (content-hash keyed)."
+    )
+    parser.add_argument("--report", default=None, help="Diff report path (JSON).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    run_root = Path(args.run_root)
+    if not (run_root / "answer").is_dir():
+        print(f"[ERROR] answer directory not found: {run_root / 'answer'}")
+        return 1
+
+    report = reextract_run(
+        run_root,
+        output_root=Path(args.output_root) if args.output_root else None,
+        in_place=args.in_place,
+        workers=args.workers,
+        parser=args.parser,
+        tail_only=not args.full_parse,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+    )
+
+    report_path = (
+        Path(args.report)
+        if args.report
+        else Path(report["output_root"]) / "reextract_report.json"
+    )
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"question_count: {report['question_count']}")
+    print(f"counts: {report['counts']} (cache hits: {report['cache_hits']})")
+    print(f"elapsed_sec: {report['elapsed_sec']} ({report['questions_per_sec']} questions/sec)")
+    print(f"report: {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,6 +16,7 @@ from pathlib import Path
 from playwright.sync_api import sync_playwright
 import yaml
 
+from scripts.probe_v0_2 import get_probe_dispatcher
 from src.env_loader import load_env
 from tests.pages.login_page import LoginPage
 from tests.pages.chat_select_page import ChatSelectPage
@@ -94,7 +95,7 @@ def main():
     # --------------------------------------------------
     # Load environment (same as conftest.py)
     # --------------------------------------------------
-    config, _ = load_env()
+    config, options = load_env()
 
     # --------------------------------------------------
     # Fixed manual execution parameters (explicit)
@@ -200,6 +201,10 @@ def main():
         context = browser.new_context()
         page = context.new_page()
 
+        # Probe listeners go in before navigation so that the chat's
+        # subscription websocket (opened at page load) is observed.
+        get_probe_dispatcher(page).install()
+
         # ---- Login ----
         login = LoginPage(page, config)
         login.open()
@@ -239,6 +244,9 @@ def main():
                 "max_tokens": 2048,
             },
             question_pool=question_pool,
+            capture_level=options.get("capture_level"),
+            ui_ready_timeout_ms=options.get("ui_ready_timeout_ms"),
+            screenshot_options=options.get("screenshot"),
         )
 
         # --------------------------------------------------
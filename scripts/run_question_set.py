@@ -42,6 +42,7 @@ from src.execution.customized_question_set_loader import (
     load_customized_question_set,
 )
 from scripts.archive_run import create_run_archive
+from scripts.probe_v0_2 import get_probe_dispatcher
 
 
 INPUT_ROOT = Path("data") / "customized_question_sets"
@@ -201,7 +202,7 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    config, _ = load_env()
+    config, options = load_env()
     output_root = _resolve_output_root(args, parser)
     run_id = output_root.name
 
@@ -228,6 +229,10 @@ def main() -> None:
         context = browser.new_context()
         page = context.new_page()
 
+        # Probe listeners go in before navigation so that the chat's
+        # subscription websocket (opened at page load) is observed.
+        get_probe_dispatcher(page).install()
+
         login = LoginPage(page, config)
         login.open()
         login.login()
@@ -263,6 +268,9 @@ def main() -> None:
                 output_root=output_root,
                 execution=execution,
                 question_pool=question_set.question_pool,
+                capture_level=options.get("capture_level"),
+                ui_ready_timeout_ms=options.get("ui_ready_timeout_ms"),
+                screenshot_options=options.get("screenshot"),
             )
             latest_summary = summary
             question_pool_values.append(question_set.question_pool)
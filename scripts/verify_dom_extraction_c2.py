@@ -3,6 +3,7 @@ Offline C-2 DOM extraction verification.
 
 Usage:
 - python scripts/verify_dom_extraction_c2.py <after_answer_ready.html>
+- python scripts/verify_dom_extraction_c2.py <html> --cache-dir .cache/extraction
 """
 
 from __future__ import annotations
@@ -19,6 +20,7 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from src.execution import answer_dom_extractor as ade
+from src.execution.extraction_cache import ExtractionCache
 
 DEFAULT_INPUT = Path(
     "out/f8/20251228/20251228T185721_manual/20251228/manual-test/Q15/after_answer_ready.html"
@@ -35,11 +37,21 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         default=str(DEFAULT_INPUT),
         help="Path to after_answer_ready.html",
     )
+    parser.add_argument(
+        "--parser",
+        default=None,
+        help="BeautifulSoup backend (html.parser / lxml / html5lib / auto).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="On-disk extraction cache (content-hash keyed; shared with reextract_run).",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv: List[str] | None = None) -> int:
-    args = parse_args(argv or [])
+    args = parse_args(sys.argv[1:] if argv is None else argv)
     html_path = Path(args.html_path)
     if not html_path.is_file():
         print(f"[ERROR] file not found: {html_path}")
@@ -48,15 +60,20 @@ def main(argv: List[str] | None = None) -> int:
     html = html_path.read_text(encoding="utf-8")
 
     # Scope detection (same parser as extraction).
-    soup = BeautifulSoup(html, ade.BS_PARSER)
+    parser_name = ade.resolve_parser(args.parser)
+    soup = BeautifulSoup(html, parser_name)
     message_blocks = soup.select("div.message-received")
     scope = message_blocks[-1] if message_blocks else None
     markdown_blocks = scope.select("div.markdown") if scope is not None else []
     markdown_ids = [md.get("id") for md in markdown_blocks]
     scope_position = len(message_blocks) if scope is not None else None
 
-    extraction = ade.extract_answer_dom(html, question_text="")
-    candidates_serialized, candidate_errors = ade.collect_dom_candidates(html)
+    # Extraction + candidates in one (memoized) parse of the full page.
+    cache = ExtractionCache(Path(args.cache_dir) if args.cache_dir else None)
+    cached = cache.extract(html, parser=parser_name, tail_only=False)
+    extraction = cached.result
+    candidates_serialized = cached.candidates
+    candidate_errors = cached.candidate_errors
 
     selected_n = extraction.observation.selected_n
     parity = extraction.observation.parity or "N/A"
@@ -65,6 +82,8 @@ def main(argv: List[str] | None = None) -> int:
     )
 
     print(f"HTML_PATH: {html_path}")
+    print(f"parser: {parser_name}")
+    print(f"cache: {cached.cache_hit or 'miss'}")
     print(f"message_received.count: {len(message_blocks)}")
     if scope is None:
         print("target_scope: NONE")
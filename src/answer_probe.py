@@ -6,16 +6,42 @@ Operational binding for Spec_answer_probe_api_v0.1,
 reflecting current probe implementation constraints.
 
 Key points:
-- Requires Playwright sync Page as execution context.
+- Requires Playwright Page as execution context
+  (sync: wait_for_answer_text / async: wait_for_answer_text_async).
 - Delegates all completion semantics to probe.
+- Completion strategy is selectable:
+  "graphql" (network evidence, probe_v0_2) or
+  "dom_stability" (answer DOM quiet window, probe_dom_stability).
 - Surfaces observable facts only (raw answer or exceptions).
 """
 
-from typing import Any, Dict
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional
 
 from playwright.sync_api import Page
 
-from scripts.probe_v0_2 import run_graphql_probe
+from scripts.probe_dom_stability import (
+    run_dom_stability_probe,
+    run_dom_stability_probe_async,
+)
+from scripts.probe_v0_2 import run_graphql_probe, run_graphql_probe_async
+
+if TYPE_CHECKING:  # async API is only needed by wait_for_answer_text_async callers
+    from playwright.async_api import Page as AsyncPage
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPLETION_STRATEGIES = ("graphql", "dom_stability")
+DEFAULT_COMPLETION_STRATEGY = "graphql"
+
+_SYNC_PROBES = {
+    "graphql": run_graphql_probe,
+    "dom_stability": run_dom_stability_probe,
+}
+_ASYNC_PROBES = {
+    "graphql": run_graphql_probe_async,
+    "dom_stability": run_dom_stability_probe_async,
+}
 
 
 # ----------------------------------------------------------------------
@@ -33,7 +59,7 @@ class AnswerTimeoutError(Exception):
 class AnswerNotAvailableError(Exception):
     """
     Raised when probe evidence exists, but no answer text
-    (REST nor GraphQL) could be obtained.
+    (REST, GraphQL, WebSocket nor stable DOM) could be obtained.
     """
 
 
@@ -55,6 +81,9 @@ def wait_for_answer_text(
     submit_id: str,
     chat_id: str,
     timeout_sec: int = 60,
+    on_summary: Optional[Callable[[Dict[str, Any]], None]] = None,
+    strategy: str = DEFAULT_COMPLETION_STRATEGY,
+    strategy_options: Optional[Mapping[str, Any]] = None,
 ) -> str:
     """
     Wait for an answer text via Answer Detection Layer (probe).
@@ -71,6 +100,15 @@ def wait_for_answer_text(
     timeout_sec : int, optional
         Upper bound for waiting (seconds).
         Completion semantics are defined by probe, not here.
+    on_summary : callable, optional
+        Receives the raw probe summary before answer mapping
+        (observation hook, e.g. latency timeline). Exceptions raised by
+        it are logged and ignored.
+    strategy : str, optional
+        Completion strategy ("graphql" or "dom_stability").
+    strategy_options : mapping, optional
+        Extra keyword arguments for the selected probe
+        (e.g. {"quiet_ms": 2000} for "dom_stability").
 
     Returns
     -------
@@ -85,21 +123,102 @@ def wait_for_answer_text(
         When probe evidence exists but answer text is unavailable.
     ProbeExecutionError
         When probe execution itself fails.
+    ValueError
+        When strategy is unknown.
     """
 
     # NOTE:
     # submit_id is intentionally unused in v0.1r.
     # It is kept to preserve API contract and future extensibility.
 
+    probe = _select_probe(_SYNC_PROBES, strategy)
+
     try:
-        summary: Dict[str, Any] = run_graphql_probe(
+        summary: Dict[str, Any] = probe(
             page=page,
             chat_id=chat_id,
             capture_seconds=timeout_sec,
+            **dict(strategy_options or {}),
         )
     except Exception as exc:
         raise ProbeExecutionError("probe execution failed") from exc
 
+    _notify_summary(on_summary, summary)
+
+    return _answer_from_summary(summary)
+
+
+async def wait_for_answer_text_async(
+    *,
+    page: "AsyncPage",
+    submit_id: str,
+    chat_id: str,
+    timeout_sec: int = 60,
+    on_summary: Optional[Callable[[Dict[str, Any]], None]] = None,
+    strategy: str = DEFAULT_COMPLETION_STRATEGY,
+    strategy_options: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """
+    Asyncio counterpart of wait_for_answer_text.
+
+    Same parameters, return value and exception mapping, but takes a
+    playwright.async_api Page so that one event loop can wait on many
+    pages concurrently. Probe outputs (summary.json / graphql_probe.jsonl)
+    are identical to the sync variant.
+    """
+
+    # NOTE: submit_id is intentionally unused (see wait_for_answer_text).
+
+    probe = _select_probe(_ASYNC_PROBES, strategy)
+
+    try:
+        summary: Dict[str, Any] = await probe(
+            page=page,
+            chat_id=chat_id,
+            capture_seconds=timeout_sec,
+            **dict(strategy_options or {}),
+        )
+    except Exception as exc:
+        raise ProbeExecutionError("probe execution failed") from exc
+
+    _notify_summary(on_summary, summary)
+
+    return _answer_from_summary(summary)
+
+
+# ----------------------------------------------------------------------
+# Internal helpers
+# ----------------------------------------------------------------------
+
+
+def _notify_summary(
+    on_summary: Optional[Callable[[Dict[str, Any]], None]], summary: Dict[str, Any]
+) -> None:
+    """Run the observation hook; its failure never changes the answer mapping."""
+    if on_summary is None:
+        return
+    try:
+        on_summary(summary)
+    except Exception:
+        _LOGGER.warning("on_summary hook failed (ignored)", exc_info=True)
+
+
+def _select_probe(probes: Dict[str, Any], strategy: str) -> Any:
+    try:
+        return probes[strategy]
+    except KeyError:
+        raise ValueError(
+            f"unknown completion strategy: {strategy!r} "
+            f"(expected one of {COMPLETION_STRATEGIES})"
+        ) from None
+
+
+def _answer_from_summary(summary: Dict[str, Any]) -> str:
+    """
+    Map a probe summary to an answer text or a fact-based exception.
+    Shared by the sync and async APIs.
+    """
+
     # ------------------------------------------------------------------
     # Answer selection (summary -> pytest API mapping)
     # ------------------------------------------------------------------
@@ -112,6 +231,14 @@ def wait_for_answer_text(
     if graphql_answer:
         return graphql_answer
 
+    ws_answer = summary.get("ws_answer")
+    if ws_answer:
+        return ws_answer
+
+    dom_answer = summary.get("dom_answer")
+    if dom_answer:
+        return dom_answer
+
     # ------------------------------------------------------------------
     # Exception mapping (observable facts only)
     # ------------------------------------------------------------------
@@ -119,8 +246,10 @@ def wait_for_answer_text(
     has_post = summary.get("has_post", False)
     has_get = summary.get("has_get", False)
     has_graphql = summary.get("has_graphql", False)
+    has_ws = summary.get("has_ws", False)
+    has_dom = summary.get("has_dom", False)
 
-    if has_post or has_get or has_graphql:
+    if has_post or has_get or has_graphql or has_ws or has_dom:
         raise AnswerNotAvailableError(
             "probe observed related events, but answer text is not available"
         )
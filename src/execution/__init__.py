@@ -18,6 +18,10 @@ from src.execution.f8_orchestrator import (
     RunSummary,
     run_f8_collection,
 )
+from src.execution.timeout_policy import (
+    LatencyTimeoutPolicy,
+    load_timeout_policy,
+)
 
 __all__ = [
     "ChatPageProtocol",
@@ -32,4 +36,6 @@ __all__ = [
     "ResultStatus",
     "RunSummary",
     "run_f8_collection",
+    "LatencyTimeoutPolicy",
+    "load_timeout_policy",
 ]
@@ -1,18 +1,51 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import importlib.util
 import re
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import DEFAULT_OUTPUT_ENCODING
+from bs4.formatter import Formatter
 
 
+# Bump whenever extraction / candidate output can change for the same HTML
+# (invalidates memoized results, see extraction_cache).
+EXTRACTOR_VERSION = "c2.1"
+
+# Default BeautifulSoup tree builder (stdlib, always available).
 BS_PARSER = "html.parser"
 
+# Selectable tree builders -> module that must be importable.
+# lxml / html5lib are optional; extraction output is identical across
+# backends for recorded chat pages (see tests/execution parity tests).
+PARSER_BACKENDS: Dict[str, Optional[str]] = {
+    "html.parser": None,
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+}
+
+# "auto" picks the first available backend in this order.
+AUTO_PARSER_ORDER = ("lxml", "html.parser")
+
 
 MARKDOWN_ID_PATTERN = re.compile(r"^markdown-(\d+)$")
+MESSAGE_RECEIVED_CLASS = "message-received"
+# Raw-text / comment openers whose content must not be mistaken for markup.
+_TAIL_RAW_TEXT_GUARDS = (
+    ("<script", "</script"),
+    ("<style", "</style"),
+    ("<textarea", "</textarea"),
+    ("<!--", "-->"),
+)
 NOISE_TAGS = {"svg", "button", "form", "textarea", "nav", "aside"}
 
+# File names shown with citations (e.g. "第3条（k518RG00000064.md）").
+CITATION_FILE_PATTERN = re.compile(
+    r"[\w\-.]+\.(?:md|txt|pdf|html?|docx?|xlsx?|pptx?|csv|json)\b", re.IGNORECASE
+)
+
 
 @dataclass
 class MarkdownCandidate:
@@ -43,11 +76,55 @@ class ExtractionResult:
     observation: DomExtractionObservation
 
 
+@dataclass(frozen=True)
+class DisplayedCitation:
+    text: str  # as displayed (whitespace-normalized)
+    href: Optional[str]
+    title: Optional[str]
+    file_name: Optional[str]
+
+    def to_line(self) -> str:
+        """One line for answer.md ## Citations (As Displayed)."""
+        label = self.text or self.title or self.file_name or self.href or ""
+        if self.href and self.href not in label:
+            return f"{label} ({self.href})"
+        return label
+
+
 # ------------------------------------------------------------
 # Existing logic (unchanged)
 # ------------------------------------------------------------
 
 
+def available_parsers() -> List[str]:
+    return [
+        name
+        for name, module in PARSER_BACKENDS.items()
+        if module is None or importlib.util.find_spec(module) is not None
+    ]
+
+
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """
+    Resolve a parser name (None -> BS_PARSER, "auto" -> fastest available).
+    Raises ValueError for unknown or uninstalled backends.
+    """
+    if parser is None:
+        return BS_PARSER
+
+    available = available_parsers()
+    if parser == "auto":
+        return next(name for name in AUTO_PARSER_ORDER if name in available)
+
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(
+            f"unknown html parser: {parser!r} (expected one of {list(PARSER_BACKENDS)})"
+        )
+    if parser not in available:
+        raise ValueError(f"html parser not installed: {parser!r}")
+    return parser
+
+
 def _find_message_received_scope(
     soup: BeautifulSoup,
 ) -> Tuple[Optional[Tag], List[str]]:
@@ -57,8 +134,10 @@ def _find_message_received_scope(
     return containers[-1], []
 
 
-def _parse_markdown_candidates(html: str) -> Tuple[List[MarkdownCandidate], List[str]]:
-    soup = BeautifulSoup(html, BS_PARSER)
+def _parse_markdown_candidates(
+    html: str, parser: Optional[str] = None
+) -> Tuple[List[MarkdownCandidate], List[str]]:
+    soup = BeautifulSoup(html, resolve_parser(parser))
     scope, scope_errors = _find_message_received_scope(soup)
     return _parse_markdown_candidates_from_scope(scope, scope_errors)
 
@@ -124,10 +203,11 @@ def _extract_candidate_text(candidate: MarkdownCandidate) -> Optional[str]:
         return None
 
 
-def _clone_scope_for_cleaning(target: Tag) -> Optional[Tag]:
+def _clone_scope_for_cleaning(target: Tag, parser: str = BS_PARSER) -> Optional[Tag]:
     try:
-        fragment = BeautifulSoup(str(target), BS_PARSER)
-        return fragment.find()
+        fragment = BeautifulSoup(str(target), parser)
+        # lxml / html5lib wrap fragments in <html><body>; look the target up by name.
+        return fragment.find(target.name)
     except Exception:
         return None
 
@@ -141,11 +221,15 @@ def _apply_noise_filters(root: Tag) -> None:
         element.decompose()
 
 
-def _serialize_clean_html(target: Tag) -> Tuple[str, str]:
+def _serialize_clean_html_by_clone(
+    target: Tag, parser: str = BS_PARSER
+) -> Tuple[str, str]:
     """
-    Return (html, text_content) after structural noise removal.
+    Reference implementation of _serialize_clean_html
+    (re-parse clone + noise filters + decode / get_text).
+    Kept for parity checks; extraction uses the single-walk version.
     """
-    clone = _clone_scope_for_cleaning(target)
+    clone = _clone_scope_for_cleaning(target, parser)
     if clone is None:
         return "", ""
 
@@ -154,6 +238,83 @@ def _serialize_clean_html(target: Tag) -> Tuple[str, str]:
     return clone.decode(), text_content
 
 
+def _is_noise(element: Tag) -> bool:
+    return element.name in NOISE_TAGS or element.get("role") == "button"
+
+
+def _format_start_tag(element: Tag, formatter: Formatter) -> str:
+    """Opening tag exactly as Tag.decode renders it (sorted attributes)."""
+    attrs = []
+    for key, val in formatter.attributes(element):
+        if val is None:
+            attrs.append(key)
+            continue
+        if isinstance(val, (list, tuple)):
+            val = " ".join(val)
+        elif hasattr(val, "substitute_encoding"):
+            val = val.substitute_encoding(DEFAULT_OUTPUT_ENCODING)
+        elif not isinstance(val, str):
+            val = str(val)
+        text = formatter.attribute_value(val)
+        attrs.append(f"{key}={formatter.quoted_attribute_value(text)}")
+
+    prefix = f"{element.prefix}:" if element.prefix else ""
+    attribute_string = " " + " ".join(attrs) if attrs else ""
+    void_slash = (formatter.void_element_close_prefix or "") if element.is_empty_element else ""
+    return f"<{prefix}{element.name}{attribute_string}{void_slash}>"
+
+
+def _serialize_clean_html(target: Tag) -> Tuple[str, str]:
+    """
+    Return (html, text_content) after structural noise removal.
+
+    Single walk over the original tree: noise subtrees (NOISE_TAGS,
+    role=button; the target itself is never dropped) are skipped while
+    HTML and text are emitted together. Output is identical to the
+    clone-based reference (_serialize_clean_html_by_clone) without
+    copying or re-parsing the target.
+    """
+    formatter = target.formatter_for_name("minimal")
+    text_types = target.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+
+    html_parts: List[str] = []
+    text_parts: List[str] = []
+
+    # Stack items: PageElement to emit, or a closing-tag string (tuple-wrapped).
+    stack: List[Any] = [target]
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, tuple):
+            html_parts.append(node[0])
+            continue
+
+        if isinstance(node, NavigableString):
+            html_parts.append(node.output_ready(formatter))
+            if (
+                type(node) is text_types
+                if isinstance(text_types, type)
+                else type(node) in text_types
+            ):
+                stripped = node.strip()
+                if stripped:
+                    text_parts.append(stripped)
+            continue
+
+        if node is not target and _is_noise(node):
+            continue
+
+        html_parts.append(_format_start_tag(node, formatter))
+        if node.is_empty_element:
+            continue
+
+        prefix = f"{node.prefix}:" if node.prefix else ""
+        stack.append((f"</{prefix}{node.name}>",))
+        stack.extend(reversed(node.contents))
+
+    return "".join(html_parts), "".join(text_parts)
+
+
 def _serialize_raw_html(target: Tag) -> Tuple[str, str]:
     """
     Return minimally cleaned anchor DOM (HTML + text).
@@ -161,10 +322,127 @@ def _serialize_raw_html(target: Tag) -> Tuple[str, str]:
     return _serialize_clean_html(target)
 
 
-def extract_answer_dom(html: str, question_text: str) -> ExtractionResult:
-    soup = BeautifulSoup(html or "", BS_PARSER)
-    scope, scope_errors = _find_message_received_scope(soup)
+def _locate_last_scope_start(html: str) -> Optional[int]:
+    """
+    Offset of the opening tag of the last message-received container,
+    or None when the boundary cannot be located unambiguously.
+
+    The last textual occurrence of the class name must sit inside an
+    opening tag (verified after parsing, see _parse_scope_tail) that is
+    not within a script / style / textarea / comment.
+    """
+    pos = html.rfind(MESSAGE_RECEIVED_CLASS)
+    if pos < 0:
+        return None
+
+    start = html.rfind("<", 0, pos)
+    if start < 0:
+        return None
 
+    for opener, closer in _TAIL_RAW_TEXT_GUARDS:
+        if html.rfind(opener, 0, start) > html.rfind(closer, 0, start):
+            return None
+
+    return start
+
+
+def _parse_scope_tail(
+    html: str, parser: str
+) -> Optional[Tuple[BeautifulSoup, Tag]]:
+    """
+    Parse only html[start:] where start is the last container boundary.
+    Returns (tail_soup, scope) or None when the tail does not begin with
+    a message-received element (caller falls back to a full parse).
+    """
+    start = _locate_last_scope_start(html)
+    if start is None:
+        return None
+
+    tail_soup = BeautifulSoup(html[start:], parser)
+    containers = tail_soup.select(f".{MESSAGE_RECEIVED_CLASS}")
+    if len(containers) != 1:
+        return None
+
+    scope = containers[0]
+    first = tail_soup.find(True)
+    if parser != "html.parser":
+        # lxml / html5lib wrap the tail in <html><body>.
+        first = tail_soup.body.find(True) if tail_soup.body is not None else None
+    if first is not scope:
+        return None
+    return tail_soup, scope
+
+
+class ParsedSnapshot:
+    """
+    One parsed page snapshot shared by extraction, candidate forensics
+    and serialization.
+
+    The HTML is parsed once (with the selected backend, see resolve_parser);
+    scope lookup, extraction, candidates and per-element serializations are
+    computed lazily and memoized.
+
+    tail_only=True parses only the last message-received container and what
+    follows it (long chat histories), falling back to a full parse when the
+    boundary is ambiguous. parse_mode records which path was taken.
+    """
+
+    def __init__(
+        self, html: str, parser: Optional[str] = None, *, tail_only: bool = False
+    ) -> None:
+        self.html = html or ""
+        self.parser = resolve_parser(parser)
+        self.parse_mode = "full"
+
+        tail = _parse_scope_tail(self.html, self.parser) if tail_only else None
+        if tail is not None:
+            self.soup, scope = tail
+            self.scope, self.scope_errors = scope, []
+            self.parse_mode = "tail"
+        else:
+            self.soup = BeautifulSoup(self.html, self.parser)
+            self.scope, self.scope_errors = _find_message_received_scope(self.soup)
+        self._serialized: Dict[int, Tuple[str, str]] = {}
+        self._extraction: Optional[ExtractionResult] = None
+        self._candidates: Optional[Tuple[List[dict], List[str]]] = None
+        self._citations: Optional[List[DisplayedCitation]] = None
+
+    def serialize(self, target: Tag) -> Tuple[str, str]:
+        """Memoized _serialize_clean_html for elements of this snapshot."""
+        key = id(target)
+        cached = self._serialized.get(key)
+        if cached is None:
+            cached = _serialize_clean_html(target)
+            self._serialized[key] = cached
+        return cached
+
+    def extract(self, question_text: str = "") -> ExtractionResult:
+        if self._extraction is None:
+            self._extraction = _extract_from_scope(
+                self.scope, self.scope_errors, self.serialize
+            )
+        return self._extraction
+
+    def citations(self) -> List[DisplayedCitation]:
+        if self._citations is None:
+            self._citations = _collect_citations_from_scope(self.scope)
+        return list(self._citations)
+
+    def candidates(self) -> Tuple[List[dict], List[str]]:
+        if self._candidates is None:
+            self._candidates = _collect_candidates_from_scope(
+                self.scope, self.scope_errors
+            )
+        # Callers may extend the lists; hand out copies.
+        serialized, errors = self._candidates
+        return list(serialized), list(errors)
+
+
+def _extract_from_scope(
+    scope: Optional[Tag],
+    scope_errors: List[str],
+    serialize: Callable[[Tag], Tuple[str, str]],
+) -> ExtractionResult:
     candidates, candidate_errors = _parse_markdown_candidates_from_scope(
         scope, scope_errors
     )
@@ -204,8 +482,10 @@ def extract_answer_dom(html: str, question_text: str) -> ExtractionResult:
     extracted_html = ""
 
     if target_element is not None:
-        raw_html, raw_text = _serialize_raw_html(target_element)
-        extracted_html, _ = _serialize_clean_html(target_element)
+        # raw and extracted HTML are the same minimally cleaned serialization;
+        # serialize once and reuse it for both.
+        raw_html, raw_text = serialize(target_element)
+        extracted_html = raw_html
 
     if target_element is None:
         errors.append(selection_reason)
@@ -270,14 +550,9 @@ def extract_answer_dom(html: str, question_text: str) -> ExtractionResult:
     )
 
 
-def collect_dom_candidates(html: str) -> Tuple[List[dict], List[str]]:
-    """
-    Enumerate plausible answer containers for forensics (non-evaluative).
-    (Unchanged legacy behavior)
-    """
-    soup = BeautifulSoup(html or "", BS_PARSER)
-    scope, scope_errors = _find_message_received_scope(soup)
-
+def _collect_candidates_from_scope(
+    scope: Optional[Tag], scope_errors: List[str]
+) -> Tuple[List[dict], List[str]]:
     serialized: List[dict] = []
     errors: List[str] = list(scope_errors)
 
@@ -312,4 +587,115 @@ def collect_dom_candidates(html: str) -> Tuple[List[dict], List[str]]:
     return serialized, errors
 
 
+def _normalize_ws(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _own_text(element: Tag) -> str:
+    return _normalize_ws(
+        " ".join(str(c) for c in element.children if isinstance(c, NavigableString))
+    )
+
+
+def _collect_citations_from_scope(scope: Optional[Tag]) -> List[DisplayedCitation]:
+    """
+    Citations as displayed within the answer scope (no completion).
+
+    - links (<a href>) anywhere in the scope, except in-page fragments
+    - elements outside the markdown bodies whose own text shows a file name
+      (source lists rendered under the answer)
+    Noise subtrees (buttons, svg, ...) are skipped. Order follows the DOM;
+    duplicates are dropped.
+    """
+    if scope is None:
+        return []
+
+    citations: List[DisplayedCitation] = []
+    seen = set()
+
+    def add(citation: DisplayedCitation) -> None:
+        key = (citation.text, citation.href, citation.file_name)
+        if key not in seen:
+            seen.add(key)
+            citations.append(citation)
+
+    # Single pre-order walk: (element, inside a markdown body).
+    stack: List[Tuple[Tag, bool]] = [(scope, False)]
+    while stack:
+        element, in_markdown = stack.pop()
+        if element is not scope and _is_noise(element):
+            continue
+
+        title = element.get("title")
+        title = title if isinstance(title, str) else None
+
+        if element.name == "a":
+            href = element.get("href")
+            href = href.strip() if isinstance(href, str) else ""
+            if href and not href.startswith("#") and not href.lower().startswith(
+                "javascript:"
+            ):
+                text = _normalize_ws(element.get_text(" "))
+                match = CITATION_FILE_PATTERN.search(text) or CITATION_FILE_PATTERN.search(
+                    href
+                )
+                add(
+                    DisplayedCitation(
+                        text=text,
+                        href=href,
+                        title=title,
+                        file_name=match.group(0) if match else None,
+                    )
+                )
+            continue
+
+        in_markdown = in_markdown or "markdown" in (element.get("class") or [])
+        if not in_markdown:
+            match = CITATION_FILE_PATTERN.search(_own_text(element))
+            if match is not None:
+                add(
+                    DisplayedCitation(
+                        text=_normalize_ws(element.get_text(" ")),
+                        href=None,
+                        title=title,
+                        file_name=match.group(0),
+                    )
+                )
+
+        stack.extend(
+            (child, in_markdown)
+            for child in reversed(element.contents)
+            if isinstance(child, Tag)
+        )
+
+    return citations
+
+
+def extract_answer_dom(
+    html: str,
+    question_text: str,
+    *,
+    parser: Optional[str] = None,
+    tail_only: bool = False,
+) -> ExtractionResult:
+    return ParsedSnapshot(html, parser, tail_only=tail_only).extract(question_text)
+
+
+def collect_dom_candidates(
+    html: str, *, parser: Optional[str] = None, tail_only: bool = False
+) -> Tuple[List[dict], List[str]]:
+    """
+    Enumerate plausible answer containers for forensics (non-evaluative).
+    (Unchanged legacy behavior)
+    """
+    return ParsedSnapshot(html, parser, tail_only=tail_only).candidates()
+
+
+def extract_citations(
+    html: str, *, parser: Optional[str] = None, tail_only: bool = False
+) -> List[DisplayedCitation]:
+    """Links / source titles / file names displayed with the last answer."""
+    return ParsedSnapshot(html, parser, tail_only=tail_only).citations()
+
+
 # ====== End of File ======
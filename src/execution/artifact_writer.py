@@ -0,0 +1,174 @@
+"""
+Background artifact writer (takes filesystem I/O off the browser thread).
+
+Responsibilities:
+- accept serialized artifacts (text / bytes) and write them on worker threads
+- bound the number of pending writes (backpressure: the caller waits)
+- keep write order per path (one shard per path, FIFO)
+- flush barrier (run end / abort) and error collection
+
+Non-goals:
+- deciding which artifacts exist (see run_single_question capture levels)
+- raising on write failure (forensics must never block execution)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 32
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+class ArtifactWriter:
+    """
+    Bounded background writer.
+
+    write_text / write_bytes return immediately unless max_pending writes
+    are already queued, in which case they wait for a free slot (time spent
+    waiting is recorded in stats). Failures are recorded in errors, never
+    raised. After close(), writes are performed synchronously.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be >= 1")
+        # Single-thread shards: the same path always lands on the same
+        # thread, so rewrites of a file keep their order.
+        self._shards = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"artifact-writer-{i}")
+            for i in range(workers)
+        ]
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self.errors: List[str] = []
+        self._failures: Dict[Path, str] = {}
+        self.stats: Dict[str, Union[int, float]] = {
+            "submitted": 0,
+            "written": 0,
+            "failed": 0,
+            "bytes": 0,
+            "backpressure_waits": 0,
+            "backpressure_sec": 0.0,
+            "write_sec": 0.0,
+        }
+
+    # ------------------------------------------------------------
+    # submission
+    # ------------------------------------------------------------
+
+    def write_text(self, path: Path, content: str) -> None:
+        self.write_bytes(path, (content or "").encode("utf-8"))
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        path = Path(path)
+        if self._closed:
+            self._write(path, data, release=False)
+            return
+
+        if not self._slots.acquire(blocking=False):
+            started = time.perf_counter()
+            self._slots.acquire()
+            with self._idle:
+                self.stats["backpressure_waits"] += 1
+                self.stats["backpressure_sec"] += time.perf_counter() - started
+
+        with self._idle:
+            self._pending += 1
+            self.stats["submitted"] += 1
+        shard = self._shards[zlib.crc32(str(path).encode("utf-8")) % len(self._shards)]
+        try:
+            shard.submit(self._write, path, data, True)
+        except RuntimeError:
+            # Executor already shut down (interpreter exit): write inline.
+            self._write(path, data, release=True)
+
+    def _write(self, path: Path, data: bytes, release: bool) -> None:
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            _write_file(path, data)
+        except Exception as exc:
+            error = f"{path}: {type(exc).__name__}: {exc}"
+        elapsed = time.perf_counter() - started
+
+        with self._idle:
+            self.stats["write_sec"] += elapsed
+            if error is None:
+                self.stats["written"] += 1
+                self.stats["bytes"] += len(data)
+            else:
+                self.stats["failed"] += 1
+                self.errors.append(error)
+                self._failures[path] = error
+            if release:
+                self._pending -= 1
+                self._idle.notify_all()
+        if release:
+            self._slots.release()
+
+    # ------------------------------------------------------------
+    # barrier / lifecycle
+    # ------------------------------------------------------------
+
+    @property
+    def pending(self) -> int:
+        with self._idle:
+            return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted write finished; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def failures_under(self, directory: Path) -> Dict[Path, str]:
+        """Failed writes below directory (path -> error), e.g. one question."""
+        directory = Path(directory)
+        with self._idle:
+            return {
+                path: error
+                for path, error in self._failures.items()
+                if directory == path or directory in path.parents
+            }
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush, then stop the worker threads. Idempotent."""
+        drained = self.flush(timeout)
+        if not self._closed:
+            self._closed = True
+            for shard in self._shards:
+                shard.shutdown(wait=drained)
+        return drained
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def to_observation(self) -> dict:
+        with self._idle:
+            stats = dict(self.stats)
+            errors = list(self.errors)
+            pending = self._pending
+        for key in ("backpressure_sec", "write_sec"):
+            stats[key] = round(stats[key], 4)
+        return {**stats, "pending": pending, "errors": errors}
@@ -0,0 +1,77 @@
+"""
+In-browser capture of the answer scope (last .message-received only).
+
+Responsibilities:
+- locate the last .message-received in the live page (page.evaluate)
+- return its outerHTML plus markdown candidate metadata as JSON
+- keep the transferred payload to the answer subtree instead of the
+  whole SPA DOM (page.content())
+
+Non-goals:
+- selection / cleaning (answer_dom_extractor runs on the fragment;
+  the fragment contains the scope, so selection is unchanged)
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from playwright.sync_api import Page
+
+
+_SCOPE_CAPTURE_JS = r"""
+() => {
+  const received = document.querySelectorAll('.message-received');
+  if (!received.length) {
+    return { found: false, message_received_count: 0, html: '', markdown: [] };
+  }
+  const scope = received[received.length - 1];
+  const markdown = Array.from(
+    scope.querySelectorAll('div.markdown[id^="markdown-"]')
+  ).map((el) => ({ id: el.id, text_len: (el.textContent || '').length }));
+  return {
+    found: true,
+    message_received_count: received.length,
+    html: scope.outerHTML,
+    markdown,
+  };
+}
+"""
+
+
+@dataclass(frozen=True)
+class AnswerScopeCapture:
+    found: bool
+    html: str
+    message_received_count: int
+    markdown: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+
+    def to_observation(self) -> Dict[str, Any]:
+        return {
+            "found": self.found,
+            "message_received_count": self.message_received_count,
+            "markdown_ids": [m.get("id") for m in self.markdown],
+            "html_len": len(self.html),
+            "elapsed_sec": self.elapsed_sec,
+        }
+
+
+def capture_answer_scope(page: Page) -> AnswerScopeCapture:
+    """Serialize only the last .message-received subtree in the browser."""
+    started = time.perf_counter()
+    payload = page.evaluate(_SCOPE_CAPTURE_JS) or {}
+    elapsed = round(time.perf_counter() - started, 4)
+
+    markdown = payload.get("markdown")
+    return AnswerScopeCapture(
+        found=bool(payload.get("found")),
+        html=str(payload.get("html") or ""),
+        message_received_count=int(payload.get("message_received_count") or 0),
+        markdown=[m for m in markdown if isinstance(m, dict)]
+        if isinstance(markdown, list)
+        else [],
+        elapsed_sec=elapsed,
+    )
@@ -0,0 +1,253 @@
+"""
+Content-hash memoization of DOM extraction results.
+
+Responsibilities:
+- key extraction by sha256(html) + EXTRACTOR_VERSION + parser backend +
+  parse mode (tail-only / full)
+- keep results in an in-memory LRU bounded by payload size (bytes)
+- optionally persist results as JSON under cache_dir (second tier),
+  bounded by max_disk_bytes (least recently used files are pruned)
+
+Non-goals:
+- cache invalidation beyond EXTRACTOR_VERSION (bump it when output changes)
+- caching anything that depends on the live page
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.execution.answer_dom_extractor import (
+    EXTRACTOR_VERSION,
+    DomExtractionObservation,
+    ExtractionResult,
+    ParsedSnapshot,
+    resolve_parser,
+)
+
+
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+
+# Pruning goes below the bound so that it does not run on every store.
+_DISK_LOW_WATERMARK = 0.9
+
+
+@dataclass(frozen=True)
+class CachedExtraction:
+    result: ExtractionResult
+    candidates: List[dict]
+    candidate_errors: List[str]
+    parse_mode: str
+    cache_hit: Optional[str]  # "memory" | "disk" | None (computed)
+
+
+def extraction_cache_key(
+    html: str, parser: Optional[str] = None, *, tail_only: bool = True
+) -> str:
+    digest = hashlib.sha256((html or "").encode("utf-8")).hexdigest()
+    mode = "tail" if tail_only else "full"
+    return f"{EXTRACTOR_VERSION}-{resolve_parser(parser)}-{mode}-{digest}"
+
+
+def _to_payload(
+    result: ExtractionResult,
+    candidates: Tuple[List[dict], List[str]],
+    parse_mode: str,
+) -> str:
+    return json.dumps(
+        {
+            "extractor_version": EXTRACTOR_VERSION,
+            "parse_mode": parse_mode,
+            "result": asdict(result),
+            "candidates": candidates[0],
+            "candidate_errors": candidates[1],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _from_payload(payload: str, cache_hit: str) -> CachedExtraction:
+    data = json.loads(payload)
+    result_data = dict(data["result"])
+    result_data["observation"] = DomExtractionObservation(**result_data["observation"])
+    return CachedExtraction(
+        result=ExtractionResult(**result_data),
+        candidates=list(data["candidates"]),
+        candidate_errors=list(data["candidate_errors"]),
+        parse_mode=data["parse_mode"],
+        cache_hit=cache_hit,
+    )
+
+
+class ExtractionCache:
+    """
+    Two-tier memo: size-bounded LRU (serialized payloads) + optional
+    on-disk store (<cache_dir>/<key[-2:]>/<key>.json).
+
+    The disk tier is bounded by max_disk_bytes (None: unbounded). Hits
+    refresh a file's mtime; when the store grows past the bound, the least
+    recently used files are removed. Usage is re-measured from the
+    directory when pruning, so instances sharing cache_dir (reextract_run
+    workers) keep it bounded together (approximately).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        *,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: Optional[int] = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self.memory_bytes = 0
+        # Estimated bytes under cache_dir (measured on the first store).
+        self._disk_bytes: Optional[int] = None
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+
+    # ------------------------------------------------------------
+    # tiers
+    # ------------------------------------------------------------
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[-2:] / f"{key}.json"
+
+    def _remember(self, key: str, payload: str) -> None:
+        size = len(payload.encode("utf-8"))
+        if size > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous.encode("utf-8"))
+        self._memory[key] = payload
+        self.memory_bytes += size
+        while self.memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted.encode("utf-8"))
+            self.stats["evictions"] += 1
+
+    def _lookup(self, key: str) -> Optional[CachedExtraction]:
+        payload = self._memory.get(key)
+        if payload is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return _from_payload(payload, "memory")
+
+        path = self._disk_path(key)
+        if path is not None and path.is_file():
+            try:
+                payload = path.read_text(encoding="utf-8")
+                cached = _from_payload(payload, "disk")
+            except Exception:
+                # A corrupt entry is treated as a miss and rewritten.
+                self.stats["disk_errors"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            try:
+                os.utime(path)  # LRU order for pruning
+            except OSError:
+                pass
+            self._remember(key, payload)
+            return cached
+        return None
+
+    def _store(self, key: str, payload: str) -> None:
+        self._remember(key, payload)
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            tmp.replace(path)
+        except Exception:
+            # The disk tier is best-effort; the in-memory result stays valid.
+            self.stats["disk_errors"] += 1
+            return
+
+        if self.max_disk_bytes is None:
+            return
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        else:
+            self._disk_bytes += len(payload.encode("utf-8"))
+        if self._disk_bytes > self.max_disk_bytes:
+            self._prune_disk()
+
+    def _disk_entries(self) -> List[Tuple[float, int, Path]]:
+        entries: List[Tuple[float, int, Path]] = []
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return entries
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # removed by another instance
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _prune_disk(self) -> None:
+        """Remove least recently used files down to the low watermark."""
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * _DISK_LOW_WATERMARK)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.stats["disk_evictions"] += 1
+        self._disk_bytes = total
+
+    # ------------------------------------------------------------
+    # public API
+    # ------------------------------------------------------------
+
+    def extract(
+        self, html: str, *, parser: Optional[str] = None, tail_only: bool = True
+    ) -> CachedExtraction:
+        """Extraction result + candidates for html (computed once per key)."""
+        key = extraction_cache_key(html, parser, tail_only=tail_only)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        self.stats["misses"] += 1
+        snapshot = ParsedSnapshot(html, parser, tail_only=tail_only)
+        result = snapshot.extract("")
+        candidates = snapshot.candidates()
+        self._store(key, _to_payload(result, candidates, snapshot.parse_mode))
+        return CachedExtraction(
+            result=result,
+            candidates=candidates[0],
+            candidate_errors=candidates[1],
+            parse_mode=snapshot.parse_mode,
+            cache_hit=None,
+        )
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self.memory_bytes = 0
+
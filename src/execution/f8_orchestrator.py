@@ -13,24 +13,32 @@ Non-goals:
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
 
 from playwright.sync_api import Error as PlaywrightError
 
 from src.answer_probe import (
+    DEFAULT_COMPLETION_STRATEGY,
     AnswerNotAvailableError,
     AnswerTimeoutError,
     ProbeExecutionError,
 )
+from src.execution.artifact_writer import ArtifactWriter
+from src.execution.latency_timeline import write_latency_report
 from src.execution.run_single_question import (
+    DEFAULT_CAPTURE_LEVEL,
     ChatPageProtocol,
     RawCapture,
     run_single_question,
 )
+from src.execution.screenshot_capture import ScreenshotOptions, summarize_screenshots
+from src.execution.timeout_policy import LatencyTimeoutPolicy
+from src.execution.ui_readiness import DEFAULT_UI_READY_TIMEOUT_MS
 
 
 class ResultStatus(str, Enum):
@@ -64,6 +72,9 @@ class RunSummary:
     aborted: bool
     fatal_error: Optional[str]
     executed_at: datetime
+    latency_report_path: Optional[Path] = None
+    artifact_writer: Optional[dict] = None  # ArtifactWriter.to_observation()
+    screenshot_report_path: Optional[Path] = None
 
 
 def _ensure_dir(path: Path) -> None:
@@ -251,6 +262,11 @@ def _write_answer_markdown(
         ]
     )
 
+    # Deferred (background) artifact writes of this question that failed.
+    write_errors = (execution_context or {}).get("artifact_write_errors")
+    if write_errors:
+        lines.append(f"- artifact_write_errors: {write_errors}")
+
     output_path.write_text("\n".join(lines), encoding="utf-8")
     return output_path
 
@@ -272,157 +288,316 @@ def run_f8_collection(
     citations_fetcher: Optional[Callable[[ChatPageProtocol], Iterable[str]]] = None,
     observation_notes: Optional[Sequence[str]] = None,
     timeout_sec: int = 60,
+    timeout_policy: Optional[LatencyTimeoutPolicy] = None,
+    completion_strategy: str = DEFAULT_COMPLETION_STRATEGY,
+    completion_options: Optional[Mapping[str, Any]] = None,
+    html_parser: Optional[str] = None,
+    dom_capture: str = "page",
+    capture_level: Optional[str] = None,
+    artifact_workers: int = 0,
+    ui_ready_timeout_ms: Optional[int] = None,
+    screenshot_options: Optional[Union[ScreenshotOptions, Mapping[str, Any]]] = None,
 ) -> RunSummary:
     """
     Canonical orchestrator for F8 (DOM-based capture).
 
     Control is continue-on-error. Abort only when browser/page is unusable.
+
+    timeout_sec is the probe upper bound for every question. When
+    timeout_policy is given, the bound is derived per question from
+    previous runs' latency (falling back to timeout_sec without history).
+
+    completion_strategy selects how answer completion is detected
+    ("graphql": network evidence / "dom_stability": answer DOM quiet
+    window); completion_options are passed to that probe as-is.
+
+    html_parser selects the BeautifulSoup backend for DOM extraction
+    (None: html.parser, "auto": lxml when installed; see
+    answer_dom_extractor.resolve_parser).
+
+    dom_capture="scope" transfers only the last .message-received subtree
+    from the browser instead of the whole page; dom_capture="live" streams
+    it while the answer grows (see run_single_question).
+
+    capture_level ("minimal" / "standard" / "forensic", default forensic;
+    env.yaml options.capture_level) selects the per-question artifacts;
+    failed questions escalate to forensic (see run_single_question).
+
+    artifact_workers > 0 writes per-question artifacts on that many
+    background threads (bounded queue). Each question's writes are flushed
+    before its answer.md (failures are reported there and a failed raw
+    capture is reported as unavailable); the writer is closed when the
+    run ends, also on an exception. 0 (default) writes synchronously.
+    answer.md is always written synchronously.
+
+    ui_ready_timeout_ms is the ceiling of the pre-submit UI readiness check
+    (default 5000; env.yaml options.ui_ready_timeout_ms; 0 disables it,
+    see ui_readiness).
+
+    screenshot_options (ScreenshotOptions, or the env.yaml options.screenshot
+    mapping) selects the after_answer_ready image; capture time and bytes
+    per mode are written to screenshot_report.json.
+
+    Without citations_fetcher, citations are the ones displayed with the
+    answer as found by the DOM extraction pass (no extra page access).
     """
     executed_at = datetime.now(timezone.utc)
     run_root = Path(output_root)
 
     aborted = False
     fatal_error: Optional[str] = None
+    latency_entries: List[dict] = []
+    screenshot_entries: List[dict] = []
+    screenshot = (
+        screenshot_options
+        if isinstance(screenshot_options, ScreenshotOptions) or screenshot_options is None
+        else ScreenshotOptions.from_mapping(screenshot_options)
+    )
+    artifact_writer = (
+        ArtifactWriter(workers=artifact_workers) if artifact_workers > 0 else None
+    )
 
-    for ordinance in ordinances:
-        for question in questions:
-            fs_question_id = _fs_safe_segment(question.question_id)
-            question_dir = (
-                run_root / "answer" / ordinance.ordinance_id / fs_question_id
-            )
-
-            status = ResultStatus.EXEC_ERROR
-            reason: Optional[str] = None
-            raw_capture: Optional[RawCapture] = None
-            raw_capture_attempted = False
-
-            submit_id = "N/A"
-            chat_id = "N/A"
-            extracted_answer_text = ""
-            extracted_status = "INVALID"
-            execution_context: Optional[dict] = None
-
-            try:
-                # SingleQuestion execution (submit + probe + DOM extraction)
-                # No evaluation here; exceptions are mapped to ResultStatus.
-                try:
-                    result = run_single_question(
-                        chat_page=chat_page,
-                        question_text=question.question_text,
-                        question_id=question.question_id,
-                        ordinance_id=ordinance.ordinance_id,
-                        output_dir=question_dir,
+    try:
+        for ordinance in ordinances:
+            for question in questions:
+                fs_question_id = _fs_safe_segment(question.question_id)
+                question_dir = (
+                    run_root / "answer" / ordinance.ordinance_id / fs_question_id
+                )
+
+                status = ResultStatus.EXEC_ERROR
+                reason: Optional[str] = None
+                raw_capture: Optional[RawCapture] = None
+                raw_capture_attempted = False
+
+                submit_id = "N/A"
+                chat_id = "N/A"
+                extracted_answer_text = ""
+                extracted_status = "INVALID"
+                execution_context: Optional[dict] = None
+                extracted_citations: Sequence[str] = []
+
+                question_timeout_sec = (
+                    timeout_policy.timeout_for(
                         profile=execution_profile.profile_name,
-                        execution_context=None,
-                        timeout_sec=timeout_sec,
+                        question_id=question.question_id,
+                        default_timeout_sec=timeout_sec,
                     )
-                    submit_id = result.submit_id
-                    chat_id = result.chat_id
-                    extracted_answer_text = result.answer_text
-                    extracted_status = result.extracted_status
-                    execution_context = result.execution_context or {}
-                    raw_capture = result.raw_capture
-                    raw_capture_attempted = result.raw_capture_attempted
-                    status = ResultStatus.SUCCESS
-                except AnswerTimeoutError as exc:
-                    status = ResultStatus.TIMEOUT
-                    reason = str(exc)
-                except AnswerNotAvailableError as exc:
-                    status = ResultStatus.NO_ANSWER
-                    reason = str(exc)
-                except ProbeExecutionError as exc:
-                    status = ResultStatus.EXEC_ERROR
-                    reason = str(exc)
-                except PlaywrightError as exc:
-                    status = ResultStatus.UI_ERROR
-                    reason = str(exc)
-                    if _is_fatal_state(chat_page):
-                        aborted = True
-                        fatal_error = str(exc)
+                    if timeout_policy is not None
+                    else timeout_sec
+                )
+
+                try:
+                    # SingleQuestion execution (submit + probe + DOM extraction)
+                    # No evaluation here; exceptions are mapped to ResultStatus.
+                    try:
+                        result = run_single_question(
+                            chat_page=chat_page,
+                            question_text=question.question_text,
+                            question_id=question.question_id,
+                            ordinance_id=ordinance.ordinance_id,
+                            output_dir=question_dir,
+                            profile=execution_profile.profile_name,
+                            execution_context=None,
+                            timeout_sec=question_timeout_sec,
+                            completion_strategy=completion_strategy,
+                            completion_options=completion_options,
+                            html_parser=html_parser,
+                            dom_capture=dom_capture,
+                            capture_level=capture_level or DEFAULT_CAPTURE_LEVEL,
+                            artifact_writer=artifact_writer,
+                            ui_ready_timeout_ms=(
+                                ui_ready_timeout_ms
+                                if ui_ready_timeout_ms is not None
+                                else DEFAULT_UI_READY_TIMEOUT_MS
+                            ),
+                            screenshot=screenshot,
+                        )
+                        submit_id = result.submit_id
+                        chat_id = result.chat_id
+                        extracted_answer_text = result.answer_text
+                        extracted_status = result.extracted_status
+                        execution_context = result.execution_context or {}
+                        raw_capture = result.raw_capture
+                        raw_capture_attempted = result.raw_capture_attempted
+                        extracted_citations = result.citations or []
+                        screenshot_entries.append(
+                            (result.execution_context or {}).get("screenshot") or {}
+                        )
+                        if result.timeline is not None:
+                            latency_entries.append(
+                                {
+                                    "ordinance_id": ordinance.ordinance_id,
+                                    "question_id": question.question_id,
+                                    "profile": execution_profile.profile_name,
+                                    "timeout_sec": question_timeout_sec,
+                                    "timeline": result.timeline,
+                                }
+                            )
+                        status = ResultStatus.SUCCESS
+                    except AnswerTimeoutError as exc:
+                        status = ResultStatus.TIMEOUT
+                        reason = str(exc)
+                    except AnswerNotAvailableError as exc:
+                        status = ResultStatus.NO_ANSWER
+                        reason = str(exc)
+                    except ProbeExecutionError as exc:
+                        status = ResultStatus.EXEC_ERROR
+                        reason = str(exc)
+                    except PlaywrightError as exc:
+                        status = ResultStatus.UI_ERROR
+                        reason = str(exc)
+                        if _is_fatal_state(chat_page):
+                            aborted = True
+                            fatal_error = str(exc)
+                    except Exception as exc:
+                        status = ResultStatus.EXEC_ERROR
+                        reason = str(exc)
+
                 except Exception as exc:
+                    # Defensive catch-all to keep continue-on-error contract.
                     status = ResultStatus.EXEC_ERROR
-                    reason = str(exc)
+                    reason = reason or str(exc)
+
+                citations: Sequence[str] = extracted_citations
+                if citations_fetcher is not None:
+                    try:
+                        citations = list(citations_fetcher(chat_page))
+                    except Exception:
+                        citations = []
+
+                # Per-question barrier: deferred writes of this question are on
+                # disk (or have failed) before answer.md reports on them.
+                write_failures: Dict[Path, str] = {}
+                if artifact_writer is not None:
+                    artifact_writer.flush()
+                    write_failures = artifact_writer.failures_under(question_dir)
+                    if raw_capture is not None and write_failures.keys() & {
+                        raw_capture.html_path,
+                        raw_capture.text_path,
+                        raw_capture.meta_path,
+                    }:
+                        raw_capture = None
+
+                if raw_capture_attempted and raw_capture is None and reason is None:
+                    reason = "raw capture unavailable"
 
-            except Exception as exc:
-                # Defensive catch-all to keep continue-on-error contract.
-                status = ResultStatus.EXEC_ERROR
-                reason = reason or str(exc)
-
-            citations: Sequence[str] = []
-            if citations_fetcher is not None:
                 try:
-                    citations = list(citations_fetcher(chat_page))
-                except Exception:
-                    citations = []
-
-            if raw_capture_attempted and raw_capture is None and reason is None:
-                reason = "raw capture unavailable"
-
-            try:
-                if not isinstance(execution_context, Mapping):
-                    execution_context = {}
-                else:
-                    execution_context = dict(execution_context)
-
-                dom_extraction = execution_context.get("dom_extraction")
-                if dom_extraction is None:
-                    execution_context["dom_extraction"] = {
-                        "selected": False,
-                        "reason": "dom extraction unavailable",
-                        "text_len": len(extracted_answer_text)
-                        if extracted_answer_text
-                        else 0,
-                        "errors": ["dom extraction unavailable"],
-                        "extracted_status": extracted_status,
-                        "candidates": [],
-                        "selected_n": None,
-                        "parity": None,
-                    }
-
-                # --- TEMP DEBUG: before writing answer.md ---
-                print(
-                    "[DEBUG] about to write answer.md",
-                    question.question_id,
-                    "execution_context=",
-                    execution_context,
-                )
-                # --- /TEMP DEBUG ---
-
-                _write_answer_markdown(
-                    question_dir=question_dir,
-                    question=question,
-                    ordinance=ordinance,
-                    execution_profile=execution_profile,
-                    run_id=run_id,
-                    executed_at=executed_at,
-                    qommons_config=qommons_config,
-                    knowledge_scope=knowledge_scope,
-                    knowledge_files=knowledge_files,
-                    ordinance_set=ordinance_set,
-                    question_pool=question_pool,
-                    execution=execution,
-                    extracted_answer_text=extracted_answer_text,
-                    execution_context=execution_context,
-                    raw_capture=raw_capture,
-                    raw_capture_attempted=raw_capture_attempted,
-                    result_status=status,
-                    result_reason=reason,
-                    aborted_run=aborted,
-                    citations=citations,
-                    observation_notes=observation_notes,
-                    submit_id=submit_id,
-                    chat_id=chat_id,
-                    extracted_status=extracted_status,
-                )
-            except Exception as exc:
-                print("[DEBUG] answer.md write failed:", exc)
-                status = ResultStatus.EXEC_ERROR
-                reason = reason or f"answer write failed: {exc}"
-                # continue-on-error (no raise)
+                    if not isinstance(execution_context, Mapping):
+                        execution_context = {}
+                    else:
+                        execution_context = dict(execution_context)
+
+                    if write_failures:
+                        execution_context["artifact_write_errors"] = list(
+                            write_failures.values()
+                        )
+
+                    dom_extraction = execution_context.get("dom_extraction")
+                    if dom_extraction is None:
+                        execution_context["dom_extraction"] = {
+                            "selected": False,
+                            "reason": "dom extraction unavailable",
+                            "text_len": len(extracted_answer_text)
+                            if extracted_answer_text
+                            else 0,
+                            "errors": ["dom extraction unavailable"],
+                            "extracted_status": extracted_status,
+                            "candidates": [],
+                            "selected_n": None,
+                            "parity": None,
+                        }
+
+                    # --- TEMP DEBUG: before writing answer.md ---
+                    print(
+                        "[DEBUG] about to write answer.md",
+                        question.question_id,
+                        "execution_context=",
+                        execution_context,
+                    )
+                    # --- /TEMP DEBUG ---
+
+                    _write_answer_markdown(
+                        question_dir=question_dir,
+                        question=question,
+                        ordinance=ordinance,
+                        execution_profile=execution_profile,
+                        run_id=run_id,
+                        executed_at=executed_at,
+                        qommons_config=qommons_config,
+                        knowledge_scope=knowledge_scope,
+                        knowledge_files=knowledge_files,
+                        ordinance_set=ordinance_set,
+                        question_pool=question_pool,
+                        execution=execution,
+                        extracted_answer_text=extracted_answer_text,
+                        execution_context=execution_context,
+                        raw_capture=raw_capture,
+                        raw_capture_attempted=raw_capture_attempted,
+                        result_status=status,
+                        result_reason=reason,
+                        aborted_run=aborted,
+                        citations=citations,
+                        observation_notes=observation_notes,
+                        submit_id=submit_id,
+                        chat_id=chat_id,
+                        extracted_status=extracted_status,
+                    )
+                except Exception as exc:
+                    print("[DEBUG] answer.md write failed:", exc)
+                    status = ResultStatus.EXEC_ERROR
+                    reason = reason or f"answer write failed: {exc}"
+                    # continue-on-error (no raise)
 
+                if aborted:
+                    break
             if aborted:
                 break
-        if aborted:
-            break
+    finally:
+        # --- Flush barrier: every artifact is on disk before the run returns ---
+        if artifact_writer is not None:
+            artifact_writer.close()
 
-    return RunSummary(aborted=aborted, fatal_error=fatal_error, executed_at=executed_at)
+    artifact_observation: Optional[dict] = None
+    if artifact_writer is not None:
+        artifact_observation = artifact_writer.to_observation()
+
+    # --- Run-level latency report (observation only, best-effort) ---
+    latency_report_path: Optional[Path] = None
+    try:
+        latency_report_path = write_latency_report(
+            run_root / "latency_report.json", latency_entries
+        )
+    except Exception as exc:
+        print("[DEBUG] latency report write failed:", exc)
+
+    # --- Run-level screenshot report (per mode; observation only) ---
+    screenshot_report_path: Optional[Path] = None
+    try:
+        screenshot_report_path = run_root / "screenshot_report.json"
+        _ensure_dir(run_root)
+        screenshot_report_path.write_text(
+            json.dumps(
+                {
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "question_count": len(screenshot_entries),
+                    "skipped": sum(1 for e in screenshot_entries if e.get("skipped")),
+                    "modes": summarize_screenshots(screenshot_entries),
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    except Exception as exc:
+        screenshot_report_path = None
+        print("[DEBUG] screenshot report write failed:", exc)
+
+    return RunSummary(
+        aborted=aborted,
+        fatal_error=fatal_error,
+        executed_at=executed_at,
+        latency_report_path=latency_report_path,
+        artifact_writer=artifact_observation,
+        screenshot_report_path=screenshot_report_path,
+    )
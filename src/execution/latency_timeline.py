@@ -0,0 +1,170 @@
+"""
+Per-question latency timeline and run-level latency report.
+
+Responsibilities:
+- record monotonic-clock marks for one question (submit → probe → DOM → persist)
+- derive stage durations from the marks (observation only)
+- aggregate stage durations over a run into p50 / p95 / p99
+
+Non-goals:
+- evaluation or thresholds (the report states facts only)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+
+# Stage name -> (start mark, end mark). Missing marks leave the stage as None.
+STAGES: Tuple[Tuple[str, str, str], ...] = (
+    ("submit", "submit_start", "submit_ack"),
+    ("submit_to_rest_post", "submit_start", "first_rest_post"),
+    ("time_to_first_token", "submit_start", "first_token"),
+    ("answer_streaming", "first_token", "last_token"),
+    ("service_to_create_data", "submit_start", "first_graphql"),
+    ("create_data_to_last_get", "first_graphql", "last_rest_get"),
+    ("probe_wait", "probe_start", "probe_end"),
+    ("probe_evidence", "probe_start", "probe_evidence_end"),
+    ("probe_tail", "probe_evidence_end", "probe_end"),
+    ("snapshot", "probe_end", "snapshot_done"),
+    ("extraction", "snapshot_done", "extraction_done"),
+    ("persist", "extraction_done", "persist_done"),
+    ("total", "submit_start", "persist_done"),
+)
+
+PERCENTILES: Tuple[int, ...] = (50, 95, 99)
+
+
+@dataclass
+class LatencyTimeline:
+    """Monotonic-clock marks for one question (seconds, process-local)."""
+
+    marks: Dict[str, float] = field(default_factory=dict)
+    # Probe summary["completion_reason"] (or "probe_exception: <type>").
+    completion_reason: Optional[str] = None
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        self.marks[name] = time.monotonic() if at is None else at
+
+    def merge_probe_summary(self, summary: Mapping[str, Any]) -> None:
+        """Join probe-side monotonic marks (summary["monotonic"]) into this timeline."""
+        reason = summary.get("completion_reason")
+        if isinstance(reason, str):
+            self.completion_reason = reason
+
+        mono = summary.get("monotonic")
+        if not isinstance(mono, Mapping):
+            return
+
+        mapping = {
+            "started": "probe_start",
+            "first_rest_post": "first_rest_post",
+            "first_graphql": "first_graphql",
+            "last_rest_get": "last_rest_get",
+            "ws_completed": "ws_completed",
+            "dom_stable": "dom_stable",
+            "finished": "probe_end",
+        }
+        for src_key, mark_name in mapping.items():
+            value = mono.get(src_key)
+            if isinstance(value, (int, float)):
+                self.marks[mark_name] = float(value)
+
+        evidence = [
+            self.marks[k]
+            for k in ("first_graphql", "last_rest_get", "ws_completed", "dom_stable")
+            if k in self.marks
+        ]
+        if evidence:
+            self.marks["probe_evidence_end"] = max(evidence)
+
+    def offsets(self) -> Dict[str, float]:
+        """Marks relative to submit_start (or the earliest mark)."""
+        if not self.marks:
+            return {}
+        origin = self.marks.get("submit_start", min(self.marks.values()))
+        return {
+            name: round(value - origin, 4)
+            for name, value in sorted(self.marks.items(), key=lambda kv: kv[1])
+        }
+
+    def stages(self) -> Dict[str, Optional[float]]:
+        result: Dict[str, Optional[float]] = {}
+        for stage, start, end in STAGES:
+            if start in self.marks and end in self.marks:
+                result[stage] = round(self.marks[end] - self.marks[start], 4)
+            else:
+                result[stage] = None
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "clock": "monotonic",
+            "completion_reason": self.completion_reason,
+            "offsets_sec": self.offsets(),
+            "stages_sec": self.stages(),
+        }
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile over pre-sorted values."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    weight = rank - low
+    return sorted_values[low] * (1 - weight) + sorted_values[high] * weight
+
+
+def build_latency_report(
+    entries: Iterable[Mapping[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Aggregate per-question timelines into a run-level report.
+
+    Each entry is a mapping with at least "timeline" (LatencyTimeline.to_dict())
+    and optional identifying keys (question_id, ordinance_id, profile, ...).
+    """
+    questions: List[Dict[str, Any]] = []
+    per_stage: Dict[str, List[float]] = {stage: [] for stage, _, _ in STAGES}
+
+    for entry in entries:
+        timeline = entry.get("timeline") or {}
+        stages = timeline.get("stages_sec") or {}
+        for stage in per_stage:
+            value = stages.get(stage)
+            if isinstance(value, (int, float)):
+                per_stage[stage].append(float(value))
+        questions.append(dict(entry))
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for stage, values in per_stage.items():
+        ordered = sorted(values)
+        stats: Dict[str, Any] = {"count": len(ordered)}
+        for pct in PERCENTILES:
+            stats[f"p{pct}"] = round(percentile(ordered, pct), 4) if ordered else None
+        stats["max"] = round(ordered[-1], 4) if ordered else None
+        summary[stage] = stats
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "question_count": len(questions),
+        "stages": summary,
+        "questions": questions,
+    }
+
+
+def write_latency_report(path: Path, entries: Iterable[Mapping[str, Any]]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = build_latency_report(entries)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
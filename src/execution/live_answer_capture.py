@@ -0,0 +1,219 @@
+"""
+Live incremental answer capture (MutationObserver + expose_binding).
+
+Responsibilities:
+- inject an observer before submit that streams the growing answer
+  container (last .message-received after the new .message-sent) back
+  to Python through page.expose_binding
+- keep the latest streamed answer HTML and per-update growth
+  (time-to-first-token, text growth rate)
+
+Non-goals:
+- completion detection (the probe still decides completion)
+- selection / cleaning (answer_dom_extractor runs on the streamed HTML)
+
+NOTE:
+- "tokens" are observed as text characters in div.markdown; the rate is
+  characters per second, not model tokens.
+- Updates are throttled in the page (throttle_ms); flush() forces a final
+  update and returns only after Python has received it.
+"""
+
+from __future__ import annotations
+
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Page
+
+
+BINDING_NAME = "__f8LiveAnswer"
+DEFAULT_THROTTLE_MS = 150
+
+
+_INSTALL_JS = r"""
+(bindingName) => {
+  if (window.__f8Live) return true;
+
+  const state = { armed: false, seq: 0, timer: null, lastHtml: null, throttleMs: 150, baselineSent: 0 };
+
+  const activeAnswer = () => {
+    const sent = document.querySelectorAll('.message-sent');
+    if (sent.length <= state.baselineSent) return null;
+    const received = document.querySelectorAll('.message-received');
+    if (!received.length) return null;
+    const recv = received[received.length - 1];
+    const lastSent = sent[sent.length - 1];
+    if (!(lastSent.compareDocumentPosition(recv) & Node.DOCUMENT_POSITION_FOLLOWING)) return null;
+    return recv;
+  };
+
+  const emit = (final) => {
+    const recv = activeAnswer();
+    if (recv === null) return null;
+    const html = recv.outerHTML;
+    if (!final && html === state.lastHtml) return null;
+    state.lastHtml = html;
+    const mds = Array.from(recv.querySelectorAll('div.markdown'));
+    return window[bindingName]({
+      seq: ++state.seq,
+      epoch_ms: Date.now(),
+      html,
+      text_len: mds.reduce((n, el) => n + (el.textContent || '').length, 0),
+      markdown_ids: mds.map((el) => el.id || null),
+      final,
+    });
+  };
+
+  const schedule = () => {
+    if (!state.armed || state.timer !== null) return;
+    state.timer = setTimeout(() => { state.timer = null; emit(false); }, state.throttleMs);
+  };
+
+  new MutationObserver(schedule).observe(document.body, {
+    childList: true, subtree: true, characterData: true,
+  });
+
+  window.__f8Live = {
+    arm(throttleMs) {
+      state.armed = true;
+      state.seq = 0;
+      state.lastHtml = null;
+      state.throttleMs = throttleMs;
+      state.baselineSent = document.querySelectorAll('.message-sent').length;
+    },
+    disarm() {
+      state.armed = false;
+      if (state.timer !== null) { clearTimeout(state.timer); state.timer = null; }
+    },
+    async flush() {
+      if (state.timer !== null) { clearTimeout(state.timer); state.timer = null; }
+      const pending = emit(true);
+      if (pending) await pending;
+      return state.seq;
+    },
+  };
+  return true;
+}
+"""
+
+
+@dataclass
+class LiveAnswerStream:
+    """Updates received for one question (monotonic clock, seconds)."""
+
+    armed_mono: float
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    latest_html: str = ""
+    markdown_ids: List[Optional[str]] = field(default_factory=list)
+    first_token_mono: Optional[float] = None
+    last_change_mono: Optional[float] = None
+    final_received: bool = False
+    _last_text_len: int = 0
+
+    def add(self, payload: Dict[str, Any], received_mono: float) -> None:
+        html = str(payload.get("html") or "")
+        text_len = int(payload.get("text_len") or 0)
+        final = bool(payload.get("final"))
+
+        self.updates.append(
+            {
+                "seq": payload.get("seq"),
+                "offset_sec": round(received_mono - self.armed_mono, 4),
+                "text_len": text_len,
+                "html_len": len(html),
+                "final": final,
+            }
+        )
+        if text_len > 0 and self.first_token_mono is None:
+            self.first_token_mono = received_mono
+        if html != self.latest_html or text_len != self._last_text_len:
+            self.last_change_mono = received_mono
+        self.latest_html = html
+        self._last_text_len = text_len
+        ids = payload.get("markdown_ids")
+        self.markdown_ids = list(ids) if isinstance(ids, list) else []
+        self.final_received = self.final_received or final
+
+    def metrics(self) -> Dict[str, Any]:
+        streaming_sec: Optional[float] = None
+        chars_per_sec: Optional[float] = None
+        if self.first_token_mono is not None and self.last_change_mono is not None:
+            streaming_sec = round(self.last_change_mono - self.first_token_mono, 4)
+            if streaming_sec > 0:
+                chars_per_sec = round(self._last_text_len / streaming_sec, 1)
+
+        return {
+            "update_count": len(self.updates),
+            "final_received": self.final_received,
+            "time_to_first_token_sec": (
+                round(self.first_token_mono - self.armed_mono, 4)
+                if self.first_token_mono is not None
+                else None
+            ),
+            "streaming_sec": streaming_sec,
+            "text_len": self._last_text_len,
+            "text_chars_per_sec": chars_per_sec,
+            "html_len": len(self.latest_html),
+            "markdown_ids": self.markdown_ids,
+        }
+
+
+class LiveAnswerCapture:
+    """
+    Per-page live capture. The binding is exposed once per page; arm()
+    before each submit starts a new LiveAnswerStream.
+    """
+
+    def __init__(self, page: Page) -> None:
+        # Weak: _CAPTURES values must not keep their key page alive.
+        self._page_ref = weakref.ref(page)
+        self._exposed = False
+        self.stream: Optional[LiveAnswerStream] = None
+
+    @property
+    def _page(self) -> Page:
+        page = self._page_ref()
+        if page is None:
+            raise RuntimeError("page has been garbage-collected")
+        return page
+
+    def _on_update(self, source: Any, payload: Any) -> None:
+        stream = self.stream
+        if stream is not None and isinstance(payload, dict):
+            stream.add(payload, time.monotonic())
+
+    def arm(self, *, throttle_ms: int = DEFAULT_THROTTLE_MS) -> LiveAnswerStream:
+        if not self._exposed:
+            self._page.expose_binding(BINDING_NAME, self._on_update)
+            self._exposed = True
+        # Re-run after navigations: window.__f8Live does not survive them.
+        self._page.evaluate(_INSTALL_JS, BINDING_NAME)
+        self.stream = LiveAnswerStream(armed_mono=time.monotonic())
+        self._page.evaluate("(ms) => window.__f8Live.arm(ms)", throttle_ms)
+        return self.stream
+
+    def flush(self) -> Optional[LiveAnswerStream]:
+        """Force a final update; returns after Python has received it."""
+        self._page.evaluate("() => window.__f8Live && window.__f8Live.flush()")
+        return self.stream
+
+    def disarm(self) -> None:
+        try:
+            self._page.evaluate("() => window.__f8Live && window.__f8Live.disarm()")
+        finally:
+            self.stream = None
+
+
+_CAPTURES: "weakref.WeakKeyDictionary[Page, LiveAnswerCapture]" = weakref.WeakKeyDictionary()
+
+
+def get_live_answer_capture(page: Page) -> LiveAnswerCapture:
+    """Return the page's LiveAnswerCapture (expose_binding must run once per page)."""
+    capture = _CAPTURES.get(page)
+    if capture is None:
+        capture = LiveAnswerCapture(page)
+        _CAPTURES[page] = capture
+    return capture
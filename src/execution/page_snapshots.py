@@ -0,0 +1,76 @@
+"""
+Per-checkpoint cache of the serialized page DOM (page.content()).
+
+Responsibilities:
+- serialize the whole SPA DOM at most once per checkpoint
+  (after_submit / after_answer_ready) and hand the same string to
+  extraction, forensics and persistence
+- re-capture only after an explicit invalidate()
+- record captures, reuses and the bytes a reuse did not transfer
+
+Non-goals:
+- scoped / streamed captures (see dom_scope_capture, live_answer_capture)
+- caching failed captures (a failure is retried by the next get())
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+
+class PageSnapshotManager:
+    def __init__(self, page: Any) -> None:
+        self.page = page
+        self._html: Dict[str, str] = {}
+        self._captures: Dict[str, dict] = {}
+        self.reuses = 0
+        self.bytes_saved = 0
+        self.failures = 0
+
+    def peek(self, checkpoint: str) -> Optional[str]:
+        """Cached HTML for checkpoint (None when not captured yet)."""
+        return self._html.get(checkpoint)
+
+    def get(self, checkpoint: str) -> str:
+        """
+        Serialized DOM for checkpoint; page.content() runs only on a miss.
+        Exceptions from page.content() propagate (nothing is cached).
+        """
+        cached = self._html.get(checkpoint)
+        if cached is not None:
+            self.reuses += 1
+            self.bytes_saved += len(cached.encode("utf-8"))
+            return cached
+
+        started = time.perf_counter()
+        try:
+            html = self.page.content() or ""
+        except Exception:
+            self.failures += 1
+            raise
+        elapsed = time.perf_counter() - started
+
+        entry = self._captures.setdefault(
+            checkpoint, {"captures": 0, "bytes": 0, "capture_sec": 0.0}
+        )
+        entry["captures"] += 1
+        entry["bytes"] = len(html.encode("utf-8"))
+        entry["capture_sec"] = round(entry["capture_sec"] + elapsed, 4)
+        self._html[checkpoint] = html
+        return html
+
+    def invalidate(self, checkpoint: Optional[str] = None) -> None:
+        """Drop one checkpoint (or all); the next get() re-captures."""
+        if checkpoint is None:
+            self._html.clear()
+        else:
+            self._html.pop(checkpoint, None)
+
+    def to_observation(self) -> dict:
+        return {
+            "checkpoints": {name: dict(entry) for name, entry in self._captures.items()},
+            "reuses": self.reuses,
+            "bytes_saved": self.bytes_saved,
+            "failures": self.failures,
+        }
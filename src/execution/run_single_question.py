@@ -15,15 +15,37 @@ import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, List, Optional, Protocol
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple
 
 from playwright.sync_api import Page
 
-from src.answer_probe import wait_for_answer_text
+from src.answer_probe import DEFAULT_COMPLETION_STRATEGY, wait_for_answer_text
+from src.execution.artifact_writer import ArtifactWriter
 from src.execution.answer_dom_extractor import (
+    EXTRACTOR_VERSION,
+    ParsedSnapshot,
     collect_dom_candidates,
-    extract_answer_dom,
 )
+from src.execution.dom_scope_capture import AnswerScopeCapture, capture_answer_scope
+from src.execution.latency_timeline import LatencyTimeline
+from src.execution.page_snapshots import PageSnapshotManager
+from src.execution.screenshot_capture import (
+    DEFAULT_SCREENSHOT_OPTIONS,
+    ScreenshotOptions,
+    take_screenshot,
+)
+from src.execution.ui_readiness import DEFAULT_UI_READY_TIMEOUT_MS, wait_for_ui_ready
+from src.execution.live_answer_capture import LiveAnswerCapture, get_live_answer_capture
+
+
+DOM_CAPTURE_MODES = ("page", "scope", "live")
+
+# Artifact capture levels (ascending; each level keeps what the previous keeps):
+# - minimal:  raw_answer.* + raw_capture_meta.json (what answer.md needs)
+# - standard: + the ready snapshot (after_answer_ready[_scope|_live].html)
+# - forensic: + after_submit.html, screenshot, dom_candidates.json, TEMP/VERIFY files
+CAPTURE_LEVELS = ("minimal", "standard", "forensic")
+DEFAULT_CAPTURE_LEVEL = "forensic"
 
 
 class ChatPageProtocol(Protocol):
@@ -49,6 +71,8 @@ class SingleQuestionResult:
     raw_capture_attempted: bool
     anchor_dom_selector: Optional[str]
     execution_context: Optional[dict]
+    timeline: Optional[dict] = None  # LatencyTimeline.to_dict()
+    citations: Optional[List[str]] = None  # as displayed with the answer
 
 
 @dataclass(frozen=True)
@@ -89,24 +113,180 @@ def _safe_write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
+def _write_artifact(
+    path: Path, content: str, writer: Optional[ArtifactWriter] = None
+) -> None:
+    """Write now (writer=None) or hand off to the background writer."""
+    if writer is None:
+        _safe_write_text(path, content)
+    else:
+        writer.write_text(path, content)
+
+
+class _CapturePolicy:
+    """
+    Which artifacts run_single_question persists (see CAPTURE_LEVELS).
+
+    Escalates to "forensic" on failure; TEMP/VERIFY texts recorded below
+    forensic are held in memory and written when escalation happens.
+    """
+
+    def __init__(self, level: str, writer: Optional[ArtifactWriter] = None) -> None:
+        if level not in CAPTURE_LEVELS:
+            raise ValueError(
+                f"unknown capture_level: {level!r} (expected one of {CAPTURE_LEVELS})"
+            )
+        self.requested = level
+        self.level = level
+        self.escalation_reason: Optional[str] = None
+        self.writer = writer
+        self._deferred_verify: Dict[Path, str] = {}
+
+    def keeps(self, level: str) -> bool:
+        return CAPTURE_LEVELS.index(self.level) >= CAPTURE_LEVELS.index(level)
+
+    def escalate(self, reason: str) -> bool:
+        """Switch to forensic; True when this call changed the level."""
+        if self.level == "forensic":
+            return False
+        self.level = "forensic"
+        self.escalation_reason = reason
+        for path, content in self._deferred_verify.items():
+            _write_artifact(path, content, self.writer)
+        self._deferred_verify.clear()
+        return True
+
+    def write_verify(self, path: Path, content: str) -> None:
+        if self.keeps("forensic"):
+            _write_artifact(path, content, self.writer)
+        else:
+            self._deferred_verify[path] = content
+
+    def to_observation(self) -> dict:
+        return {
+            "requested_level": self.requested,
+            "level": self.level,
+            "escalation_reason": self.escalation_reason,
+        }
+
+
 def _capture_html_snapshot(
-    page: Page, path: Path, label: str, errors: List[str]
+    snapshots: PageSnapshotManager,
+    checkpoint: str,
+    path: Path,
+    label: str,
+    errors: List[str],
+    *,
+    persist: bool = True,
+    writer: Optional[ArtifactWriter] = None,
 ) -> str:
     try:
-        html = page.content()
-        _safe_write_text(path, html)
+        html = snapshots.get(checkpoint)
+        if persist:
+            _write_artifact(path, html, writer)
         return html
     except Exception as exc:
         errors.append(f"{label} html capture failed: {exc}")
         return ""
 
 
-def _capture_screenshot(page: Page, path: Path, label: str, errors: List[str]) -> None:
+def _capture_answer_scope(
+    page: Page,
+    path: Path,
+    errors: List[str],
+    *,
+    persist: bool = True,
+    writer: Optional[ArtifactWriter] = None,
+) -> Optional[AnswerScopeCapture]:
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        page.screenshot(path=str(path), full_page=True)
+        capture = capture_answer_scope(page)
+        if capture.found and persist:
+            _write_artifact(path, capture.html, writer)
+        return capture
+    except Exception as exc:
+        errors.append(f"answer scope capture failed: {exc}")
+        return None
+
+
+def _finish_live_capture(
+    page: Page,
+    capture: LiveAnswerCapture,
+    path: Path,
+    errors: List[str],
+    *,
+    persist: bool = True,
+    writer: Optional[ArtifactWriter] = None,
+) -> Tuple[str, dict]:
+    """
+    Flush the live stream and verify it against a scope capture.
+    Returns (answer html or "", observation).
+    """
+    observation: dict = {}
+    try:
+        stream = capture.flush()
+        if stream is None:
+            return "", {"error": "live capture not armed"}
+        observation.update(stream.metrics())
+        observation["first_token_mono"] = stream.first_token_mono
+        observation["last_change_mono"] = stream.last_change_mono
+        live_html = stream.latest_html
+    except Exception as exc:
+        errors.append(f"live capture flush failed: {exc}")
+        return "", observation
+    finally:
+        try:
+            capture.disarm()
+        except Exception:
+            pass
+
+    if not live_html:
+        observation["verified"] = None
+        return "", observation
+
+    verify = _capture_answer_scope(
+        page,
+        path.with_name("after_answer_ready_scope.html"),
+        errors,
+        persist=persist,
+        writer=writer,
+    )
+    verified = verify is not None and verify.found and verify.html == live_html
+    observation["verified"] = verified
+    if persist:
+        _write_artifact(path, live_html, writer)
+
+    if not verified and verify is not None and verify.found:
+        # DOM at verification time wins over the stream.
+        errors.append("live capture differs from scope capture; using scope capture")
+        return verify.html, observation
+    return live_html, observation
+
+
+def _capture_screenshot(
+    page: Page,
+    path: Path,
+    label: str,
+    errors: List[str],
+    *,
+    options: ScreenshotOptions = DEFAULT_SCREENSHOT_OPTIONS,
+    anchor_dom_selector: Optional[str] = None,
+    writer: Optional[ArtifactWriter] = None,
+) -> Optional[dict]:
+    try:
+        # Encode in the browser; write here or in the background.
+        data, observation = take_screenshot(
+            page, options, anchor_dom_selector=anchor_dom_selector
+        )
+        if writer is not None:
+            writer.write_bytes(path, data)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        observation.update({"label": label, "file": path.name})
+        return observation
     except Exception as exc:
         errors.append(f"{label} screenshot failed: {exc}")
+        return None
 
 
 def _persist_raw_capture(
@@ -118,6 +298,9 @@ def _persist_raw_capture(
     selection_reason: str,
     extracted_status: str,
     errors: List[str],
+    writer: Optional[ArtifactWriter] = None,
+    snapshot_name: Optional[str] = None,
+    provenance: Optional[Mapping[str, Any]] = None,
 ) -> Optional[RawCapture]:
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -125,8 +308,8 @@ def _persist_raw_capture(
         text_path = output_dir / "raw_answer.txt"
         meta_path = output_dir / "raw_capture_meta.json"
 
-        _safe_write_text(html_path, raw_html or "")
-        _safe_write_text(text_path, raw_text or "")
+        _write_artifact(html_path, raw_html or "", writer)
+        _write_artifact(text_path, raw_text or "", writer)
 
         meta = {
             "captured_at": datetime.now(timezone.utc).isoformat(),
@@ -135,8 +318,12 @@ def _persist_raw_capture(
             "selection_reason": selection_reason,
             "extracted_status": extracted_status,
             "lengths": {"html": len(raw_html or ""), "text": len(raw_text or "")},
+            # Snapshot file the extraction ran on (reextract_run reads it back).
+            "snapshot": snapshot_name,
+            "extractor_version": EXTRACTOR_VERSION,
         }
-        _safe_write_text(meta_path, json.dumps(meta, ensure_ascii=False, indent=2))
+        meta.update(provenance or {})
+        _write_artifact(meta_path, json.dumps(meta, ensure_ascii=False, indent=2), writer)
 
         return RawCapture(
             raw_html=raw_html or "",
@@ -161,9 +348,20 @@ def _write_dom_candidates_file(
     chat_id: str,
     observation: Optional[dict],
     errors: List[str],
+    snapshot: Optional[ParsedSnapshot] = None,
+    parser: Optional[str] = None,
+    precomputed: Optional[Tuple[List[dict], List[str]]] = None,
+    writer: Optional[ArtifactWriter] = None,
+    provenance: Optional[Mapping[str, Any]] = None,
 ) -> None:
     try:
-        candidates, candidate_errors = collect_dom_candidates(html)
+        # Reuse the extraction parse (or memoized candidates) for the same HTML.
+        if precomputed is not None:
+            candidates, candidate_errors = list(precomputed[0]), list(precomputed[1])
+        elif snapshot is not None and snapshot.html == html:
+            candidates, candidate_errors = snapshot.candidates()
+        else:
+            candidates, candidate_errors = collect_dom_candidates(html, parser=parser)
         payload = {
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "source": "run_single_question",
@@ -174,6 +372,7 @@ def _write_dom_candidates_file(
             "candidates": candidates,
             "errors": errors + candidate_errors,
         }
+        payload.update(provenance or {})
 
         if observation is not None:
             payload["extraction"] = {
@@ -185,7 +384,7 @@ def _write_dom_candidates_file(
                 "extracted_status": observation.get("extracted_status"),
             }
 
-        _safe_write_text(path, json.dumps(payload, ensure_ascii=False, indent=2))
+        _write_artifact(path, json.dumps(payload, ensure_ascii=False, indent=2), writer)
     except Exception:
         # Forensics must never block execution.
         return
@@ -201,39 +400,118 @@ def run_single_question(
     profile: str,
     execution_context: Optional[dict] = None,
     timeout_sec: int = 60,
+    completion_strategy: str = DEFAULT_COMPLETION_STRATEGY,
+    completion_options: Optional[Mapping[str, Any]] = None,
+    html_parser: Optional[str] = None,
+    dom_capture: str = "page",
+    capture_level: str = DEFAULT_CAPTURE_LEVEL,
+    artifact_writer: Optional[ArtifactWriter] = None,
+    ui_ready_timeout_ms: int = DEFAULT_UI_READY_TIMEOUT_MS,
+    screenshot: Optional[ScreenshotOptions] = None,
 ) -> SingleQuestionResult:
+    """
+    dom_capture selects how the answer DOM is obtained after the probe:
+    - "page": page.content() of the whole page (after_answer_ready.html)
+    - "scope": only the last .message-received subtree, serialized in the
+      browser (after_answer_ready_scope.html); falls back to "page" when
+      no answer scope is found.
+    - "live": the answer container is streamed from the page while it grows
+      (MutationObserver + expose_binding, armed before submit). The streamed
+      HTML is extracted and verified against a scope capture
+      (after_answer_ready_live.html); falls back to "scope" on mismatch and
+      to "page" when nothing was streamed.
+
+    capture_level selects which artifacts are written (see CAPTURE_LEVELS).
+    It escalates to "forensic" when the probe raised or extraction is not
+    VALID; artifacts of earlier checkpoints (after_submit.html) cannot be
+    recovered at that point. The outcome is recorded in
+    execution_context["capture"].
+
+    artifact_writer moves artifact file writes to background threads
+    (see artifact_writer); the caller owns it and flushes it. Without it,
+    files are written synchronously.
+
+    Before submit, the UI readiness check (input enabled, no pending
+    assistant message, send control idle) runs in-page and returns as soon
+    as the UI is ready, waiting at most ui_ready_timeout_ms (0 skips it).
+    Not being ready is recorded in execution_context["ui_readiness"];
+    submission proceeds either way.
+
+    screenshot selects the after_answer_ready image (scope full page /
+    viewport / answer element, PNG / JPEG / WebP, scale, only_on_failure;
+    see screenshot_capture). It is taken after extraction so the answer
+    element is known, and only at forensic capture level. Its capture time
+    and size are recorded in execution_context["screenshot"].
+    """
+    if dom_capture not in DOM_CAPTURE_MODES:
+        raise ValueError(
+            f"unknown dom_capture: {dom_capture!r} (expected one of {DOM_CAPTURE_MODES})"
+        )
+    policy = _CapturePolicy(capture_level, artifact_writer)
+
     output_dir.mkdir(parents=True, exist_ok=True)
 
     snapshot_errors: List[str] = []
     after_submit_path = output_dir / "after_submit.html"
     after_ready_html_path = output_dir / "after_answer_ready.html"
-    after_ready_png_path = output_dir / "after_answer_ready.png"
+    after_ready_scope_path = output_dir / "after_answer_ready_scope.html"
+    after_ready_live_path = output_dir / "after_answer_ready_live.html"
+    screenshot_options = screenshot or DEFAULT_SCREENSHOT_OPTIONS
+    after_ready_png_path = output_dir / f"after_answer_ready{screenshot_options.suffix}"
     dom_candidates_path = output_dir / "dom_candidates.json"
     after_submit_html = ""
     after_ready_html = ""
     dom_html = ""
-
-    # TEMP: UI readiness stabilization (remove after confirmation)
-    chat_page.page.wait_for_timeout(1000)
-    # ------------------------------------------------------------
-
+    scope_captured = False
+    # Snapshot file dom_html corresponds to (recorded in raw_capture_meta).
+    dom_source_path = after_ready_html_path
+    # Ready snapshot / screenshot already on disk (for escalation catch-up).
+    ready_persisted = False
+    screenshot_observation: Optional[dict] = None
+
+    timeline = LatencyTimeline()
+    # One page.content() per checkpoint, shared by extraction and forensics.
+    page_snapshots = PageSnapshotManager(chat_page.page)
+
+    ui_readiness = wait_for_ui_ready(chat_page.page, timeout_ms=ui_ready_timeout_ms)
+
+    live_capture: Optional[LiveAnswerCapture] = None
+    if dom_capture == "live":
+        try:
+            live_capture = get_live_answer_capture(chat_page.page)
+            live_capture.arm()
+        except Exception as exc:
+            snapshot_errors.append(f"live capture arm failed: {exc}")
+            live_capture = None
+
+    timeline.mark("submit_start")
     submit_receipt = chat_page.submit(question_text)
+    timeline.mark("submit_ack")
     submit_id = _extract_submit_id(submit_receipt)
     chat_id = _extract_chat_id(chat_page)
 
-    after_submit_html = _capture_html_snapshot(
-        chat_page.page, after_submit_path, "after_submit", snapshot_errors
-    )
+    if policy.keeps("forensic"):
+        after_submit_html = _capture_html_snapshot(
+            page_snapshots,
+            "after_submit",
+            after_submit_path,
+            "after_submit",
+            snapshot_errors,
+            writer=artifact_writer,
+        )
 
     probe_answer_text = ""
     probe_exception: Optional[Exception] = None
 
+    dom_snapshot: Optional[ParsedSnapshot] = None
+    citations: Optional[List[str]] = None
     dom_result = None
     dom_result_observation: Optional[dict] = None
     raw_capture_attempted = False
     raw_capture: Optional[RawCapture] = None
 
     merged_context = dict(execution_context or {})
+    merged_context["ui_readiness"] = ui_readiness.to_observation()
 
     # ------------------------------------------------------------
     # Probe phase (observation only) — must not block DOM extraction
@@ -244,6 +522,9 @@ def run_single_question(
             submit_id=submit_id,
             chat_id=chat_id,
             timeout_sec=timeout_sec,
+            on_summary=timeline.merge_probe_summary,
+            strategy=completion_strategy,
+            strategy_options=completion_options,
         )
     except Exception as exc:
         probe_exception = exc
@@ -251,9 +532,14 @@ def run_single_question(
             "type": type(exc).__name__,
             "message": str(exc),
         }
+        if "probe_end" not in timeline.marks:
+            timeline.mark("probe_end")
+        if timeline.completion_reason is None:
+            timeline.completion_reason = f"probe_exception: {type(exc).__name__}"
+        policy.escalate(f"probe raised {type(exc).__name__}")
 
         # TEMP/VERIFY: capture root exception from probe
-        _safe_write_text(
+        policy.write_verify(
             output_dir / "verify_dom_exception.txt",
             f"{type(exc).__name__}: {exc}",
         )
@@ -262,25 +548,79 @@ def run_single_question(
     # DOM snapshot + extraction phase (always)
     # ------------------------------------------------------------
     try:
-        after_ready_html = _capture_html_snapshot(
-            chat_page.page, after_ready_html_path, "after_answer_ready", snapshot_errors
-        )
-        _capture_screenshot(
-            chat_page.page, after_ready_png_path, "after_answer_ready", snapshot_errors
-        )
+        if live_capture is not None:
+            live_html, live_observation = _finish_live_capture(
+                chat_page.page,
+                live_capture,
+                after_ready_live_path,
+                snapshot_errors,
+                persist=policy.keeps("standard"),
+                writer=artifact_writer,
+            )
+            merged_context["live_capture"] = live_observation
+            for mark_name, key in (
+                ("first_token", "first_token_mono"),
+                ("last_token", "last_change_mono"),
+            ):
+                value = live_observation.pop(key, None)
+                if value is not None:
+                    timeline.mark(mark_name, at=value)
+            if live_html:
+                dom_html = live_html
+                dom_source_path = after_ready_live_path
+                scope_captured = True
+                ready_persisted = policy.keeps("standard")
+
+        if dom_capture == "scope":
+            scope_capture = _capture_answer_scope(
+                chat_page.page,
+                after_ready_scope_path,
+                snapshot_errors,
+                persist=policy.keeps("standard"),
+                writer=artifact_writer,
+            )
+            if scope_capture is not None:
+                merged_context["dom_scope_capture"] = scope_capture.to_observation()
+                if scope_capture.found:
+                    dom_html = scope_capture.html
+                    dom_source_path = after_ready_scope_path
+                    scope_captured = True
+                    ready_persisted = policy.keeps("standard")
+
+        if not scope_captured:
+            after_ready_html = _capture_html_snapshot(
+                page_snapshots,
+                "after_answer_ready",
+                after_ready_html_path,
+                "after_answer_ready",
+                snapshot_errors,
+                persist=policy.keeps("standard"),
+                writer=artifact_writer,
+            )
+            ready_persisted = policy.keeps("standard")
 
-        dom_html = after_ready_html or chat_page.page.content()
+        dom_html = dom_html or after_ready_html or page_snapshots.get("after_answer_ready")
+        timeline.mark("snapshot_done")
 
         # TEMP/VERIFY: capture pre-extraction state
-        _safe_write_text(
+        policy.write_verify(
             output_dir / "verify_reached_extract.txt",
             "before extract_answer_dom",
         )
 
-        dom_result = extract_answer_dom(dom_html, question_text)
+        # Only the last message-received is used: parse the tail of long chats.
+        dom_snapshot = ParsedSnapshot(dom_html, html_parser, tail_only=True)
+        dom_result = dom_snapshot.extract(question_text)
+        timeline.mark("extraction_done")
+
+        # Citations come from the same parsed scope (no browser round trip).
+        try:
+            citations = [c.to_line() for c in dom_snapshot.citations()]
+        except Exception as exc:
+            snapshot_errors.append(f"citation extraction failed: {exc}")
 
         # TEMP/VERIFY: capture post-extraction state
-        _safe_write_text(
+        policy.write_verify(
             output_dir / "verify_after_extract.txt",
             f"dom_result is None = {dom_result is None}",
         )
@@ -307,46 +647,94 @@ def run_single_question(
                 selection_reason=dom_result.observation.reason,
                 extracted_status=dom_result.extracted_status,
                 errors=snapshot_errors,
+                writer=artifact_writer,
+                snapshot_name=dom_source_path.name,
             )
     except Exception as exc:
         # DOM extraction failure must not block overall execution.
         snapshot_errors.append(f"dom extraction failed: {type(exc).__name__}: {exc}")
+        policy.escalate("dom extraction failed")
 
         if not after_ready_html:
             after_ready_html = _capture_html_snapshot(
-                chat_page.page,
+                page_snapshots,
+                "after_answer_ready",
                 after_ready_html_path,
                 "after_answer_ready-on-dom-error",
                 snapshot_errors,
+                writer=artifact_writer,
             )
-        _capture_screenshot(
+        screenshot_observation = _capture_screenshot(
             chat_page.page,
             after_ready_png_path,
             "after_answer_ready-on-dom-error",
             snapshot_errors,
-        )
+            options=screenshot_options,
+            writer=artifact_writer,
+        ) or {"label": "after_answer_ready-on-dom-error", "failed": True}
         if not dom_html:
             dom_html = after_ready_html
+        ready_persisted = ready_persisted or bool(after_ready_html)
+
+    if dom_result is not None and dom_result.extracted_status != "VALID":
+        policy.escalate(f"extracted_status {dom_result.extracted_status}")
+
+    # Escalated after the ready checkpoint: persist what is still available.
+    if policy.keeps("forensic"):
+        if dom_html and not ready_persisted:
+            _write_artifact(dom_source_path, dom_html, artifact_writer)
+            ready_persisted = True
+
+    # Screenshot after extraction: the answer element is known by now.
+    question_failed = (
+        probe_exception is not None
+        or dom_result is None
+        or dom_result.extracted_status != "VALID"
+    )
+    if (
+        screenshot_observation is None
+        and policy.keeps("forensic")
+        and (question_failed or not screenshot_options.only_on_failure)
+    ):
+        screenshot_observation = _capture_screenshot(
+            chat_page.page,
+            after_ready_png_path,
+            "after_answer_ready",
+            snapshot_errors,
+            options=screenshot_options,
+            anchor_dom_selector=(
+                dom_result.anchor_dom_selector if dom_result is not None else None
+            ),
+            writer=artifact_writer,
+        )
 
     # ------------------------------------------------------------
     # Finalize: ensure snapshot + candidates are saved
     # ------------------------------------------------------------
-    if not after_ready_html:
+    if not after_ready_html and not scope_captured:
         after_ready_html = _capture_html_snapshot(
-            chat_page.page,
+            page_snapshots,
+            "after_answer_ready",
             after_ready_html_path,
             "after_answer_ready-finalize",
             snapshot_errors,
+            persist=policy.keeps("standard"),
+            writer=artifact_writer,
         )
 
-    _write_dom_candidates_file(
-        path=dom_candidates_path,
-        html=dom_html or after_ready_html or after_submit_html,
-        submit_id=submit_id,
-        chat_id=chat_id,
-        observation=dom_result_observation,
-        errors=snapshot_errors,
-    )
+    if policy.keeps("forensic"):
+        _write_dom_candidates_file(
+            path=dom_candidates_path,
+            html=dom_html or after_ready_html or after_submit_html,
+            submit_id=submit_id,
+            chat_id=chat_id,
+            observation=dom_result_observation,
+            errors=snapshot_errors,
+            snapshot=dom_snapshot,
+            parser=html_parser,
+            writer=artifact_writer,
+        )
+    timeline.mark("persist_done")
 
     # --- Observed facts (no evaluation, no print) ---
     dom_observation = dom_result_observation or {
@@ -365,6 +753,10 @@ def run_single_question(
         {
             "probe_answer_text": probe_answer_text,
             "dom_extraction": dom_observation,
+            "capture": policy.to_observation(),
+            "page_snapshots": page_snapshots.to_observation(),
+            "screenshot": screenshot_observation
+            or {"mode": screenshot_options.mode, "skipped": True},
         }
     )
 
@@ -381,7 +773,7 @@ def run_single_question(
     )
 
     # TEMP/VERIFY: diagnose extraction result
-    _safe_write_text(
+    policy.write_verify(
         output_dir / "verify_extraction_state.txt",
         json.dumps(
             {
@@ -417,4 +809,6 @@ def run_single_question(
         raw_capture_attempted=raw_capture_attempted,
         anchor_dom_selector=dom_observation.get("anchor_dom_selector"),
         execution_context=merged_context,
+        timeline=timeline.to_dict(),
+        citations=citations,
     )
@@ -0,0 +1,192 @@
+"""
+Screenshot options for run_single_question (after_answer_ready image).
+
+Responsibilities:
+- capture scope: full page (previous behavior), viewport, or the selected
+  answer element (anchor_dom_selector within the last .message-received)
+- encoding: PNG, JPEG (quality) or WebP (quality; re-encoded with Pillow,
+  optional dependency)
+- downscale: scale="css" captures at CSS pixels instead of device pixels
+- only_on_failure: skip the image unless the question failed
+- report capture time and bytes per mode (summarize_screenshots)
+
+Non-goals:
+- deciding whether a question failed (run_single_question does)
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+
+SCREENSHOT_SCOPES = ("full_page", "viewport", "answer")
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+SCREENSHOT_SCALES = ("device", "css")
+
+ANSWER_SCOPE_SELECTOR = ".message-received"
+# Extractor fallback anchor (the whole scope, see answer_dom_extractor).
+SCOPE_ANCHOR = ".message-received:last-of-type"
+
+# Element capture waits for the element to become visible; a missing answer
+# must fall back quickly instead of stalling for Playwright's 30 s default.
+ANSWER_SCREENSHOT_TIMEOUT_MS = 2000
+
+_SUFFIXES = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+
+def _pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+@dataclass(frozen=True)
+class ScreenshotOptions:
+    scope: str = "full_page"
+    image_format: str = "png"
+    quality: Optional[int] = None  # jpeg / webp only (0-100)
+    scale: str = "device"
+    only_on_failure: bool = False
+
+    def __post_init__(self) -> None:
+        if self.scope not in SCREENSHOT_SCOPES:
+            raise ValueError(
+                f"unknown screenshot scope: {self.scope!r} (expected one of {SCREENSHOT_SCOPES})"
+            )
+        if self.image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(
+                f"unknown screenshot format: {self.image_format!r} "
+                f"(expected one of {SCREENSHOT_FORMATS})"
+            )
+        if self.scale not in SCREENSHOT_SCALES:
+            raise ValueError(
+                f"unknown screenshot scale: {self.scale!r} (expected one of {SCREENSHOT_SCALES})"
+            )
+        if self.quality is not None:
+            if self.image_format == "png":
+                raise ValueError("screenshot quality applies to jpeg / webp only")
+            if not 0 <= self.quality <= 100:
+                raise ValueError(f"screenshot quality out of range: {self.quality}")
+        if self.image_format == "webp" and not _pillow_available():
+            raise ValueError("screenshot format 'webp' requires Pillow (pip install pillow)")
+
+    @classmethod
+    def from_mapping(cls, data: Optional[Mapping[str, Any]]) -> "ScreenshotOptions":
+        """From env.yaml options.screenshot (missing keys keep defaults)."""
+        data = dict(data or {})
+        unknown = set(data) - {"scope", "format", "quality", "scale", "only_on_failure"}
+        if unknown:
+            raise ValueError(f"unknown screenshot option(s): {sorted(unknown)}")
+        return cls(
+            scope=data.get("scope", "full_page"),
+            image_format=data.get("format", "png"),
+            quality=data.get("quality"),
+            scale=data.get("scale", "device"),
+            only_on_failure=bool(data.get("only_on_failure", False)),
+        )
+
+    @property
+    def suffix(self) -> str:
+        return _SUFFIXES[self.image_format]
+
+    @property
+    def mode(self) -> str:
+        """Report key, e.g. "answer/jpeg-q70/css"."""
+        encoding = self.image_format
+        if self.quality is not None:
+            encoding += f"-q{self.quality}"
+        return f"{self.scope}/{encoding}/{self.scale}"
+
+
+DEFAULT_SCREENSHOT_OPTIONS = ScreenshotOptions()
+
+
+def _encode_kwargs(options: ScreenshotOptions) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"scale": options.scale}
+    if options.image_format == "jpeg":
+        kwargs["type"] = "jpeg"
+        if options.quality is not None:
+            kwargs["quality"] = options.quality
+    else:
+        # webp is re-encoded from a lossless capture.
+        kwargs["type"] = "png"
+    return kwargs
+
+
+def _to_webp(png: bytes, quality: Optional[int]) -> bytes:
+    from PIL import Image
+
+    out = io.BytesIO()
+    with Image.open(io.BytesIO(png)) as image:
+        image.save(out, format="WEBP", quality=quality if quality is not None else 80)
+    return out.getvalue()
+
+
+def _answer_locator(page: Any, anchor_dom_selector: Optional[str]) -> Any:
+    scope = page.locator(ANSWER_SCOPE_SELECTOR).last
+    if not anchor_dom_selector or anchor_dom_selector == SCOPE_ANCHOR:
+        return scope
+    return scope.locator(anchor_dom_selector).first
+
+
+def take_screenshot(
+    page: Any,
+    options: ScreenshotOptions = DEFAULT_SCREENSHOT_OPTIONS,
+    *,
+    anchor_dom_selector: Optional[str] = None,
+) -> Tuple[bytes, dict]:
+    """
+    Capture one image per options. Returns (bytes, observation).
+
+    scope="answer" clips to the extracted answer element; when it cannot be
+    captured (no answer element, or not visible within
+    ANSWER_SCREENSHOT_TIMEOUT_MS), the full page is taken instead and the
+    fallback is recorded.
+    """
+    kwargs = _encode_kwargs(options)
+    observation: Dict[str, Any] = {"mode": options.mode, "scope": options.scope}
+
+    started = time.perf_counter()
+    data: Optional[bytes] = None
+    if options.scope == "answer":
+        try:
+            locator = _answer_locator(page, anchor_dom_selector)
+            if locator.count() == 0:
+                observation["fallback"] = "full_page (answer element not found)"
+            else:
+                data = locator.screenshot(timeout=ANSWER_SCREENSHOT_TIMEOUT_MS, **kwargs)
+                observation["clipped_to"] = anchor_dom_selector or ANSWER_SCOPE_SELECTOR
+        except Exception as exc:
+            observation["fallback"] = f"full_page ({type(exc).__name__})"
+    if data is None:
+        data = page.screenshot(full_page=options.scope != "viewport", **kwargs)
+    if options.image_format == "webp":
+        data = _to_webp(data, options.quality)
+
+    observation["capture_sec"] = round(time.perf_counter() - started, 4)
+    observation["bytes"] = len(data)
+    return data, observation
+
+
+def summarize_screenshots(observations: Iterable[Mapping[str, Any]]) -> Dict[str, dict]:
+    """Count / bytes / capture time per mode (run-level report)."""
+    summary: Dict[str, dict] = {}
+    for obs in observations:
+        if not obs or "bytes" not in obs:
+            continue
+        entry = summary.setdefault(
+            obs.get("mode", "unknown"),
+            {"count": 0, "total_bytes": 0, "total_capture_sec": 0.0, "fallbacks": 0},
+        )
+        entry["count"] += 1
+        entry["total_bytes"] += int(obs.get("bytes") or 0)
+        entry["total_capture_sec"] += float(obs.get("capture_sec") or 0.0)
+        entry["fallbacks"] += 1 if obs.get("fallback") else 0
+
+    for entry in summary.values():
+        entry["mean_bytes"] = round(entry["total_bytes"] / entry["count"])
+        entry["mean_capture_sec"] = round(entry["total_capture_sec"] / entry["count"], 4)
+        entry["total_capture_sec"] = round(entry["total_capture_sec"], 4)
+    return summary
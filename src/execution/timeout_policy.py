@@ -0,0 +1,150 @@
+"""
+Adaptive per-question timeout derived from previous runs' latency reports.
+
+Responsibilities:
+- learn completion latency per (profile, question_id) and per profile
+  from latency_report.json files written by run_f8_collection
+- ignore censored samples (probe waited out its window / timed out), whose
+  latency is the old timeout rather than an observed completion
+- derive the probe upper bound as quantile + margin (clamped)
+
+Non-goals:
+- changing completion semantics (the probe still decides completion;
+  the timeout only bounds waiting)
+- evaluation of answers or of latency itself
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from src.execution.latency_timeline import percentile
+
+
+# Stage used as the observed completion latency of one question
+# (probe start -> last completion evidence; excludes the probe tail).
+DEFAULT_LATENCY_STAGE = "probe_evidence"
+
+# timeline["completion_reason"] values whose latency is bounded by the
+# timeout itself. Reasons containing "timeout" are censored as well.
+CENSORED_COMPLETION_REASONS = ("capture_window_elapsed",)
+
+
+def is_censored(completion_reason: Any) -> bool:
+    """True when a sample only says "took at least the timeout"."""
+    if not isinstance(completion_reason, str):
+        # Reports written before completion_reason was recorded.
+        return False
+    reason = completion_reason.lower()
+    return reason in CENSORED_COMPLETION_REASONS or "timeout" in reason
+
+
+@dataclass
+class LatencyTimeoutPolicy:
+    """
+    Quantile-based timeout policy.
+
+    Lookup order for timeout_for():
+      1. (profile, question_id) samples, when at least min_samples exist
+      2. profile-wide samples, when at least min_samples exist
+      3. default_timeout_sec
+    """
+
+    quantile: float = 95.0
+    margin_sec: float = 10.0
+    min_timeout_sec: int = 15
+    max_timeout_sec: int = 180
+    min_samples: int = 3
+    stage: str = DEFAULT_LATENCY_STAGE
+    samples: Dict[Tuple[str, str], List[float]] = field(default_factory=dict)
+    profile_samples: Dict[str, List[float]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # timeout_for() derives a percentile only from a non-empty sample set.
+        if self.min_samples < 1:
+            raise ValueError(f"min_samples must be >= 1 (got {self.min_samples})")
+
+    def add_sample(self, *, profile: str, question_id: str, latency_sec: float) -> None:
+        self.samples.setdefault((profile, question_id), []).append(latency_sec)
+        self.profile_samples.setdefault(profile, []).append(latency_sec)
+
+    def add_report(self, report: Mapping[str, Any]) -> int:
+        """
+        Learn from one latency_report.json payload. Returns samples added.
+        Censored entries (see is_censored) are skipped.
+        """
+        added = 0
+        for entry in report.get("questions") or []:
+            if not isinstance(entry, Mapping):
+                continue
+            timeline = entry.get("timeline") or {}
+            if is_censored(timeline.get("completion_reason")):
+                continue
+            stages = timeline.get("stages_sec") or {}
+            value = stages.get(self.stage)
+            profile = entry.get("profile")
+            question_id = entry.get("question_id")
+            if not isinstance(value, (int, float)) or not profile or not question_id:
+                continue
+            self.add_sample(
+                profile=str(profile), question_id=str(question_id), latency_sec=float(value)
+            )
+            added += 1
+        return added
+
+    def load_reports(self, paths: Iterable[Path]) -> int:
+        added = 0
+        for path in paths:
+            try:
+                report = json.loads(Path(path).read_text(encoding="utf-8"))
+            except Exception:
+                # Unreadable history is ignored (policy falls back to default).
+                continue
+            if isinstance(report, Mapping):
+                added += self.add_report(report)
+        return added
+
+    def _from_samples(self, values: List[float]) -> int:
+        latency = percentile(sorted(values), self.quantile)
+        timeout = math.ceil(latency + self.margin_sec)
+        return int(min(self.max_timeout_sec, max(self.min_timeout_sec, timeout)))
+
+    def timeout_for(
+        self, *, profile: str, question_id: str, default_timeout_sec: int
+    ) -> int:
+        values = self.samples.get((profile, question_id), [])
+        if len(values) >= self.min_samples:
+            return self._from_samples(values)
+
+        values = self.profile_samples.get(profile, [])
+        if len(values) >= self.min_samples:
+            return self._from_samples(values)
+
+        return default_timeout_sec
+
+
+def load_timeout_policy(
+    history_root: Path,
+    *,
+    quantile: float = 95.0,
+    margin_sec: float = 10.0,
+    min_timeout_sec: int = 15,
+    max_timeout_sec: int = 180,
+    min_samples: int = 3,
+) -> LatencyTimeoutPolicy:
+    """Build a policy from every latency_report.json under history_root."""
+    policy = LatencyTimeoutPolicy(
+        quantile=quantile,
+        margin_sec=margin_sec,
+        min_timeout_sec=min_timeout_sec,
+        max_timeout_sec=max_timeout_sec,
+        min_samples=min_samples,
+    )
+    root = Path(history_root)
+    if root.is_dir():
+        policy.load_reports(sorted(root.rglob("latency_report.json")))
+    return policy
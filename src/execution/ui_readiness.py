@@ -0,0 +1,121 @@
+"""
+Pre-submit UI readiness check (replaces the fixed 1 s stabilization wait).
+
+Responsibilities:
+- wait in-page (page.wait_for_function) until the chat UI accepts input:
+  - the message input (#message) is present and enabled
+  - no assistant message is pending (the last .message-sent has a
+    .message-received with text after it)
+  - the send control (#chat-send-button) is idle: enabled, or disabled only
+    because the input is empty (Qommons disables it whenever there is
+    nothing to send, including right after every answer)
+- return as soon as the UI is ready; give up at a configurable ceiling
+
+Non-goals:
+- failing the question (a timeout is recorded and submission proceeds,
+  as it did after the fixed wait)
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+DEFAULT_UI_READY_TIMEOUT_MS = 5000
+
+READINESS_SELECTORS: Dict[str, str] = {
+    "input": "#message",
+    "send": "#chat-send-button",
+    "sent": ".message-sent",
+    "received": ".message-received",
+}
+
+# Returns the per-condition state; wait_for_function needs a truthy value
+# only when everything is ready (READY_JS below).
+READINESS_STATE_JS = """
+(sel) => {
+  const input = document.querySelector(sel.input);
+  const send = document.querySelector(sel.send);
+  const sent = document.querySelectorAll(sel.sent);
+  const received = document.querySelectorAll(sel.received);
+  const lastSent = sent.length ? sent[sent.length - 1] : null;
+  const lastReceived = received.length ? received[received.length - 1] : null;
+
+  let pending = false;
+  if (lastSent) {
+    const answered = lastReceived
+      && (lastSent.compareDocumentPosition(lastReceived) & Node.DOCUMENT_POSITION_FOLLOWING);
+    pending = !answered || !(lastReceived.textContent || "").trim();
+  }
+  const inputEmpty = !!input && !(input.value || "").trim();
+  const sendEnabled = !!send && !send.disabled && send.getAttribute("aria-disabled") !== "true";
+  return {
+    input_enabled: !!input && !input.disabled && !input.readOnly,
+    assistant_pending: pending,
+    send_idle: !!send && (sendEnabled || inputEmpty),
+  };
+}
+"""
+
+READY_JS = (
+    "(sel) => { const s = ("
+    + READINESS_STATE_JS.strip()
+    + ")(sel); return s.input_enabled && !s.assistant_pending && s.send_idle; }"
+)
+
+
+@dataclass(frozen=True)
+class UiReadiness:
+    ready: bool
+    elapsed_ms: float
+    timeout_ms: int
+    reason: str  # "ready" | "timeout" | "error: ..." | "skipped"
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    def to_observation(self) -> dict:
+        return {
+            "ready": self.ready,
+            "elapsed_ms": self.elapsed_ms,
+            "timeout_ms": self.timeout_ms,
+            "reason": self.reason,
+            "state": dict(self.state),
+        }
+
+
+def _read_state(page: Any) -> Dict[str, Any]:
+    try:
+        state = page.evaluate(READINESS_STATE_JS, READINESS_SELECTORS)
+    except Exception:
+        return {}
+    return dict(state) if isinstance(state, dict) else {}
+
+
+def wait_for_ui_ready(
+    page: Any, *, timeout_ms: Optional[int] = DEFAULT_UI_READY_TIMEOUT_MS
+) -> UiReadiness:
+    """
+    Block until the chat UI is ready for the next submit (or timeout_ms).
+    timeout_ms <= 0 / None skips the check.
+    """
+    if not timeout_ms or timeout_ms <= 0:
+        return UiReadiness(ready=False, elapsed_ms=0.0, timeout_ms=0, reason="skipped")
+
+    started = time.perf_counter()
+    try:
+        page.wait_for_function(READY_JS, arg=READINESS_SELECTORS, timeout=timeout_ms)
+        ready, reason = True, "ready"
+    except Exception as exc:
+        ready = False
+        reason = "timeout" if "timeout" in type(exc).__name__.lower() else f"error: {exc}"
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    # State is only read back when not ready (diagnostics, no extra round trip).
+    return UiReadiness(
+        ready=ready,
+        elapsed_ms=elapsed_ms,
+        timeout_ms=timeout_ms,
+        reason=reason,
+        state={} if ready else _read_state(page),
+    )
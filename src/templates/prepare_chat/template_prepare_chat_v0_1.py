@@ -20,6 +20,7 @@ from datetime import datetime
 
 from playwright.sync_api import sync_playwright
 
+from scripts.probe_v0_2 import get_probe_dispatcher
 from src.env_loader import load_env
 from tests.pages.login_page import LoginPage
 from tests.pages.chat_select_page import ChatSelectPage
@@ -54,6 +55,10 @@ def prepare_chat_session(question: str = "テストメッセージ"):
     context = browser.new_context()
     page = context.new_page()
 
+    # probe の listener は遷移前に登録する（ページ表示時に接続される
+    # subscription WebSocket を捕捉するため）
+    get_probe_dispatcher(page).install()
+
     # ---------------------------
     # env 読み込み
     # ---------------------------
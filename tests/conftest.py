@@ -5,6 +5,7 @@
 import os
 import pytest
 
+from scripts.probe_v0_2 import get_probe_dispatcher
 from src.env_loader import load_env, MissingSecretError
 from tests.pages.login_page import LoginPage
 from tests.pages.chat_select_page import ChatSelectPage
@@ -103,6 +104,9 @@ def case_dirs(tmp_path_factory):
 def chat_page(page, env_config):
     config, _ = env_config
 
+    # ---- Probe listener（遷移前に登録し、ページ表示時の WebSocket も捕捉する）----
+    get_probe_dispatcher(page).install()
+
     # ---- Login ----
     login = LoginPage(page, config)
     login.open()
@@ -0,0 +1,48 @@
+"""
+Baseline comparison for the extractor benchmark (shared by tests and
+scripts/bench_answer_dom_extractor.py --check).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+# Metrics compared by --check (higher is worse) -> minimum absolute increase
+# reported as a regression (keeps sub-millisecond noise out of CI).
+CHECKED_METRICS: Dict[str, float] = {
+    "extract_sec": 0.005,
+    "extract_tail_sec": 0.005,
+    "candidates_sec": 0.005,
+    "serialize_sec": 0.005,
+    "peak_mem_mb": 1.0,
+}
+
+
+def compare_with_baseline(
+    current: Dict[str, Any], baseline: Dict[str, Any], *, tolerance: float
+) -> List[str]:
+    """
+    Regression messages for metrics above baseline * (1 + tolerance)
+    (and above the metric's minimum absolute increase), plus any change
+    in the extraction outcome.
+    """
+    regressions: List[str] = []
+    for name, base_case in (baseline.get("cases") or {}).items():
+        case = (current.get("cases") or {}).get(name)
+        if case is None:
+            continue
+        for key in ("extracted_status", "selected_n"):
+            if case.get(key) != base_case.get(key):
+                regressions.append(
+                    f"{name}.{key}: {case.get(key)!r} != baseline {base_case.get(key)!r}"
+                )
+        for metric, min_delta in CHECKED_METRICS.items():
+            value = case.get(metric)
+            base = base_case.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(base, (int, float)):
+                continue
+            if value > base * (1 + tolerance) and value - base >= min_delta:
+                regressions.append(
+                    f"{name}.{metric}: {value} > baseline {base} (+{tolerance:.0%})"
+                )
+    return regressions
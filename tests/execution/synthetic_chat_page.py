@@ -0,0 +1,71 @@
+"""
+Synthetic Qommons-like chat pages (shared by tests and the extractor benchmark).
+
+1..N question/answer pairs with varying markdown counts, odd/even id mixes
+and large tables; deterministic per seed. No browser is needed.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import List, Optional, Sequence
+
+
+def _answer_block(rng: random.Random, ids: Sequence[int], table_rows: int) -> str:
+    parts = []
+    for position, n in enumerate(ids):
+        body = "".join(
+            f"<p>第{rng.randint(1, 99)}条 本文 {rng.random():.6f} <strong>強調</strong></p>"
+            for _ in range(rng.randint(1, 4))
+        )
+        if table_rows and position == len(ids) - 1:
+            rows = "".join(
+                f"<tr><td>第{i}条</td><td>条文 {i} <a href=\"#a{i}\">参照</a></td></tr>"
+                for i in range(table_rows)
+            )
+            body += f"<table><thead><tr><th>条</th><th>内容</th></tr></thead><tbody>{rows}</tbody></table>"
+        parts.append(
+            f'<div class="markdown prose" id="markdown-{n}">{body}'
+            '<button class="copy"><svg viewBox="0 0 1 1"><path d="M0"/></svg></button></div>'
+        )
+    return (
+        '<div class="message-received last:mb-[30px]">'
+        + "".join(parts)
+        + '<div role="button" class="feedback">👍</div></div>'
+    )
+
+
+def generate_chat_page(
+    *,
+    blocks: int,
+    markdown_per_block: int = 2,
+    last_block_markdown: Optional[int] = None,
+    odd_only_last: bool = False,
+    table_rows: int = 0,
+    seed: int = 0,
+) -> str:
+    """Qommons-like page with `blocks` question/answer pairs (deterministic per seed)."""
+    rng = random.Random(seed)
+    history: List[str] = []
+    next_n = 1
+    for index in range(blocks):
+        last = index == blocks - 1
+        count = last_block_markdown if last and last_block_markdown else markdown_per_block
+        if last and odd_only_last:
+            # Only odd ids in the last answer (exercises the scope fallback).
+            first = next_n if next_n % 2 else next_n + 1
+            ids = [first + 2 * k for k in range(count)]
+        else:
+            ids = list(range(next_n, next_n + count))
+        history.append(f'<div class="message-sent">質問 {index}</div>')
+        history.append(_answer_block(rng, ids, table_rows if last else 0))
+        next_n = ids[-1] + 1
+
+    return (
+        "<!DOCTYPE html><html><head><title>chat</title>"
+        "<script>window.__state = {\"ok\": true};</script></head><body>"
+        '<nav class="sidebar"><ul>' + "".join(f"<li>chat {i}</li>" for i in range(50)) + "</ul></nav>"
+        '<main id="chat">' + "".join(history) + "</main>"
+        '<form><textarea id="message"></textarea><button id="chat-send-button">送信</button></form>'
+        "</body></html>"
+    )
@@ -0,0 +1,139 @@
+from bs4 import BeautifulSoup
+
+from src.execution import answer_dom_extractor as ade
+
+
+HTML = """
+<html><body>
+<div class="message-sent">質問</div>
+<div class="message-received last:mb-[30px]">
+  <div class="markdown" id="markdown-1"><p>途中</p></div>
+  <div class="markdown" id="markdown-2"><p>回答本文</p><button>copy</button></div>
+</div>
+</body></html>
+"""
+
+
+def test_snapshot_matches_legacy_entry_points():
+    """ParsedSnapshot の結果は extract_answer_dom / collect_dom_candidates と一致する"""
+
+    snapshot = ade.ParsedSnapshot(HTML)
+    result = snapshot.extract("")
+
+    assert result == ade.extract_answer_dom(HTML, "")
+    assert snapshot.candidates() == ade.collect_dom_candidates(HTML)
+    assert result.extracted_status == "VALID"
+    assert result.observation.selected_n == 2
+    assert result.text == result.raw_html
+    assert "button" not in result.text
+    assert result.raw_text == "回答本文"
+
+
+def test_snapshot_parses_and_serializes_once(monkeypatch):
+    """1 snapshot につき全体 parse は 1 回、target の serialize も 1 回"""
+
+    calls = {"serialize": 0}
+    original = ade._serialize_clean_html
+
+    def counting(target, *args):
+        calls["serialize"] += 1
+        return original(target, *args)
+
+    monkeypatch.setattr(ade, "_serialize_clean_html", counting)
+
+    snapshot = ade.ParsedSnapshot(HTML)
+    snapshot.extract("")
+    snapshot.extract("")
+    candidates, errors = snapshot.candidates()
+    candidates.append({})
+    errors.append("caller-side error")
+
+    assert calls["serialize"] == 1
+    assert len(snapshot.candidates()[0]) == 2
+    assert snapshot.candidates()[1] == []
+
+
+def test_tail_only_parse_matches_full_parse_on_long_history():
+    """長い履歴でも末尾の message-received だけを parse し、結果は全体 parse と一致する"""
+
+    history = "".join(
+        f'<div class="message-sent">Q{i}</div>'
+        f'<div class="message-received last:mb-[30px]">'
+        f'<div class="markdown" id="markdown-{i * 2}"><p>A{i}</p></div></div>'
+        for i in range(200)
+    )
+    html = f"<html><body><main>{history}</main></body></html>"
+
+    snapshot = ade.ParsedSnapshot(html, tail_only=True)
+
+    assert snapshot.parse_mode == "tail"
+    assert snapshot.extract("") == ade.extract_answer_dom(html, "")
+    assert snapshot.candidates() == ade.collect_dom_candidates(html)
+    assert snapshot.extract("").raw_text == "A199"
+
+
+def test_tail_only_falls_back_when_boundary_is_ambiguous():
+    """script 内の class 名など、境界が曖昧な場合は全体 parse に戻る"""
+
+    html = HTML.replace(
+        "</body>", "<script>const s = '<div class=\"message-received\">';</script></body>"
+    )
+
+    snapshot = ade.ParsedSnapshot(html, tail_only=True)
+
+    assert snapshot.parse_mode == "full"
+    assert snapshot.extract("") == ade.extract_answer_dom(html, "")
+
+    text_mention = HTML.replace("</body>", "<p>message-received</p></body>")
+    assert ade.ParsedSnapshot(text_mention, tail_only=True).parse_mode == "full"
+
+
+def test_single_walk_serializer_matches_clone_reference_on_edge_cases():
+    """属性の引用符・実体参照・コメント・script・void 要素・ノイズ要素を含む場合も一致する"""
+
+    html = """<div class="markdown x  y" id="markdown-2" data-q='say "hi"' data-a="a&amp;b">
+<p>Tom &amp; Jerry &lt;tag&gt; &nbsp;</p><!-- note --><br><img src="a.png" alt="">
+<table><tr><td> セル1 </td><td>セル<b>2</b></td></tr></table>
+<pre>  keep   spaces  </pre><script>var a = "<b>&amp;</b>";</script>
+<span role="button">x</span><button><svg><path d="M0"/></svg>copy</button>
+<form><textarea>t</textarea></form><nav>n</nav><aside>a</aside>末尾
+<div role="button2">keep</div>
+</div>"""
+    target = BeautifulSoup(html, ade.BS_PARSER).find("div")
+
+    html_out, text_out = ade._serialize_clean_html(target)
+
+    assert (html_out, text_out) == ade._serialize_clean_html_by_clone(target)
+    assert "copy" not in text_out
+    assert "keep" in text_out
+
+
+def test_citations_are_taken_from_the_answer_scope_as_displayed():
+    """回答 scope 内のリンク・出典ファイル名を表示どおりに取得する（補完しない）"""
+
+    html = """<html><body>
+<div class="message-received"><div class="markdown" id="markdown-2"><p>旧回答 <a href="https://old.example/">old</a></p></div></div>
+<div class="message-sent">質問</div>
+<div class="message-received">
+  <div class="markdown" id="markdown-4"><p>本文 k518RG00000099.md
+    <a href="#fn1">1</a> <a href="https://example.jp/reiki">例規集</a></p></div>
+  <ul class="sources">
+    <li title="出典">第3条（k518RG00000064.md）</li>
+    <li><a href="/files/k518RG00000010.pdf" title="条例">k518RG00000010.pdf</a></li>
+    <li>第3条（k518RG00000064.md）</li>
+  </ul>
+  <button>copy.md</button>
+</div>
+</body></html>"""
+
+    citations = ade.extract_citations(html)
+
+    assert [c.to_line() for c in citations] == [
+        "例規集 (https://example.jp/reiki)",
+        "第3条（k518RG00000064.md）",
+        "k518RG00000010.pdf (/files/k518RG00000010.pdf)",
+    ]
+    assert citations[1].title == "出典"
+    assert citations[2].file_name == "k518RG00000010.pdf"
+    assert ade.ParsedSnapshot(html, tail_only=True).citations() == citations
+    assert ade.extract_citations(HTML) == []
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.execution import answer_dom_extractor as ade
+
+
+FIXTURE_ROOT = Path(__file__).resolve().parents[2] / "docs" / "archive" / "debug" / "sandbox"
+FIXTURES = sorted(FIXTURE_ROOT.rglob("*.html"))
+ALT_PARSERS = [p for p in ade.available_parsers() if p != ade.BS_PARSER]
+
+
+@pytest.mark.skipif(not ALT_PARSERS, reason="no optional html parser installed")
+@pytest.mark.parametrize("parser", ALT_PARSERS)
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda p: p.parent.name + "/" + p.name)
+def test_extraction_is_identical_across_parsers(parser, html_path):
+    """記録済み HTML で、backend を変えても ExtractionResult / candidates が一致する"""
+
+    html = html_path.read_text(encoding="utf-8")
+
+    assert ade.extract_answer_dom(html, "", parser=parser) == ade.extract_answer_dom(html, "")
+    assert ade.collect_dom_candidates(html, parser=parser) == ade.collect_dom_candidates(html)
+
+
+def test_resolve_parser():
+    assert ade.resolve_parser(None) == ade.BS_PARSER
+    assert ade.resolve_parser("auto") in ade.available_parsers()
+    with pytest.raises(ValueError):
+        ade.resolve_parser("selectolax")
+
+
+@pytest.mark.parametrize("parser", ade.available_parsers())
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda p: p.parent.name + "/" + p.name)
+def test_tail_only_parse_is_identical_to_full_parse(parser, html_path):
+    """tail-only parse の結果は html.parser の全体 parse と一致する"""
+
+    html = html_path.read_text(encoding="utf-8")
+    snapshot = ade.ParsedSnapshot(html, parser, tail_only=True)
+
+    assert snapshot.extract("") == ade.extract_answer_dom(html, "")
+    assert snapshot.candidates() == ade.collect_dom_candidates(html)
+
+
+@pytest.mark.parametrize("parser", ade.available_parsers())
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda p: p.parent.name + "/" + p.name)
+def test_single_walk_serializer_matches_clone_reference(parser, html_path):
+    """single-walk serializer は clone + noise filter の出力とバイト単位で一致する"""
+
+    soup = BeautifulSoup(html_path.read_text(encoding="utf-8"), parser)
+
+    for element in soup.find_all("div"):
+        assert ade._serialize_clean_html(element) == ade._serialize_clean_html_by_clone(
+            element, parser
+        )
@@ -0,0 +1,65 @@
+import threading
+
+from src.execution import artifact_writer as aw
+
+
+def test_writes_keep_order_per_path_and_flush_is_a_barrier(tmp_path):
+    writer = aw.ArtifactWriter(workers=3, max_pending=4)
+
+    for i in range(50):
+        writer.write_text(tmp_path / f"f{i % 5}.txt", f"v{i}")
+    writer.write_bytes(tmp_path / "sub" / "shot.png", b"\x89PNG")
+
+    assert writer.flush(timeout=5)
+    assert writer.pending == 0
+    assert [(tmp_path / f"f{k}.txt").read_text(encoding="utf-8") for k in range(5)] == [
+        "v45", "v46", "v47", "v48", "v49"
+    ]
+    assert (tmp_path / "sub" / "shot.png").read_bytes() == b"\x89PNG"
+    assert writer.stats["written"] == 51
+
+    writer.close()
+    # After close, writes happen inline.
+    writer.write_text(tmp_path / "late.txt", "late")
+    assert (tmp_path / "late.txt").read_text(encoding="utf-8") == "late"
+
+
+def test_full_queue_applies_backpressure(tmp_path, monkeypatch):
+    """pending が上限に達すると呼び出し側が空きを待つ（待ち時間は stats に記録）"""
+
+    release = threading.Event()
+    original = aw._write_file
+
+    def slow_write(path, data):
+        release.wait(5)
+        original(path, data)
+
+    monkeypatch.setattr(aw, "_write_file", slow_write)
+    writer = aw.ArtifactWriter(workers=1, max_pending=2)
+    writer.write_text(tmp_path / "a.txt", "a")
+    writer.write_text(tmp_path / "b.txt", "b")
+
+    third = threading.Thread(target=writer.write_text, args=(tmp_path / "c.txt", "c"))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()
+    assert not writer.flush(timeout=0.05)
+
+    release.set()
+    third.join(5)
+    assert writer.close(timeout=5)
+    assert writer.stats["backpressure_waits"] == 1
+    assert (tmp_path / "c.txt").read_text(encoding="utf-8") == "c"
+
+
+def test_write_failures_are_recorded_not_raised(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("x", encoding="utf-8")
+
+    with aw.ArtifactWriter(workers=1) as writer:
+        writer.write_text(blocker / "child.txt", "y")
+
+    observation = writer.to_observation()
+    assert observation["failed"] == 1
+    assert "child.txt" in observation["errors"][0]
+    assert observation["pending"] == 0
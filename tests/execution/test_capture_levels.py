@@ -0,0 +1,200 @@
+import importlib
+
+import pytest
+
+from tests.execution.synthetic_chat_page import generate_chat_page
+
+# The package re-exports the function under the module's name.
+rsq = importlib.import_module("src.execution.run_single_question")
+
+
+class _FakePage:
+    url = "https://example.invalid/chat/c1"
+
+    def __init__(self, html):
+        self.html = html
+        self.calls = []
+
+    def wait_for_function(self, expression, *, arg=None, timeout=None):
+        self.calls.append("wait")
+        return True
+
+    def content(self):
+        self.calls.append("content")
+        return self.html
+
+    def screenshot(self, *, full_page, path=None, **options):
+        self.calls.append("screenshot")
+        self.screenshot_options = dict(options, full_page=full_page)
+        if path is None:
+            return b"png"
+        with open(path, "wb") as f:
+            f.write(b"png")
+
+
+class _FakeChatPage:
+    def __init__(self, html):
+        self.page = _FakePage(html)
+
+    def submit(self, message):
+        return {"submit_id": "s1"}
+
+
+def _run(tmp_path, html, level, monkeypatch, probe_error=None):
+    def fake_probe(**kwargs):
+        if probe_error is not None:
+            raise probe_error
+        return "answer"
+
+    monkeypatch.setattr(rsq, "wait_for_answer_text", fake_probe)
+    chat_page = _FakeChatPage(html)
+    result = rsq.run_single_question(
+        chat_page=chat_page,
+        question_text="q",
+        question_id="Q1",
+        ordinance_id="o1",
+        output_dir=tmp_path / "out",
+        profile="p",
+        capture_level=level,
+    )
+    files = sorted(p.name for p in (tmp_path / "out").iterdir())
+    return result, files, chat_page.page.calls
+
+
+def test_capture_levels_select_persisted_artifacts(tmp_path, monkeypatch):
+    """minimal / standard / forensic で保存される成果物が段階的に増える"""
+
+    html = generate_chat_page(blocks=2)
+    raw = ["raw_answer.html", "raw_answer.txt", "raw_capture_meta.json"]
+
+    result, files, calls = _run(tmp_path / "m", html, "minimal", monkeypatch)
+    assert result.extracted_status == "VALID"
+    assert files == raw
+    assert calls == ["wait", "content"]
+    assert result.execution_context["capture"]["level"] == "minimal"
+
+    _, files, _ = _run(tmp_path / "s", html, "standard", monkeypatch)
+    assert files == sorted(raw + ["after_answer_ready.html"])
+
+    _, files, calls = _run(tmp_path / "f", html, "forensic", monkeypatch)
+    assert {"after_submit.html", "after_answer_ready.png", "dom_candidates.json"} <= set(files)
+    assert "verify_extraction_state.txt" in files
+    assert calls == ["wait", "content", "content", "screenshot"]
+
+
+def test_invalid_extraction_escalates_to_forensic(tmp_path, monkeypatch):
+    """INVALID 時は minimal 指定でも ready snapshot / screenshot / candidates を残す"""
+
+    result, files, _ = _run(tmp_path, "<html><body>no answer</body></html>", "minimal", monkeypatch)
+
+    capture = result.execution_context["capture"]
+    assert result.extracted_status == "INVALID"
+    assert capture == {
+        "requested_level": "minimal",
+        "level": "forensic",
+        "escalation_reason": "extracted_status INVALID",
+    }
+    assert {
+        "after_answer_ready.html",
+        "after_answer_ready.png",
+        "dom_candidates.json",
+        "verify_reached_extract.txt",
+        "verify_extraction_state.txt",
+    } <= set(files)
+    # Earlier checkpoints cannot be recovered after the fact.
+    assert "after_submit.html" not in files
+
+
+def test_probe_exception_escalates_before_snapshot(tmp_path, monkeypatch):
+    result, files, calls = _run(
+        tmp_path, generate_chat_page(blocks=1), "minimal", monkeypatch, RuntimeError("boom")
+    )
+
+    assert result.execution_context["capture"]["escalation_reason"] == "probe raised RuntimeError"
+    assert "verify_dom_exception.txt" in files
+    assert calls.count("screenshot") == 1
+
+
+def test_unknown_capture_level_is_rejected(tmp_path, monkeypatch):
+    with pytest.raises(ValueError):
+        _run(tmp_path, "", "verbose", monkeypatch)
+
+
+def test_background_writer_produces_the_same_artifacts(tmp_path, monkeypatch):
+    """artifact_writer 経由でも flush 後の成果物は同期書き込みと一致する"""
+
+    from src.execution.artifact_writer import ArtifactWriter
+
+    html = generate_chat_page(blocks=2)
+    _, sync_files, _ = _run(tmp_path / "sync", html, "forensic", monkeypatch)
+
+    monkeypatch.setattr(rsq, "wait_for_answer_text", lambda **kwargs: "answer")
+    writer = ArtifactWriter(workers=2)
+    rsq.run_single_question(
+        chat_page=_FakeChatPage(html),
+        question_text="q",
+        question_id="Q1",
+        ordinance_id="o1",
+        output_dir=tmp_path / "bg" / "out",
+        profile="p",
+        artifact_writer=writer,
+    )
+    assert writer.close(timeout=5)
+
+    out = tmp_path / "bg" / "out"
+    assert sorted(p.name for p in out.iterdir()) == sync_files
+    assert (out / "raw_answer.html").read_text(encoding="utf-8") == (
+        tmp_path / "sync" / "out" / "raw_answer.html"
+    ).read_text(encoding="utf-8")
+    assert writer.stats["failed"] == 0
+
+
+def test_empty_page_is_serialized_once_per_checkpoint(tmp_path, monkeypatch):
+    """空の DOM でも fallback / finalize で page.content() を繰り返さない"""
+
+    result, _, calls = _run(tmp_path, "", "forensic", monkeypatch)
+
+    assert calls.count("content") == 2  # after_submit + after_answer_ready
+    snapshots = result.execution_context["page_snapshots"]
+    assert snapshots["reuses"] >= 2
+    assert set(snapshots["checkpoints"]) == {"after_submit", "after_answer_ready"}
+
+
+def test_screenshot_only_on_failure_skips_valid_answers(tmp_path, monkeypatch):
+    from src.execution.screenshot_capture import ScreenshotOptions
+
+    monkeypatch.setattr(rsq, "wait_for_answer_text", lambda **kwargs: "answer")
+    options = ScreenshotOptions(image_format="jpeg", quality=50, only_on_failure=True)
+    chat_page = _FakeChatPage(generate_chat_page(blocks=1))
+
+    result = rsq.run_single_question(
+        chat_page=chat_page,
+        question_text="q",
+        question_id="Q1",
+        ordinance_id="o1",
+        output_dir=tmp_path / "out",
+        profile="p",
+        screenshot=options,
+    )
+
+    assert "screenshot" not in chat_page.page.calls
+    assert result.execution_context["screenshot"]["skipped"] is True
+
+    failed = _FakeChatPage("<html><body></body></html>")
+    result = rsq.run_single_question(
+        chat_page=failed,
+        question_text="q",
+        question_id="Q2",
+        ordinance_id="o1",
+        output_dir=tmp_path / "out2",
+        profile="p",
+        screenshot=options,
+    )
+    assert (tmp_path / "out2" / "after_answer_ready.jpg").is_file()
+    assert failed.page.screenshot_options == {
+        "type": "jpeg",
+        "quality": 50,
+        "scale": "device",
+        "full_page": True,
+    }
+    assert result.execution_context["screenshot"]["bytes"] == 3
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.execution import answer_dom_extractor as ade
+from src.execution.dom_scope_capture import capture_answer_scope
+
+
+FIXTURE_ROOT = Path(__file__).resolve().parents[2] / "docs" / "archive" / "debug" / "sandbox"
+FIXTURES = [
+    p
+    for p in sorted(FIXTURE_ROOT.rglob("*.html"))
+    if "message-received" in p.read_text(encoding="utf-8")
+]
+
+
+class _FakePage:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def evaluate(self, script):
+        return self.payload
+
+
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda p: p.parent.name + "/" + p.name)
+def test_scope_fragment_extracts_like_full_page(html_path):
+    """最後の message-received だけを渡しても抽出結果は全ページと一致する"""
+
+    html = html_path.read_text(encoding="utf-8")
+    scope = BeautifulSoup(html, ade.BS_PARSER).select(".message-received")[-1]
+    fragment = str(scope)
+
+    assert ade.extract_answer_dom(fragment, "") == ade.extract_answer_dom(html, "")
+    assert ade.collect_dom_candidates(fragment) == ade.collect_dom_candidates(html)
+
+
+def test_capture_answer_scope_maps_payload():
+    capture = capture_answer_scope(
+        _FakePage(
+            {
+                "found": True,
+                "message_received_count": 3,
+                "html": '<div class="message-received"></div>',
+                "markdown": [{"id": "markdown-2", "text_len": 10}],
+            }
+        )
+    )
+
+    assert capture.found
+    assert capture.to_observation()["markdown_ids"] == ["markdown-2"]
+    assert capture.to_observation()["message_received_count"] == 3
+
+    assert not capture_answer_scope(_FakePage(None)).found
@@ -0,0 +1,93 @@
+from src.execution import answer_dom_extractor as ade
+from src.execution import extraction_cache as ec
+from tests.execution.synthetic_chat_page import generate_chat_page
+
+
+def test_memory_and_disk_tiers_return_identical_results(tmp_path):
+    """同一 HTML は 2 回目以降 memory / disk から同じ結果を返す"""
+
+    html = generate_chat_page(blocks=5)
+    expected = ade.extract_answer_dom(html, "")
+
+    cache = ec.ExtractionCache(tmp_path)
+    first = cache.extract(html)
+    second = cache.extract(html)
+
+    assert first.cache_hit is None
+    assert second.cache_hit == "memory"
+    assert second.result == expected
+    assert (second.candidates, second.candidate_errors) == ade.collect_dom_candidates(html)
+
+    fresh = ec.ExtractionCache(tmp_path)
+    third = fresh.extract(html)
+    assert third.cache_hit == "disk"
+    assert third.result == expected
+    assert fresh.stats["disk_hits"] == 1
+
+
+def test_key_includes_version_and_parser(monkeypatch):
+    html = generate_chat_page(blocks=1)
+    key = ec.extraction_cache_key(html)
+
+    assert key.startswith(f"{ade.EXTRACTOR_VERSION}-html.parser-")
+    monkeypatch.setattr(ec, "EXTRACTOR_VERSION", "next")
+    assert ec.extraction_cache_key(html) != key
+
+
+def test_memory_tier_is_evicted_by_size():
+    """memory tier は payload bytes の上限で古いものから追い出される"""
+
+    pages = [generate_chat_page(blocks=2, seed=seed) for seed in range(3)]
+    probe = ec.ExtractionCache()
+    probe.extract(pages[0])
+    one_entry = probe.memory_bytes
+
+    cache = ec.ExtractionCache(max_memory_bytes=int(one_entry * 2.5))
+    for html in pages:
+        cache.extract(html)
+
+    assert cache.stats["evictions"] == 1
+    assert cache.memory_bytes <= cache.max_memory_bytes
+    assert cache.extract(pages[0]).cache_hit is None
+    assert cache.extract(pages[2]).cache_hit == "memory"
+
+
+def test_tail_and_full_parses_do_not_share_entries(tmp_path):
+    html = generate_chat_page(blocks=2)
+    cache = ec.ExtractionCache(tmp_path)
+
+    tail = cache.extract(html, tail_only=True)
+    full = cache.extract(html, tail_only=False)
+
+    assert ec.extraction_cache_key(html, tail_only=True) != ec.extraction_cache_key(
+        html, tail_only=False
+    )
+    assert (tail.cache_hit, full.cache_hit) == (None, None)
+    assert full.parse_mode != tail.parse_mode
+
+
+def test_disk_tier_is_pruned_least_recently_used_first(tmp_path):
+    """disk tier は上限を超えると最終利用の古いファイルから削除される"""
+
+    import os
+
+    pages = [generate_chat_page(blocks=2, seed=seed) for seed in range(4)]
+    probe = ec.ExtractionCache(tmp_path / "probe")
+    probe.extract(pages[0])
+    one_file = sum(p.stat().st_size for p in (tmp_path / "probe").glob("*/*.json"))
+
+    cache_dir = tmp_path / "cache"
+    cache = ec.ExtractionCache(cache_dir, max_disk_bytes=int(one_file * 3.5))
+    for i, html in enumerate(pages[:3]):
+        cache.extract(html)
+        path = cache._disk_path(ec.extraction_cache_key(html))
+        os.utime(path, (1000 + i, 1000 + i))
+    # A disk hit refreshes pages[0], so pages[1] becomes the oldest.
+    ec.ExtractionCache(cache_dir).extract(pages[0])
+    cache.extract(pages[3])
+
+    remaining = {p.stem for p in cache_dir.glob("*/*.json")}
+    assert ec.extraction_cache_key(pages[1]) not in remaining
+    assert ec.extraction_cache_key(pages[0]) in remaining
+    assert cache.stats["disk_evictions"] >= 1
+    assert sum(p.stat().st_size for p in cache_dir.glob("*/*.json")) <= one_file * 3.5
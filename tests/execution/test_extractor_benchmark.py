@@ -0,0 +1,41 @@
+from src.execution import answer_dom_extractor as ade
+from tests.execution.extractor_bench_baseline import compare_with_baseline
+from tests.execution.synthetic_chat_page import generate_chat_page
+
+
+def test_synthetic_pages_exercise_selection_rules():
+    """合成ページで latest-even 選択と scope fallback が再現される"""
+
+    history = ade.extract_answer_dom(generate_chat_page(blocks=30), "")
+    assert history.extracted_status == "VALID"
+    assert history.observation.selected_n == 60
+    assert "<button" not in history.text
+
+    odd_only = ade.extract_answer_dom(
+        generate_chat_page(blocks=3, odd_only_last=True, last_block_markdown=3), ""
+    )
+    assert odd_only.observation.selected_n is None
+    assert odd_only.observation.parity == "fallback-to-scope"
+
+    assert generate_chat_page(blocks=5, seed=1) == generate_chat_page(blocks=5, seed=1)
+
+
+def test_compare_with_baseline_ignores_noise_and_flags_regressions():
+    baseline = {
+        "cases": {
+            "c": {"extracted_status": "VALID", "selected_n": 2, "extract_sec": 0.1, "serialize_sec": 0.0001}
+        }
+    }
+    current = {
+        "cases": {
+            "c": {"extracted_status": "VALID", "selected_n": 2, "extract_sec": 0.3, "serialize_sec": 0.0004}
+        }
+    }
+
+    regressions = compare_with_baseline(current, baseline, tolerance=0.5)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("c.extract_sec")
+
+    current["cases"]["c"]["selected_n"] = 4
+    assert any("selected_n" in r for r in compare_with_baseline(current, baseline, tolerance=0.5))
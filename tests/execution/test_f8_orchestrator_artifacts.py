@@ -0,0 +1,99 @@
+import importlib
+
+import pytest
+
+from src.execution.f8_orchestrator import (
+    ExecutionProfile,
+    OrdinanceSpec,
+    QuestionSpec,
+    run_f8_collection,
+)
+from src.execution.run_single_question import RawCapture, SingleQuestionResult
+
+orchestrator = importlib.import_module("src.execution.f8_orchestrator")
+
+
+def _run(tmp_path, **kwargs):
+    return run_f8_collection(
+        chat_page=object(),
+        ordinances=[OrdinanceSpec("k518RG00000022", "条例")],
+        questions=[QuestionSpec("Q1", "質問")],
+        execution_profile=ExecutionProfile("internet"),
+        run_id="run-1",
+        qommons_config={"model": "m", "web_search": False, "region": "r", "ui_mode": "u"},
+        knowledge_scope="file",
+        knowledge_files=[],
+        ordinance_set="set1",
+        output_root=tmp_path / "run",
+        execution={"retry": 0, "temperature": 0, "max_tokens": 0},
+        **kwargs,
+    )
+
+
+def _fake_question(**kwargs):
+    output_dir = kwargs["output_dir"]
+    writer = kwargs["artifact_writer"]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # raw_answer.html cannot be created (a directory is in the way).
+    html_path = output_dir / "raw_answer.html"
+    html_path.mkdir()
+    writer.write_text(html_path, "<p>回答</p>")
+    raw = RawCapture(
+        raw_html="<p>回答</p>",
+        raw_text="回答",
+        html_path=html_path,
+        text_path=output_dir / "raw_answer.txt",
+        meta_path=output_dir / "raw_capture_meta.json",
+        anchor_dom_selector=None,
+        selection_reason="test",
+        extracted_status="VALID",
+    )
+    return SingleQuestionResult(
+        question_id="Q1",
+        ordinance_id="k518RG00000022",
+        question_text="質問",
+        profile="internet",
+        output_dir=output_dir,
+        submit_id="s-1",
+        chat_id="c-1",
+        answer_text="回答",
+        extracted_status="VALID",
+        raw_capture=raw,
+        raw_capture_attempted=True,
+        anchor_dom_selector=None,
+        execution_context={},
+    )
+
+
+def test_deferred_write_failure_is_reported_in_answer_md(tmp_path, monkeypatch):
+    """非同期書き込みの失敗は当該質問の answer.md に raw capture unavailable として残る"""
+
+    monkeypatch.setattr(orchestrator, "run_single_question", _fake_question)
+
+    summary = _run(tmp_path, artifact_workers=2)
+
+    answer_md = next((tmp_path / "run" / "answer").rglob("Q1_answer.md"))
+    text = answer_md.read_text(encoding="utf-8")
+    assert "result_reason: raw capture unavailable" in text
+    assert "artifact_write_errors" in text
+    assert summary.artifact_writer["failed"] == 1
+
+
+def test_writer_is_closed_when_the_run_raises(tmp_path, monkeypatch):
+    writers = []
+
+    class _Writer(orchestrator.ArtifactWriter):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            writers.append(self)
+
+    def _explode(**kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(orchestrator, "ArtifactWriter", _Writer)
+    monkeypatch.setattr(orchestrator, "run_single_question", _explode)
+
+    with pytest.raises(KeyboardInterrupt):
+        _run(tmp_path, artifact_workers=1)
+
+    assert writers and writers[0]._closed
@@ -0,0 +1,62 @@
+from src.execution.latency_timeline import LatencyTimeline, build_latency_report
+
+
+def test_timeline_joins_probe_monotonic_marks():
+    """probe summary の monotonic 値が timeline の stage に反映される"""
+
+    timeline = LatencyTimeline()
+    timeline.mark("submit_start", at=100.0)
+    timeline.mark("submit_ack", at=100.5)
+    timeline.merge_probe_summary(
+        {
+            "completion_reason": "graphql_and_rest_get",
+            "monotonic": {
+                "started": 101.0,
+                "first_rest_post": None,
+                "first_graphql": 105.0,
+                "last_rest_get": 106.0,
+                "ws_completed": None,
+                "finished": 106.25,
+            }
+        }
+    )
+    timeline.mark("snapshot_done", at=107.0)
+    timeline.mark("extraction_done", at=107.5)
+    timeline.mark("persist_done", at=108.0)
+
+    data = timeline.to_dict()
+    stages = data["stages_sec"]
+
+    assert data["completion_reason"] == "graphql_and_rest_get"
+    assert stages["probe_evidence"] == 5.0
+
+    assert stages["submit"] == 0.5
+    assert stages["submit_to_rest_post"] is None
+    assert stages["service_to_create_data"] == 5.0
+    assert stages["create_data_to_last_get"] == 1.0
+    assert stages["probe_tail"] == 0.25
+    assert stages["snapshot"] == 0.75
+    assert stages["total"] == 8.0
+
+
+def test_latency_report_percentiles_per_stage():
+    """stage ごとに p50 / p95 / p99 が集計される"""
+
+    entries = []
+    for i in range(1, 101):
+        timeline = LatencyTimeline()
+        timeline.mark("submit_start", at=0.0)
+        timeline.mark("submit_ack", at=float(i))
+        entries.append({"question_id": f"Q{i}", "timeline": timeline.to_dict()})
+
+    report = build_latency_report(entries)
+
+    submit = report["stages"]["submit"]
+    assert report["question_count"] == 100
+    assert submit["count"] == 100
+    assert submit["p50"] == 50.5
+    assert submit["p95"] == 95.05
+    assert submit["p99"] == 99.01
+    assert submit["max"] == 100.0
+    assert report["stages"]["extraction"]["count"] == 0
+    assert report["stages"]["extraction"]["p50"] is None
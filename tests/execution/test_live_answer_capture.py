@@ -0,0 +1,74 @@
+from src.execution.live_answer_capture import (
+    BINDING_NAME,
+    LiveAnswerCapture,
+    LiveAnswerStream,
+)
+
+
+class _FakePage:
+    """expose_binding / evaluate だけを持つ Page 代替。flush 時に最終 update を返す。"""
+
+    def __init__(self, final_payload):
+        self.final_payload = final_payload
+        self.bindings = {}
+        self.scripts = []
+
+    def expose_binding(self, name, callback):
+        self.bindings[name] = callback
+
+    def evaluate(self, script, arg=None):
+        self.scripts.append(script)
+        if "flush()" in script:
+            self.bindings[BINDING_NAME](None, self.final_payload)
+        return True
+
+
+def test_stream_metrics_time_to_first_token_and_rate():
+    """first token までの時間と文字数レートを update 列から算出する"""
+
+    stream = LiveAnswerStream(armed_mono=100.0)
+    stream.add({"seq": 1, "html": "<div></div>", "text_len": 0}, 100.5)
+    stream.add({"seq": 2, "html": "<div>a</div>", "text_len": 10}, 101.0)
+    stream.add({"seq": 3, "html": "<div>ab</div>", "text_len": 50}, 103.0)
+    stream.add({"seq": 4, "html": "<div>ab</div>", "text_len": 50, "final": True}, 104.0)
+
+    metrics = stream.metrics()
+
+    assert metrics["time_to_first_token_sec"] == 1.0
+    assert metrics["streaming_sec"] == 2.0
+    assert metrics["text_chars_per_sec"] == 25.0
+    assert metrics["update_count"] == 4
+    assert metrics["final_received"] is True
+    assert stream.latest_html == "<div>ab</div>"
+
+
+def test_capture_binds_once_and_flush_delivers_final_update():
+    page = _FakePage(
+        {"seq": 1, "html": "<div>x</div>", "text_len": 1, "markdown_ids": ["markdown-2"], "final": True}
+    )
+    capture = LiveAnswerCapture(page)
+
+    capture.arm()
+    capture.disarm()
+    stream = capture.arm()
+    flushed = capture.flush()
+
+    assert list(page.bindings) == [BINDING_NAME]
+    assert flushed is stream
+    assert stream.final_received
+    assert stream.markdown_ids == ["markdown-2"]
+
+
+def test_capture_registry_does_not_keep_pages_alive():
+    import gc
+
+    from src.execution.live_answer_capture import _CAPTURES, get_live_answer_capture
+
+    page = _FakePage({})
+    get_live_answer_capture(page)
+    assert page in _CAPTURES
+
+    del page
+    gc.collect()
+
+    assert len(_CAPTURES) == 0
@@ -0,0 +1,48 @@
+import pytest
+
+from src.execution.page_snapshots import PageSnapshotManager
+
+
+class _FakePage:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def content(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_checkpoint_is_serialized_once_until_invalidated():
+    """同一 checkpoint の page.content() は 1 回だけ（invalidate で再取得）"""
+
+    page = _FakePage(["<html>あ</html>", "<html>b</html>", "<html>c</html>"])
+    snapshots = PageSnapshotManager(page)
+
+    assert snapshots.get("after_answer_ready") == "<html>あ</html>"
+    assert snapshots.get("after_answer_ready") == "<html>あ</html>"
+    assert snapshots.get("after_submit") == "<html>b</html>"
+    assert page.calls == 2
+
+    observation = snapshots.to_observation()
+    assert observation["reuses"] == 1
+    assert observation["bytes_saved"] == len("<html>あ</html>".encode("utf-8"))
+    assert observation["checkpoints"]["after_answer_ready"]["captures"] == 1
+
+    snapshots.invalidate("after_answer_ready")
+    assert snapshots.get("after_answer_ready") == "<html>c</html>"
+    assert snapshots.to_observation()["checkpoints"]["after_answer_ready"]["captures"] == 2
+
+
+def test_failed_capture_is_not_cached():
+    page = _FakePage([RuntimeError("context destroyed"), "<html></html>"])
+    snapshots = PageSnapshotManager(page)
+
+    with pytest.raises(RuntimeError):
+        snapshots.get("after_answer_ready")
+    assert snapshots.peek("after_answer_ready") is None
+    assert snapshots.get("after_answer_ready") == "<html></html>"
+    assert snapshots.to_observation()["failures"] == 1
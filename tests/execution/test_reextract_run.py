@@ -0,0 +1,76 @@
+import json
+
+from scripts.reextract_run import reextract_run
+from tests.execution.synthetic_chat_page import generate_chat_page
+
+
+def _write_question(run_root, question_id, html):
+    question_dir = run_root / "answer" / "k518RG00000022" / question_id
+    question_dir.mkdir(parents=True)
+    (question_dir / "after_answer_ready.html").write_text(html, encoding="utf-8")
+    return question_dir
+
+
+def test_reextract_run_writes_refreshed_files_and_diffs(tmp_path):
+    """run 配下の全 snapshot を再抽出し、保存済み meta との差分を報告する"""
+
+    run_root = tmp_path / "run"
+    q1 = _write_question(run_root, "Q1", generate_chat_page(blocks=3))
+    _write_question(run_root, "Q2", generate_chat_page(blocks=2, seed=2))
+
+    first = reextract_run(run_root, in_place=True, workers=1)
+
+    assert first["counts"] == {"new": 2}
+    meta = json.loads((q1 / "raw_capture_meta.json").read_text(encoding="utf-8"))
+    assert meta["extracted_status"] == "VALID"
+    assert meta["parse_mode"] == "tail"
+    assert (q1 / "dom_candidates.json").is_file()
+
+    # Simulate an older extractor result for Q1.
+    meta["anchor_dom_selector"] = "div.markdown#markdown-4"
+    (q1 / "raw_capture_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    out_root = tmp_path / "reextract"
+    second = reextract_run(run_root, output_root=out_root, workers=1)
+
+    assert second["counts"] == {"changed": 1, "unchanged": 1}
+    changed = next(r for r in second["results"] if r["status"] == "changed")
+    assert set(changed["diffs"]) == {"anchor_dom_selector"}
+    assert (out_root / "answer" / "k518RG00000022" / "Q2" / "raw_answer.html").is_file()
+
+
+def test_reextract_keeps_provenance_and_recorded_snapshot(tmp_path):
+    """in-place 再抽出でも submit_id / chat_id / captured_at と抽出元 snapshot を保つ"""
+
+    run_root = tmp_path / "run"
+    question_dir = run_root / "answer" / "k518RG00000022" / "Q1"
+    question_dir.mkdir(parents=True)
+    (question_dir / "after_answer_ready_scope.html").write_text(
+        generate_chat_page(blocks=2), encoding="utf-8"
+    )
+    # _live is preferred by name but was not the extraction source.
+    (question_dir / "after_answer_ready_live.html").write_text(
+        generate_chat_page(blocks=2, seed=7), encoding="utf-8"
+    )
+    (question_dir / "dom_candidates.json").write_text(
+        json.dumps({"submit_id": "s-1", "chat_id": "c-1", "checkpoint": "after_answer_ready"}),
+        encoding="utf-8",
+    )
+    (question_dir / "raw_capture_meta.json").write_text(
+        json.dumps(
+            {"captured_at": "2026-01-01T00:00:00+00:00", "snapshot": "after_answer_ready_scope.html"}
+        ),
+        encoding="utf-8",
+    )
+
+    report = reextract_run(run_root, in_place=True, workers=1)
+
+    assert report["results"][0]["snapshot"] == "after_answer_ready_scope.html"
+    candidates = json.loads((question_dir / "dom_candidates.json").read_text(encoding="utf-8"))
+    assert (candidates["submit_id"], candidates["chat_id"]) == ("s-1", "c-1")
+    assert candidates["source"] == "reextract_run"
+    assert candidates["extractor_version"]
+    meta = json.loads((question_dir / "raw_capture_meta.json").read_text(encoding="utf-8"))
+    assert meta["captured_at"] == "2026-01-01T00:00:00+00:00"
+    assert meta["source"] == "reextract_run"
+    assert meta["snapshot"] == "after_answer_ready_scope.html"
@@ -0,0 +1,117 @@
+import pytest
+
+from src.execution import screenshot_capture as sc
+
+
+class _FakeLocator:
+    def __init__(self, page, chain):
+        self.page = page
+        self.chain = chain
+
+    @property
+    def last(self):
+        return _FakeLocator(self.page, self.chain + ["last"])
+
+    @property
+    def first(self):
+        return _FakeLocator(self.page, self.chain + ["first"])
+
+    def locator(self, selector):
+        return _FakeLocator(self.page, self.chain + [selector])
+
+    def count(self):
+        return 0 if self.page.missing else 1
+
+    def screenshot(self, **options):
+        if self.page.element_error:
+            raise TimeoutError("element not visible")
+        self.page.shots.append(("element", self.chain, options))
+        return b"e" * 10
+
+
+class _FakePage:
+    def __init__(self, element_error=False, missing=False):
+        self.element_error = element_error
+        self.missing = missing
+        self.shots = []
+
+    def locator(self, selector):
+        return _FakeLocator(self, [selector])
+
+    def screenshot(self, **options):
+        self.shots.append(("page", None, options))
+        return b"p" * 100
+
+
+def test_answer_scope_clips_to_anchor_with_jpeg_quality():
+    """anchor_dom_selector の要素だけを JPEG(quality) / css scale で撮る"""
+
+    page = _FakePage()
+    options = sc.ScreenshotOptions(scope="answer", image_format="jpeg", quality=60, scale="css")
+
+    data, observation = sc.take_screenshot(
+        page, options, anchor_dom_selector="div.markdown#markdown-4"
+    )
+
+    assert data == b"e" * 10
+    assert page.shots == [
+        (
+            "element",
+            [".message-received", "last", "div.markdown#markdown-4", "first"],
+            {"type": "jpeg", "quality": 60, "scale": "css", "timeout": 2000},
+        )
+    ]
+    assert observation["mode"] == "answer/jpeg-q60/css"
+    assert observation["bytes"] == 10
+    assert options.suffix == ".jpg"
+
+
+def test_answer_scope_falls_back_to_full_page():
+    page = _FakePage(element_error=True)
+
+    data, observation = sc.take_screenshot(
+        page, sc.ScreenshotOptions(scope="answer"), anchor_dom_selector=sc.SCOPE_ANCHOR
+    )
+
+    assert data == b"p" * 100
+    assert page.shots[0][2] == {"full_page": True, "type": "png", "scale": "device"}
+    assert observation["fallback"].startswith("full_page")
+
+
+def test_missing_answer_element_falls_back_without_waiting():
+    """回答要素がなければ要素撮影を試みず（タイムアウト待ちなし）全体を撮る"""
+
+    page = _FakePage(missing=True)
+
+    data, observation = sc.take_screenshot(
+        page, sc.ScreenshotOptions(scope="answer"), anchor_dom_selector="div.markdown#markdown-9"
+    )
+
+    assert data == b"p" * 100
+    assert [shot[0] for shot in page.shots] == ["page"]
+    assert observation["fallback"] == "full_page (answer element not found)"
+
+
+def test_options_are_validated():
+    with pytest.raises(ValueError):
+        sc.ScreenshotOptions(image_format="gif")
+    with pytest.raises(ValueError):
+        sc.ScreenshotOptions(quality=50)  # png has no quality
+    with pytest.raises(ValueError):
+        sc.ScreenshotOptions.from_mapping({"scope": "answer", "dpi": 2})
+    assert sc.ScreenshotOptions.from_mapping(None) == sc.DEFAULT_SCREENSHOT_OPTIONS
+
+
+def test_summary_reports_time_and_bytes_per_mode():
+    summary = sc.summarize_screenshots(
+        [
+            {"mode": "full_page/png/device", "bytes": 300, "capture_sec": 0.3},
+            {"mode": "full_page/png/device", "bytes": 100, "capture_sec": 0.1},
+            {"mode": "answer/jpeg-q60/css", "bytes": 20, "capture_sec": 0.05},
+            {"mode": "answer/jpeg-q60/css", "skipped": True},
+        ]
+    )
+
+    assert summary["full_page/png/device"]["mean_bytes"] == 200
+    assert summary["full_page/png/device"]["mean_capture_sec"] == 0.2
+    assert summary["answer/jpeg-q60/css"]["count"] == 1
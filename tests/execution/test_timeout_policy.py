@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from src.execution.timeout_policy import LatencyTimeoutPolicy, load_timeout_policy
+
+
+def _entry(question_id, latency, profile="internet", reason="graphql_and_rest_get"):
+    return {
+        "question_id": question_id,
+        "profile": profile,
+        "timeline": {
+            "completion_reason": reason,
+            "stages_sec": {"probe_evidence": latency, "probe_wait": latency + 2.0},
+        },
+    }
+
+
+def test_timeout_uses_question_quantile_plus_margin():
+    """質問ごとの履歴が十分あれば quantile + margin を上限とする"""
+
+    policy = LatencyTimeoutPolicy(quantile=95, margin_sec=5, min_samples=3)
+    policy.add_report({"questions": [_entry("Q18", v) for v in (8.0, 9.0, 10.0)]})
+
+    assert policy.timeout_for(
+        profile="internet", question_id="Q18", default_timeout_sec=60
+    ) == 15
+
+
+def test_timeout_falls_back_to_profile_then_default():
+    """質問の履歴が不足すれば profile 全体、なければ既定値を使う"""
+
+    policy = LatencyTimeoutPolicy(
+        quantile=50, margin_sec=0, min_timeout_sec=1, max_timeout_sec=100, min_samples=2
+    )
+    policy.add_report(
+        {"questions": [_entry("Q17", 40.0), _entry("Q01", 20.0), _entry("Q02", 30.0)]}
+    )
+
+    assert policy.timeout_for(
+        profile="internet", question_id="Q17", default_timeout_sec=60
+    ) == 30
+    assert policy.timeout_for(
+        profile="lgwan", question_id="Q17", default_timeout_sec=60
+    ) == 60
+
+
+def test_timeout_is_clamped_and_history_loaded_from_tree(tmp_path):
+    """履歴ツリーの latency_report.json を読み込み、上限でクランプする"""
+
+    run_dir = tmp_path / "run_1"
+    run_dir.mkdir()
+    report = {"questions": [_entry("Q17", v) for v in (170.0, 175.0, 178.0)]}
+    (run_dir / "latency_report.json").write_text(json.dumps(report), encoding="utf-8")
+
+    policy = load_timeout_policy(tmp_path, max_timeout_sec=120)
+
+    assert policy.timeout_for(
+        profile="internet", question_id="Q17", default_timeout_sec=60
+    ) == 120
+
+
+def test_censored_samples_do_not_raise_timeout():
+    """窓切れ・タイムアウトの記録は学習せず、run を重ねても上限が上がらない"""
+
+    policy = LatencyTimeoutPolicy(quantile=95, margin_sec=5, min_samples=3)
+    policy.add_report({"questions": [_entry("Q18", v) for v in (8.0, 9.0, 10.0)]})
+    learned = policy.timeout_for(profile="internet", question_id="Q18", default_timeout_sec=60)
+
+    for _ in range(5):
+        added = policy.add_report(
+            {
+                "questions": [
+                    _entry("Q18", learned, reason="capture_window_elapsed"),
+                    _entry("Q18", learned, reason="probe_exception: AnswerTimeoutError"),
+                ]
+            }
+        )
+        assert added == 0
+
+    assert policy.timeout_for(
+        profile="internet", question_id="Q18", default_timeout_sec=60
+    ) == learned == 15
+
+
+def test_min_samples_below_one_is_rejected(tmp_path):
+    """min_samples=0 は未知の質問で空の履歴から percentile を求めてしまうため拒否する"""
+
+    with pytest.raises(ValueError):
+        LatencyTimeoutPolicy(min_samples=0)
+    with pytest.raises(ValueError):
+        load_timeout_policy(tmp_path, min_samples=0)
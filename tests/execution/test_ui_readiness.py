@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from src.execution import ui_readiness as ur
+
+ARCHIVED_ANSWER_READY_HTML = (
+    Path(__file__).resolve().parents[2]
+    / "docs/archive/debug/sandbox/api_check_20251211_022904/ai_received_1765387752884.html"
+)
+
+
+class _FakePage:
+    def __init__(self, outcome=True, state=None):
+        self.outcome = outcome
+        self.state = state or {}
+        self.waits = []
+
+    def wait_for_function(self, expression, *, arg=None, timeout=None):
+        self.waits.append((arg, timeout))
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def evaluate(self, script, arg=None):
+        return self.state
+
+
+@pytest.fixture
+def live_page(request, browser_type):
+    """実ブラウザの Page（chromium 未インストール環境では skip）"""
+
+    if not Path(browser_type.executable_path).exists():
+        pytest.skip("browser is not installed (python -m playwright install chromium)")
+    return request.getfixturevalue("page")
+
+
+def test_ready_ui_returns_without_reading_state():
+    page = _FakePage()
+
+    readiness = ur.wait_for_ui_ready(page, timeout_ms=1200)
+
+    assert readiness.ready
+    assert readiness.reason == "ready"
+    assert page.waits == [(ur.READINESS_SELECTORS, 1200)]
+    assert readiness.state == {}
+
+
+def test_timeout_is_recorded_with_the_blocking_conditions():
+    """上限に達しても例外にせず、未充足の条件を記録して投入を続行する"""
+
+    state = {"input_enabled": True, "assistant_pending": False, "send_idle": False}
+    readiness = ur.wait_for_ui_ready(
+        _FakePage(PlaywrightTimeoutError("Timeout 5000ms exceeded."), state),
+        timeout_ms=5000,
+    )
+
+    assert not readiness.ready
+    assert readiness.reason == "timeout"
+    assert readiness.to_observation()["state"] == state
+
+
+def test_zero_ceiling_skips_the_check():
+    page = _FakePage()
+
+    readiness = ur.wait_for_ui_ready(page, timeout_ms=0)
+
+    assert readiness.reason == "skipped"
+    assert page.waits == []
+
+
+def test_ready_js_gates_on_the_readiness_state_js():
+    """wait_for_function の判定式は READINESS_STATE_JS をそのまま評価する"""
+
+    assert ur.READINESS_STATE_JS.strip() in ur.READY_JS
+    assert "s.input_enabled && !s.assistant_pending && s.send_idle" in ur.READY_JS
+    assert "send_idle: !!send && (sendEnabled || inputEmpty)" in ur.READINESS_STATE_JS
+
+
+def test_archived_answer_ready_dom_is_ready(live_page):
+    """回答完了直後（入力欄が空で送信ボタン disabled）の保存 DOM は ready と判定される"""
+
+    html = ARCHIVED_ANSWER_READY_HTML.read_text(encoding="utf-8")
+    assert '<button id="chat-send-button" type="submit" disabled="">' in html
+    live_page.set_content(html)
+
+    state = live_page.evaluate(ur.READINESS_STATE_JS, ur.READINESS_SELECTORS)
+
+    assert state == {"input_enabled": True, "assistant_pending": False, "send_idle": True}
+    assert ur.wait_for_ui_ready(live_page, timeout_ms=1000).ready
+
+
+def test_disabled_send_with_pending_input_is_not_idle(live_page):
+    live_page.set_content(
+        '<div class="message-sent">q</div><div class="message-received">a</div>'
+        '<textarea id="message">next question</textarea>'
+        '<button id="chat-send-button" disabled=""></button>'
+    )
+
+    state = live_page.evaluate(ur.READINESS_STATE_JS, ur.READINESS_SELECTORS)
+
+    assert state["send_idle"] is False
+
+
+def test_pending_assistant_message_times_out_with_its_state(live_page):
+    """回答待ち（最後の送信に応答がない）は上限まで待って timeout を記録する"""
+
+    live_page.set_content(
+        '<div class="message-sent">q1</div><div class="message-received">a1</div>'
+        '<div class="message-sent">q2</div>'
+        '<textarea id="message"></textarea><button id="chat-send-button"></button>'
+    )
+
+    readiness = ur.wait_for_ui_ready(live_page, timeout_ms=300)
+
+    assert not readiness.ready
+    assert readiness.reason == "timeout"
+    assert readiness.state["assistant_pending"] is True
@@ -0,0 +1,21 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture
+def run_async():
+    """
+    coroutine を別スレッドの新しいイベントループで実行する。
+
+    pytest-playwright の sync fixture はセッション中メインスレッドで
+    イベントループを動かし続けるため、asyncio.run() / pytest-asyncio は
+    全体実行時に "cannot be called from a running event loop" で失敗する。
+    """
+
+    def _run(coro):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+    return _run
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from scripts.probe_dom_stability import _write_summary
+from src.answer_probe import (
+    AnswerNotAvailableError,
+    AnswerTimeoutError,
+    _answer_from_summary,
+    wait_for_answer_text,
+)
+
+
+def test_stable_result_maps_to_dom_answer(tmp_path):
+    summary = _write_summary(
+        {
+            "status": "stable",
+            "quiet_for_ms": 1500,
+            "last_change_epoch_ms": 1_700_000_000_000,
+            "detected_epoch_ms": 1_700_000_001_500,
+            "mutation_count": 12,
+            "has_answer_container": True,
+            "markdown_ids": ["markdown-2"],
+            "text": "回答本文",
+        },
+        chat_id="chat-1",
+        output_dir=tmp_path,
+        quiet_ms=1500,
+        started_mono=0.0,
+    )
+
+    assert summary["completion_reason"] == "dom_stable"
+    assert summary["monotonic"]["dom_stable"] < summary["monotonic"]["finished"]
+    assert json.loads((tmp_path / "summary.json").read_text(encoding="utf-8"))[
+        "dom_answer"
+    ] == "回答本文"
+    assert _answer_from_summary(summary) == "回答本文"
+
+
+def test_timeout_result_maps_to_fact_based_exceptions(tmp_path):
+    with_container = _write_summary(
+        {"status": "timeout", "has_answer_container": True, "text": "途中"},
+        chat_id="chat-1",
+        output_dir=tmp_path,
+        quiet_ms=1500,
+        started_mono=0.0,
+    )
+    assert with_container["dom_answer"] is None
+    with pytest.raises(AnswerNotAvailableError):
+        _answer_from_summary(with_container)
+
+    without_container = _write_summary(
+        {"status": "timeout", "has_answer_container": False},
+        chat_id="chat-1",
+        output_dir=tmp_path,
+        quiet_ms=1500,
+        started_mono=0.0,
+    )
+    with pytest.raises(AnswerTimeoutError):
+        _answer_from_summary(without_container)
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        wait_for_answer_text(
+            page=None, submit_id="s", chat_id="c", strategy="unknown"
+        )
+
+
+def test_failing_summary_hook_does_not_change_the_answer(monkeypatch, run_async):
+    """on_summary の例外は握りつぶされ、回答の写像に影響しない"""
+
+    from src import answer_probe
+
+    summary = {"rest_answer": "回答"}
+
+    async def _async_probe(**kwargs):
+        return summary
+
+    def _hook(_summary):
+        raise RuntimeError("hook failed")
+
+    monkeypatch.setitem(answer_probe._SYNC_PROBES, "graphql", lambda **kwargs: summary)
+    monkeypatch.setitem(answer_probe._ASYNC_PROBES, "graphql", _async_probe)
+
+    assert wait_for_answer_text(page=None, submit_id="s", chat_id="c", on_summary=_hook) == "回答"
+    assert (
+        run_async(
+            answer_probe.wait_for_answer_text_async(
+                page=None, submit_id="s", chat_id="c", on_summary=_hook
+            )
+        )
+        == "回答"
+    )
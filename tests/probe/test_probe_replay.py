@@ -0,0 +1,110 @@
+import json
+
+from scripts.probe_replay import replay_probe_dir, replay_tree
+
+
+def _write_probe_dir(path, chat_id, records, summary):
+    path.mkdir(parents=True)
+    with (path / "graphql_probe.jsonl").open("w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    summary = {"chat_id": chat_id, **summary}
+    (path / "summary.json").write_text(json.dumps(summary), encoding="utf-8")
+
+
+def _records(chat_id):
+    return [
+        {
+            "ts": "2026-01-01T10:00:00+09:00",
+            "kind": "rest_post",
+            "chat_id": chat_id,
+            "url": f"https://example/chat/{chat_id}/messages",
+            "method": "POST",
+            "status": 200,
+            "parse_error": False,
+            "raw": {"ok": True},
+        },
+        {
+            "ts": "2026-01-01T10:00:05+09:00",
+            "kind": "graphql",
+            "chat_id": chat_id,
+            "url": "https://example/graphql",
+            "method": "POST",
+            "status": 200,
+            "parse_error": False,
+            "raw": {
+                "operationName": "createData",
+                "data": {"createData": {"sk": f"{chat_id}#2", "value": "assistant#回答"}},
+            },
+        },
+        {
+            "ts": "2026-01-01T10:00:06+09:00",
+            "kind": "rest_get",
+            "chat_id": chat_id,
+            "url": f"https://example/chat/{chat_id}/messages",
+            "method": "GET",
+            "status": 200,
+            "parse_error": False,
+            "raw": {"messages": [{"role": "assistant", "content": "回答"}]},
+        },
+        {
+            "ts": "2026-01-01T10:00:55+09:00",
+            "kind": "other",
+            "chat_id": None,
+            "url": "https://example/static/app.js",
+            "method": "GET",
+            "status": 200,
+            "parse_error": True,
+            "raw": None,
+        },
+    ]
+
+
+def test_replay_reproduces_recorded_summary(tmp_path):
+    """記録済みイベントの再生結果が summary.json と一致する"""
+
+    probe_dir = tmp_path / "xhr_probe_1"
+    _write_probe_dir(
+        probe_dir,
+        "c1",
+        _records("c1"),
+        {
+            "status": "ok",
+            "correlation_state": "Established",
+            "graphql_answer": "回答",
+            "rest_answer": "回答",
+            "has_post": True,
+            "has_get": True,
+            "has_graphql": True,
+        },
+    )
+
+    result = replay_probe_dir(probe_dir, completion_grace_seconds=2.0)
+
+    assert result["matches"] is True
+    assert result["completion"]["reason"] == "graphql_and_rest_get"
+    assert result["completion"]["fired_after_first_event_sec"] == 6.0
+    assert result["completion"]["saved_vs_last_event_sec"] == 49.0
+
+
+def test_replay_tree_reports_mismatch(tmp_path):
+    """記録と再生の判定が異なる場合は mismatch として集計される"""
+
+    _write_probe_dir(
+        tmp_path / "a" / "xhr_probe_1",
+        "c1",
+        _records("c1"),
+        {"status": "ok", "rest_answer": "回答"},
+    )
+    _write_probe_dir(
+        tmp_path / "b" / "xhr_probe_2",
+        "c2",
+        _records("c2"),
+        {"status": "no_graphql"},
+    )
+
+    report = replay_tree(tmp_path, workers=1)
+
+    assert report["probe_count"] == 2
+    assert report["replayed"] == 2
+    assert report["mismatches"] == 1
@@ -0,0 +1,322 @@
+import json
+from pathlib import Path
+
+from scripts.probe_v0_2 import (
+    AsyncProbeDispatcher,
+    ProbeDispatcher,
+    ProbeEvent,
+    ProbeJournal,
+    _classify_response,
+    _ProbeSession,
+)
+
+
+class _FakePage:
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def emit(self, event, payload):
+        for handler in list(self.listeners.get(event, [])):
+            handler(payload)
+
+
+class _FakeWebSocket(_FakePage):
+    url = "wss://example/graphql"
+
+    def frame(self, frame):
+        self.emit("framereceived", json.dumps(frame, ensure_ascii=False))
+
+
+class _FakeRequest:
+    def __init__(self, method):
+        self.method = method
+
+
+class _FakeResponse:
+    def __init__(self, url, method="GET", body=None, status=200):
+        self.url = url
+        self.request = _FakeRequest(method)
+        self.status = status
+        self.body = body
+        self.json_calls = 0
+
+    def json(self):
+        self.json_calls += 1
+        if self.body is None:
+            raise ValueError("not json")
+        return self.body
+
+
+class _FakeAsyncResponse(_FakeResponse):
+    async def json(self):  # type: ignore[override]
+        return _FakeResponse.json(self)
+
+
+RECORDED_XHR_LOG = (
+    Path(__file__).resolve().parents[2]
+    / "docs/archive/debug/sandbox/xhr_capture_20251212_035123/xhr_log.jsonl"
+)
+
+
+def _create_data(chat_id, value="assistant#回答"):
+    # 実レスポンスと同じく operationName を含まない
+    return {"data": {"createData": {"sk": f"{chat_id}#2", "value": value}}}
+
+
+def _messages(*roles):
+    return {
+        "success": True,
+        "data": {
+            "messages": [
+                {"role": role, "content": f"{role}-{i}"} for i, role in enumerate(roles)
+            ]
+        },
+    }
+
+
+def _ws_data(sub_id, sk, value):
+    return {
+        "id": sub_id,
+        "type": "next",
+        "payload": {"data": {"onCreateData": {"sk": sk, "value": value}}},
+    }
+
+
+def _connected(chat_id):
+    page = _FakePage()
+    dispatcher = ProbeDispatcher(page)
+    session = _ProbeSession(chat_id)
+    dispatcher.subscribe(session)
+    ws = _FakeWebSocket()
+    page.emit("websocket", ws)
+    return dispatcher, session, ws
+
+
+def test_ws_complete_of_user_message_does_not_complete_probe():
+    """user メッセージの subscription が complete しても回答完了とみなさない"""
+
+    _, session, ws = _connected("chat-1")
+
+    ws.frame(_ws_data("1", "chat-1#1", "user#質問"))
+    ws.frame({"id": "1", "type": "complete"})
+
+    assert session.has_ws
+    assert session.ws_completed_mono is None
+    assert session.completion_reason(now=1e9, grace_seconds=0) is None
+
+    ws.frame(_ws_data("2", "chat-1#2", "assistant#回答"))
+    ws.frame({"id": "2", "type": "complete"})
+
+    assert session.ws_answer == "回答"
+    assert session.completion_reason(now=0, grace_seconds=2) == "ws_complete"
+
+
+def test_websocket_opened_before_subscribe_is_routed():
+    """遷移前に install しておけば、ページ表示時に接続された WebSocket も振り分けられる"""
+
+    page = _FakePage()
+    dispatcher = ProbeDispatcher(page)
+    dispatcher.install()
+    ws = _FakeWebSocket()
+    page.emit("websocket", ws)  # submit 前（購読なし）に接続済み
+
+    # 購読前の frame は記録しない
+    ws.frame(_ws_data("0", "chat-1#0", "assistant#前回"))
+
+    session = _ProbeSession("chat-1")
+    dispatcher.subscribe(session)
+    assert page.listeners["websocket"] == [dispatcher._on_websocket]
+
+    ws.frame(_ws_data("2", "chat-1#2", "assistant#回答"))
+    ws.frame({"id": "2", "type": "complete"})
+
+    assert session.ws_frame_count == 2
+    assert session.ws_answer == "回答"
+    assert session.completion_reason(now=0, grace_seconds=2) == "ws_complete"
+
+
+def test_recorded_qommons_responses_complete_the_probe():
+    """記録済みの実レスポンス（operationName なし）で createData と REST 完了を判定できる"""
+
+    records = [
+        json.loads(line)
+        for line in RECORDED_XHR_LOG.read_text(encoding="utf-8").splitlines()
+    ]
+    responses = [r for r in records if r["type"] == "response"]
+    chat_id = "0cc06a88-2920-410a-8cb6-3c7ab1f12a03"
+
+    page = _FakePage()
+    dispatcher = ProbeDispatcher(page)
+    session = _ProbeSession(chat_id)
+    dispatcher.subscribe(session)
+
+    graphql, messages = responses
+    page.emit(
+        "response",
+        _FakeResponse(graphql["url"], "POST", json.loads(graphql["body"])),
+    )
+
+    assert session.has_graphql
+    assert session.graphql_answer.startswith("和歌山県かつらぎ町について")
+    assert session.completion_reason(session.first_graphql_mono, grace_seconds=2) is None
+
+    page.emit(
+        "response",
+        _FakeResponse(messages["url"], "GET", json.loads(messages["body"])),
+    )
+
+    assert session.rest_answer.startswith("和歌山県かつらぎ町について")
+    assert session.completion_reason(0, grace_seconds=2) == "graphql_and_rest_get"
+
+
+def test_rest_get_completes_only_with_an_assistant_message_newer_than_baseline():
+    """GraphQL 非発火でも、submit 前の件数を超える assistant 回答で完了する"""
+
+    page = _FakePage()
+    dispatcher = ProbeDispatcher(page)
+    dispatcher.install()  # 遷移前に登録済み（購読はまだない）
+    url = "https://x/api/v1/chat/chat-1/messages"
+
+    # submit 前（購読なし）の GET で baseline を記録する
+    page.emit("response", _FakeResponse(url, "GET", _messages("system", "user", "assistant")))
+    assert dispatcher.assistant_count("chat-1") == 1
+
+    session = _ProbeSession("chat-1", baseline_assistant_count=dispatcher.assistant_count("chat-1"))
+    dispatcher.subscribe(session)
+
+    # 前回の回答のみ（今回の回答は未生成）
+    page.emit(
+        "response",
+        _FakeResponse(url, "GET", _messages("system", "user", "assistant", "user")),
+    )
+    assert session.has_get
+    assert session.rest_answer is None
+    assert session.completion_reason(now=1e9, grace_seconds=2) is None
+
+    page.emit(
+        "response",
+        _FakeResponse(
+            url, "GET", _messages("system", "user", "assistant", "user", "assistant")
+        ),
+    )
+    assert session.rest_answer == "assistant-4"
+    assert session.completion_reason(now=0, grace_seconds=2) == "rest_get"
+    assert dispatcher.assistant_count("chat-1") == 2
+
+
+def test_classify_response_uses_url_and_method_only():
+    assert _classify_response("https://x/graphql", "POST") == "graphql"
+    assert _classify_response("https://x/graphql", "GET") == "other"
+    assert _classify_response("https://x/chat/c-1/messages", "GET") == "rest_messages"
+    assert _classify_response("https://x/static/app.js", "GET") == "other"
+
+
+def test_dispatcher_fans_out_to_matching_sessions():
+    """1 レスポンスを 1 回だけ解析し、chat_id の一致する購読へ振り分ける"""
+
+    page = _FakePage()
+    dispatcher = ProbeDispatcher(page)
+    first, second = _ProbeSession("chat-1"), _ProbeSession("chat-2")
+    dispatcher.subscribe(first)
+    dispatcher.subscribe(second)
+
+    graphql = _FakeResponse("https://x/graphql", "POST", _create_data("chat-1"))
+    page.emit("response", graphql)
+    page.emit(
+        "response",
+        _FakeResponse(
+            "https://x/chat/chat-2/messages",
+            "GET",
+            {"messages": [{"role": "assistant", "content": "二"}]},
+        ),
+    )
+    asset = _FakeResponse("https://x/static/app.js")
+    page.emit("response", asset)
+
+    assert graphql.json_calls == 1
+    assert (first.graphql_answer, first.has_get) == ("回答", False)
+    assert (second.graphql_answer, second.rest_answer) == (None, "二")
+    # 無関係レスポンスは本文を取得せず件数のみ
+    assert asset.json_calls == 0
+    assert first.other_count == second.other_count == 1
+    assert page.listeners["response"] == [dispatcher._on_response]
+
+
+def test_unsubscribe_stops_routing_and_body_reads():
+    page = _FakePage()
+    dispatcher = ProbeDispatcher(page)
+    session = _ProbeSession("chat-1")
+    token = dispatcher.subscribe(session)
+    dispatcher.unsubscribe(token)
+
+    response = _FakeResponse("https://x/graphql", "POST", _create_data("chat-1"))
+    page.emit("response", response)
+
+    assert dispatcher.active_subscriptions == 0
+    assert response.json_calls == 0
+    assert session.event_count == 0
+
+    # 再購読してもハンドラは 1 つのまま
+    dispatcher.subscribe(_ProbeSession("chat-1"))
+    assert len(page.listeners["response"]) == 1
+    dispatcher.close()
+    assert page.listeners["response"] == []
+
+
+def test_journal_truncates_raw_over_the_kind_limit(tmp_path):
+    """kind ごとの上限を超える raw は jsonl 上で省略し、サイズを記録する"""
+
+    path = tmp_path / "graphql_probe.jsonl"
+    journal = ProbeJournal(path, max_raw_bytes={"other": 16})
+    journal.append(ProbeEvent("t1", "other", None, "u", "GET", 200, {"blob": "x" * 64}))
+    journal.append(ProbeEvent("t2", "other", None, "u", "GET", 200, {"a": "日本"}))
+    journal.append(ProbeEvent("t3", "graphql", "c", "u", "POST", 200, {"blob": "x" * 64}))
+    journal.close()
+
+    first, second, third = [
+        json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert first["raw"] is None
+    assert first["raw_truncated"] is True
+    assert first["raw_bytes"] == len(json.dumps({"blob": "x" * 64}))
+    assert second["raw"] == {"a": "日本"}
+    assert third["raw"] == {"blob": "x" * 64}
+    assert (journal.written, journal.truncated, journal.errors) == (3, 1, 0)
+
+
+def test_async_dispatcher_awaits_body_once(run_async):
+    page = _FakePage()
+    dispatcher = AsyncProbeDispatcher(page)
+    session = _ProbeSession("chat-1")
+    dispatcher.subscribe(session)
+
+    response = _FakeAsyncResponse("https://x/graphql", "POST", _create_data("chat-1"))
+    run_async(dispatcher._on_response(response))
+    run_async(dispatcher._on_response(_FakeAsyncResponse("https://x/graphql", "POST")))
+
+    assert response.json_calls == 1
+    assert session.graphql_answer == "回答"
+    assert session.first_graphql_mono is not None
+
+
+def test_dispatcher_registry_does_not_keep_pages_alive():
+    """Page が破棄されれば Page 単位のディスパッチャも回収される"""
+
+    import gc
+
+    from scripts.probe_v0_2 import _DISPATCHERS, get_probe_dispatcher
+
+    page = _FakePage()
+    get_probe_dispatcher(page).subscribe(_ProbeSession("chat-1"))
+    assert page in _DISPATCHERS
+
+    del page
+    gc.collect()
+
+    assert len(_DISPATCHERS) == 0
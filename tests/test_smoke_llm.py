@@ -10,7 +10,7 @@ from tests.pages.login_page import LoginPage
 from tests.pages.chat_select_page import ChatSelectPage
 from tests.pages.chat_page import ChatPage
 
-from scripts.probe_v0_2 import run_graphql_probe
+from scripts.probe_v0_2 import get_probe_dispatcher, run_graphql_probe
 from src.log_writer import LogContext, create_case_log
 
 
@@ -66,6 +66,7 @@ def test_smoke_llm(page, env_config, case_dirs):
     # -----------------------------------------------------
     # 4. Login
     # -----------------------------------------------------
+    get_probe_dispatcher(page).install()  # 遷移前に登録（WebSocket 捕捉のため）
     page.goto(config["url"], wait_until="load")
 
     from pathlib import Path